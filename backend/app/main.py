@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
 from typing import List
 
 from fastapi import FastAPI
@@ -13,7 +14,7 @@ from app.routers.departments import router as departments_router
 from app.routers.soldiers import router as soldiers_router
 from app.routers.missions import router as missions_router
 from app.routers.assignments import router as assignments_router
-from app.routers.planning import router as planning_router
+from app.routers.planning import router as planning_router, shutdown_candidate_executor
 from app.routers.mission_requirements import router as mission_requirements_router
 from app.routers.vacations import router as vacations_router
 from app.routers import mission_history
@@ -21,11 +22,23 @@ from app.routers import warnings as warnings_router
 from app.routers.saved_plans import router as saved_plans_router
 from app.routers.friendships import router as friendships_router
 from app.routers.data_io import router as data_io_router
+from app.routers.jobs import router as jobs_router
+from app.services.job_runner import fail_orphaned_jobs, shutdown_job_executor
 
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jobs of a previous server process show as running until reconciled
+    fail_orphaned_jobs()
+    yield
+    # Worker processes of the /plan/fill candidate pool and the job pool, started on first use
+    shutdown_candidate_executor()
+    shutdown_job_executor()
+
+
 def build_app() -> FastAPI:
-    app = FastAPI(title="Shabtzak API")
+    app = FastAPI(title="Shabtzak API", lifespan=lifespan)
 
     # CORS (adjust origins as you need)
     frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
@@ -57,6 +70,7 @@ def build_app() -> FastAPI:
     app.include_router(saved_plans_router)
     app.include_router(friendships_router)
     app.include_router(data_io_router)
+    app.include_router(jobs_router)
 
     return app
 
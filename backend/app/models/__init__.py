@@ -6,6 +6,7 @@ from .base import Base
 from .role import Role
 from .mission import Mission
 from .mission_slot import MissionSlot
+from .mission_window import MissionWindow
 from .soldier import Soldier
 from .soldier_role import SoldierRole
 from .assignment import Assignment
@@ -14,7 +15,12 @@ from .department import Department
 from .mission_requirement import MissionRequirement
 from .soldier_mission_restriction import SoldierMissionRestriction
 from .soldier_friendship import SoldierFriendship
+from .soldier_restriction_index import SoldierRestrictionIndex
+from .soldier_workload_day import SoldierWorkloadDay
+from .soldier_pair_day import SoldierPairDay
 from .saved_plan import SavedPlan
+from .plan_job import PlanJob
+from .plan_warning import PlanWarning
 
 
 __all__ = [
@@ -12,10 +12,15 @@ class Assignment(Base):
     mission_id: Mapped[int] = mapped_column(ForeignKey("missions.id"), nullable=False)
     soldier_id: Mapped[int] = mapped_column(ForeignKey("soldiers.id"), nullable=True)
     role_id: Mapped[int | None] = mapped_column(ForeignKey("roles.id"), nullable=True)
+    # The shift instance (mission, start, end) this assignment fills
+    window_id: Mapped[int | None] = mapped_column(ForeignKey("mission_windows.id", ondelete="SET NULL"), nullable=True)
 
     __table_args__ = (
         # UniqueConstraint("soldier_id", "start_at", "end_at", name="uq_assignments_soldier_window"),
         Index("ix_assignments_soldier_time", "soldier_id", "start_at", "end_at"),
+        # Range scans by start time (warnings lookback, planner day loads)
+        Index("ix_assignments_start_at", "start_at"),
+        Index("ix_assignments_window", "window_id"),
     )
 
     start_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
@@ -0,0 +1,26 @@
+# backend/app/models/mission_window.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from app.db import Base
+
+class MissionWindow(Base):
+    """
+    One shift instance: a mission's absolute window (Assignment.window_for of a
+    slot on a day, or a custom window created by hand). Assignments reference
+    it by window_id, so "who shares this shift" is an integer join. Rows are
+    created on first use by app/services/mission_windows.py.
+
+    slot_id - the MissionSlot the window was generated from (NULL for custom
+              windows, or once the slot is deleted)
+    """
+    __tablename__ = "mission_windows"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mission_id = Column(Integer, ForeignKey("missions.id", ondelete="CASCADE"), nullable=False)
+    slot_id = Column(Integer, ForeignKey("mission_slots.id", ondelete="SET NULL"), nullable=True)
+    start_at = Column(DateTime(timezone=False), nullable=False)
+    end_at = Column(DateTime(timezone=False), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("mission_id", "start_at", "end_at", name="uq_mission_windows_window"),
+        Index("ix_mission_windows_start_at", "start_at"),
+    )
@@ -0,0 +1,30 @@
+# backend/app/models/plan_job.py
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, Index
+from app.db import Base
+
+class PlanJob(Base):
+    """
+    A long planning operation (fill, fill-range, planner import) run in the
+    background job pool (app/services/job_runner.py) and polled via /jobs/{id}.
+
+    status - queued | running | succeeded | failed | cancelled
+    """
+    __tablename__ = "plan_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(32), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")
+    progress = Column(Float, nullable=False, default=0.0)  # 0..1
+    message = Column(String, nullable=True)
+    params = Column(JSON, nullable=False)  # request body of the wrapped endpoint
+    result = Column(JSON, nullable=True)  # its response, once succeeded
+    error = Column(String, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_plan_jobs_status", "status"),
+    )
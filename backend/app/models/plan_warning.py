@@ -0,0 +1,33 @@
+# backend/app/models/plan_warning.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.db import Base
+
+class PlanWarning(Base):
+    """
+    Stored result of the warnings engine (app/services/warnings_engine.py), one
+    row per warning on an assignment, kept in step with assignments, restrictions
+    and friendships by app/services/warning_store.py. Names are not stored: GET
+    /plan/warnings renders them (and NOT_FRIENDS details) from the planner cache.
+
+    soldier_id / mission_id / start_at / end_at - copied from the assignment
+    type / level / details - as in the API (details is NULL for RESTRICTED and NOT_FRIENDS)
+    fellow_id - NOT_FRIENDS: the not-friend soldier sharing the window
+    """
+    __tablename__ = "plan_warnings"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    assignment_id = Column(Integer, ForeignKey("assignments.id", ondelete="CASCADE"), nullable=False)
+    soldier_id = Column(Integer, nullable=False)
+    mission_id = Column(Integer, nullable=False)
+    start_at = Column(DateTime(timezone=False), nullable=False)
+    end_at = Column(DateTime(timezone=False), nullable=False)
+    type = Column(String, nullable=False)
+    level = Column(String, nullable=False)
+    details = Column(String, nullable=True)
+    fellow_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_plan_warnings_start_at", "start_at"),
+        Index("ix_plan_warnings_soldier_start", "soldier_id", "start_at"),
+        Index("ix_plan_warnings_assignment", "assignment_id"),
+    )
@@ -0,0 +1,25 @@
+# backend/app/models/soldier_pair_day.py
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index
+from app.db import Base
+
+class SoldierPairDay(Base):
+    """
+    Per-day co-assignment counts: how often soldier_id shared a mission window
+    (same mission, start and end) with fellow_id. Stored in both directions and
+    kept in step with the assignments table by app/services/workload_rollup.py.
+
+    overlaps - shared windows touching this day
+    starts   - shared windows starting this day
+    """
+    __tablename__ = "soldier_pair_days"
+
+    soldier_id = Column(Integer, ForeignKey("soldiers.id", ondelete="CASCADE"), primary_key=True)
+    fellow_id = Column(Integer, ForeignKey("soldiers.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    overlaps = Column(Integer, nullable=False, default=0)
+    starts = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_soldier_pair_days_day", "day"),
+    )
@@ -0,0 +1,18 @@
+# backend/app/models/soldier_restriction_index.py
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.db import Base
+
+class SoldierRestrictionIndex(Base):
+    """
+    (soldier_id, mission_id) keys compiled from the free-text Soldier.restrictions
+    (mission names) on write; see app/services/restriction_index.py.
+    The string stays as the display value, this table is what gets queried.
+    """
+    __tablename__ = "soldier_restriction_index"
+
+    soldier_id = Column(Integer, ForeignKey("soldiers.id", ondelete="CASCADE"), primary_key=True)
+    mission_id = Column(Integer, ForeignKey("missions.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_soldier_restriction_index_mission", "mission_id"),
+    )
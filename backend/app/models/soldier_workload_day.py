@@ -0,0 +1,39 @@
+# backend/app/models/soldier_workload_day.py
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index
+from app.db import Base
+
+class SoldierWorkloadDay(Base):
+    """
+    Per-soldier, per-calendar-day, per-mission rollup of assignments, kept in step
+    with the assignments table by app/services/workload_rollup.py.
+
+    hours    - hours of the soldier's assignments that fall inside this day
+    overlaps - assignments touching this day
+    starts   - assignments starting this day (morning/evening/night split them by start hour)
+    carried_* - start-hour split of the assignments touching this day that started before it
+    carried_hours - hours of those assignments before this day (the fairness objective
+                    counts whole assignments touching its window)
+    last_end_at / second_last_end_at - latest two ends among assignments ending this day
+    """
+    __tablename__ = "soldier_workload_days"
+
+    soldier_id = Column(Integer, ForeignKey("soldiers.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    mission_id = Column(Integer, ForeignKey("missions.id", ondelete="CASCADE"), primary_key=True)
+
+    hours = Column(Float, nullable=False, default=0.0)
+    overlaps = Column(Integer, nullable=False, default=0)
+    starts = Column(Integer, nullable=False, default=0)
+    morning = Column(Integer, nullable=False, default=0)
+    evening = Column(Integer, nullable=False, default=0)
+    night = Column(Integer, nullable=False, default=0)
+    carried_morning = Column(Integer, nullable=False, default=0)
+    carried_evening = Column(Integer, nullable=False, default=0)
+    carried_night = Column(Integer, nullable=False, default=0)
+    carried_hours = Column(Float, nullable=False, default=0.0)
+    last_end_at = Column(DateTime(timezone=False), nullable=True)
+    second_last_end_at = Column(DateTime(timezone=False), nullable=True)
+
+    __table_args__ = (
+        Index("ix_soldier_workload_days_day", "day"),
+    )
@@ -17,6 +17,9 @@ from app.models.mission_slot import MissionSlot
 from app.models.role import Role
 from app.models.soldier import Soldier
 from app.models.soldier_mission_restriction import SoldierMissionRestriction
+from app.services.mission_windows import window_ids
+from app.services.warning_store import refresh_warnings_for
+from app.services.workload_rollup import refresh_workload_for
 
 from math import floor
 
@@ -164,6 +167,8 @@ def clear_plan(payload: dict, db: Session = Depends(get_db)):
         conds.append(~Assignment.id.in_(locked_assignment_ids))
 
     db.execute(delete(Assignment).where(and_(*conds)))
+    refresh_workload_for(db, day_start, day_end)
+    refresh_warnings_for(db, day_start, day_end)
     db.commit()
     return {"ok": True} 
 
@@ -276,10 +281,13 @@ def reassign_assignment(body: ReassignRequest, db: Session = Depends(get_db)):
     # We simply set the soldier and commit. If your DB has an exclusion/unique constraint
     # that forbids overlaps, this will raise and we surface the error.
 
+    previous_soldier_id = a.soldier_id
     a.soldier_id = s.id
     db.add(a)
 
     try:
+        refresh_workload_for(db, a.start_at, a.end_at)
+        refresh_warnings_for(db, a.start_at, a.end_at, {previous_soldier_id, s.id})
         db.commit()
     except IntegrityError as e:
         db.rollback()
@@ -343,14 +351,18 @@ def create_assignment(body: CreateAssignmentRequest, db: Session = Depends(get_d
         # raise HTTPException(status_code=400, detail="soldier_id is required")
         pass
 
+    key = (body.mission_id, start_at, end_at)
     a = Assignment(
         mission_id=body.mission_id,
         soldier_id=body.soldier_id,
         role_id=body.role_id,
         start_at=start_at,
         end_at=end_at,
+        window_id=window_ids(db, [key])[key],
     )
     db.add(a)
+    refresh_workload_for(db, start_at, end_at)
+    refresh_warnings_for(db, start_at, end_at, {body.soldier_id})
     db.commit()
     db.refresh(a)
 
@@ -386,6 +398,9 @@ def delete_assignment(assignment_id: int, db: Session = Depends(get_db)):
     # The frontend should prevent deletion of locked assignments
     # But we'll add a comment here for documentation
     
+    start_at, end_at, soldier_id = a.start_at, a.end_at, a.soldier_id
     db.delete(a)
+    refresh_workload_for(db, start_at, end_at)
+    refresh_warnings_for(db, start_at, end_at, {soldier_id})
     db.commit()
     return {"deleted": assignment_id}
\ No newline at end of file
@@ -19,6 +19,12 @@ from app.models.role import Role
 from app.models.soldier import Soldier
 from app.models.soldier_role import SoldierRole
 from app.models.vacation import Vacation
+from app.services.bulk_insert import BulkInserter
+from app.services.mission_windows import link_windows
+from app.services.planner_cache import bump_planner_version
+from app.services.restriction_index import rebuild_restriction_index
+from app.services.warning_store import rebuild_warnings, refresh_warnings_for
+from app.services.workload_rollup import rebuild_workload, refresh_workload_for
 
 
 router = APIRouter(prefix="/data", tags=["data-transfer"])
@@ -204,7 +210,11 @@ def import_soldiers(payload: SoldiersPackage, db: Session = Depends(get_db)) ->
             db.add(SoldierRole(soldier_id=soldier.id, role_id=role_obj.id))
             role_links_updated += 1
 
+    db.flush()
+    rebuild_restriction_index(db)
+    rebuild_warnings(db)
     db.commit()
+    bump_planner_version()
 
     return SoldiersImportResult(
         created_departments=created_departments,
@@ -371,7 +381,11 @@ def import_missions(payload: MissionsPackage, db: Session = Depends(get_db)) ->
                 )
             )
 
+    db.flush()
+    rebuild_restriction_index(db)
+    rebuild_warnings(db)
     db.commit()
+    bump_planner_version()
 
     return MissionsImportResult(
         created_missions=created_missions,
@@ -482,6 +496,7 @@ def import_planner(payload: PlannerImportRequest, db: Session = Depends(get_db))
         raise HTTPException(status_code=400, detail="day is required")
 
     start, end = _day_bounds(payload.day)
+    span_start, span_end = start, end
 
     deleted_count = 0
     if payload.replace:
@@ -494,7 +509,7 @@ def import_planner(payload: PlannerImportRequest, db: Session = Depends(get_db))
     missions_by_name: Dict[str, Mission] = {m.name: m for m in db.scalars(select(Mission)).all()}
     soldiers_by_name: Dict[str, Soldier] = {s.name: s for s in db.scalars(select(Soldier)).all()}
 
-    created_assignments = 0
+    writer = BulkInserter(db, Assignment)
     created_missions = 0
     created_roles = 0
     created_soldiers = 0
@@ -550,19 +565,28 @@ def import_planner(payload: PlannerImportRequest, db: Session = Depends(get_db))
                 status_code=400,
                 detail=f"Invalid datetime format in assignment for mission '{mission_name}'",
             ) from exc
-
-        db.add(
-            Assignment(
-                mission_id=mission.id,
-                role_id=role_id,
-                soldier_id=soldier_id,
-                start_at=start_at,
-                end_at=end_at,
-            )
+        span_start, span_end = min(span_start, start_at), max(span_end, end_at)
+
+        writer.add(
+            mission_id=mission.id,
+            role_id=role_id,
+            soldier_id=soldier_id,
+            start_at=start_at,
+            end_at=end_at,
         )
-        created_assignments += 1
-
+    created_assignments = writer.flush()
+
+    db.flush()
+    link_windows(db, span_start, span_end)
+    if created_missions or created_soldiers:
+        # A new mission name can match restriction strings of any soldier
+        rebuild_restriction_index(db)
+        rebuild_warnings(db)
+    else:
+        refresh_warnings_for(db, span_start, span_end)
+    refresh_workload_for(db, span_start, span_end)
     db.commit()
+    bump_planner_version()
 
     return PlannerImportResult(
         day=payload.day,
@@ -622,7 +646,7 @@ def import_planner_all(payload: PlannerAllImportRequest, db: Session = Depends(g
         return PlannerAllImportResult()
 
     deleted_assignments = 0
-    created_assignments = 0
+    writer = BulkInserter(db, Assignment)
     created_missions = 0
     created_roles = 0
     created_soldiers = 0
@@ -642,6 +666,7 @@ def import_planner_all(payload: PlannerAllImportRequest, db: Session = Depends(g
 
         if not payload.replace:
             start, end = _day_bounds(day)
+            writer.flush()  # rows of earlier days go in before this day's clear
             deleted = db.execute(
                 delete(Assignment).where(and_(Assignment.start_at >= start, Assignment.start_at < end))
             )
@@ -699,18 +724,22 @@ def import_planner_all(payload: PlannerAllImportRequest, db: Session = Depends(g
                     detail=f"Invalid datetime format in assignment for mission '{mission_name}'",
                 ) from exc
 
-            db.add(
-                Assignment(
-                    mission_id=mission.id,
-                    role_id=role_id,
-                    soldier_id=soldier_id,
-                    start_at=start_at,
-                    end_at=end_at,
-                )
+            writer.add(
+                mission_id=mission.id,
+                role_id=role_id,
+                soldier_id=soldier_id,
+                start_at=start_at,
+                end_at=end_at,
             )
-            created_assignments += 1
+    created_assignments = writer.flush()
 
+    db.flush()
+    link_windows(db, None, None)
+    rebuild_restriction_index(db)
+    rebuild_warnings(db)
+    rebuild_workload(db)
     db.commit()
+    bump_planner_version()
 
     return PlannerAllImportResult(
         total_days=len(payload.plans),
@@ -838,6 +867,7 @@ def import_manpower(payload: ManpowerImportRequest, db: Session = Depends(get_db
         created_vacations += 1
 
     db.commit()
+    bump_planner_version()
 
     return ManpowerImportResult(
         created_soldiers=created_soldiers,
@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session
 from app.db import get_db
 from app.models.soldier import Soldier
 from app.models.soldier_friendship import SoldierFriendship
+from app.services.planner_cache import bump_planner_version
+from app.services.warning_store import refresh_soldier_warnings
 
 router = APIRouter(prefix="/soldiers", tags=["friendships"])
 
@@ -113,6 +115,9 @@ def update_soldier_friendships(soldier_id: int, request: FriendshipUpdateRequest
             )
         )
     
+    # Every changed pair involves this soldier, so their refresh covers both sides
+    refresh_soldier_warnings(db, [soldier_id])
     db.commit()
+    bump_planner_version()
     return {"message": "Friendships updated successfully"}
 
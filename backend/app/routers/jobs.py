@@ -0,0 +1,129 @@
+# backend/app/routers/jobs.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.plan_job import PlanJob
+from app.routers import data_io, planning
+from app.services.job_runner import JobProgress, cancel_job, submit_job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+class JobCreate(BaseModel):
+    kind: str  # see JOB_KINDS
+    params: dict  # request body of the wrapped endpoint
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str  # queued | running | succeeded | failed | cancelled
+    progress: float  # 0..1
+    message: Optional[str] = None
+    result: Optional[Any] = None  # response of the wrapped endpoint, once succeeded
+    error: Optional[str] = None
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+# ----------------------------------------------------------------------
+# Handlers (run in the job pool; see app/services/job_runner.py)
+# ----------------------------------------------------------------------
+def _fill_job(params: dict, db: Session, progress: JobProgress):
+    req = planning.FillRequest(**params)
+    progress.update(0.0, f"planning {req.day}")
+    # Also polled while candidates run and during improvement, so a cancel stops the plan there
+    return planning.run_fill(req, db, interrupt=progress.check).model_dump(mode="json")
+
+
+def _fill_range_job(params: dict, db: Session, progress: JobProgress):
+    req = planning.FillRangeRequest(**params)
+    progress.update(0.0, f"planning {req.from_day}..{req.to_day}")
+
+    def on_day(done: int, total: int, day) -> None:
+        # Last step (the write) is left for the final 5%
+        progress.update(0.95 * done / total, f"planned {day.isoformat()} ({done}/{total})")
+
+    return planning.run_fill_range(req, db, on_day=on_day).model_dump(mode="json")
+
+
+def _import_planner_job(params: dict, db: Session, progress: JobProgress):
+    payload = data_io.PlannerImportRequest(**params)
+    progress.update(0.0, f"importing {payload.day}")
+    return data_io.import_planner(payload, db).model_dump(mode="json")
+
+
+def _import_planner_all_job(params: dict, db: Session, progress: JobProgress):
+    payload = data_io.PlannerAllImportRequest(**params)
+    progress.update(0.0, f"importing {len(payload.plans)} days")
+    return data_io.import_planner_all(payload, db).model_dump(mode="json")
+
+
+# kind -> (request model the params must validate against, handler)
+JOB_KINDS = {
+    "fill": (planning.FillRequest, _fill_job),
+    "fill_range": (planning.FillRangeRequest, _fill_range_job),
+    "import_planner": (data_io.PlannerImportRequest, _import_planner_job),
+    "import_planner_all": (data_io.PlannerAllImportRequest, _import_planner_all_job),
+}
+
+
+# ----------------------------------------------------------------------
+# Endpoints
+# ----------------------------------------------------------------------
+@router.post("", response_model=JobOut, status_code=202)
+def create_job(payload: JobCreate, db: Session = Depends(get_db)):
+    """Queue a fill / fill-range / planner import to run in the background; poll GET /jobs/{id}."""
+    if payload.kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind; expected one of {tuple(JOB_KINDS)}")
+    model, handler = JOB_KINDS[payload.kind]
+    try:
+        params = model(**payload.params).model_dump(mode="json", exclude_unset=True)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    return submit_job(db, payload.kind, params, handler)
+
+
+@router.get("", response_model=List[JobOut])
+def list_jobs(
+    status: Optional[str] = Query(None, description="queued | running | succeeded | failed | cancelled"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """Most recent jobs first."""
+    q = select(PlanJob).order_by(PlanJob.id.desc()).limit(limit)
+    if status:
+        q = q.where(PlanJob.status == status)
+    return db.scalars(q).all()
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(PlanJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.delete("/{job_id}", response_model=JobOut)
+def delete_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Cancel a job. A queued job is cancelled at once; a running one stops at its
+    next progress step and rolls back, so nothing it planned is written.
+    """
+    job = db.get(PlanJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return cancel_job(db, job)
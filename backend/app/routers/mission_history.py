@@ -23,9 +23,7 @@ SELECT
 FROM assignments a
 JOIN missions m ON m.id = a.mission_id
 LEFT JOIN assignments a2
-  ON a2.mission_id = a.mission_id
-  AND a2.start_at  = a.start_at
-  AND a2.end_at    = a.end_at
+  ON a2.window_id = a.window_id
 LEFT JOIN soldiers f ON f.id = a2.soldier_id
 WHERE a.soldier_id = :soldier_id
 GROUP BY a.mission_id, m.name,
@@ -11,6 +11,7 @@ from app.db import SessionLocal
 from app.models.mission import Mission
 from app.models.mission_requirement import MissionRequirement
 from app.models.role import Role
+from app.services.planner_cache import bump_planner_version
 
 router = APIRouter(tags=["missions"])
 
@@ -101,6 +102,7 @@ def put_requirements(mission_id: int, payload: List[RequirementIn]):
                 s.add(req)
         
         s.commit()
+        bump_planner_version()
 
         # return fresh list
         q = (
@@ -9,11 +9,20 @@ from sqlalchemy.orm import Session
 
 from app.db import get_db, SessionLocal
 from app.models.mission import Mission
+from app.models.mission_requirement import MissionRequirement
 from app.models.mission_slot import MissionSlot
+from app.models.mission_window import MissionWindow
 from app.models.assignment import Assignment
+from app.models.role import Role
 from app.models.soldier import Soldier
+from app.models.soldier_restriction_index import SoldierRestrictionIndex
 from app.schemas.mission import MissionCreate, MissionUpdate, MissionOut
 from app.schemas.mission_slot import MissionSlotCreate, MissionSlotRead, MissionSlotUpdate
+from app.services.mission_windows import relink_windows
+from app.services.planner_cache import bump_planner_version
+from app.services.restriction_index import compile_mission_restrictions
+from app.services.warning_store import refresh_soldier_warnings, refresh_warnings_for
+from app.services.workload_rollup import refresh_workload_for, rollup_range
 
 router = APIRouter(prefix="/missions", tags=["missions"])
 
@@ -71,7 +80,9 @@ def create_mission(payload: MissionCreate, db: Session = Depends(get_db)):
                 order=max_order + 1,
             ).returning(Mission.id)
         ).scalar_one()
+        compile_mission_restrictions(db, new_id, payload.name)
         db.commit()
+        bump_planner_version()
         return db.get(Mission, new_id)
     except IntegrityError:
         db.rollback()
@@ -90,7 +101,15 @@ def update_mission(mission_id: int, payload: MissionUpdate, db: Session = Depend
 
     try:
         db.execute(update(Mission).where(Mission.id == mission_id).values(**values))
+        if "name" in values:
+            # Soldiers restricted from the mission under its old or new name
+            restricted_q = select(SoldierRestrictionIndex.soldier_id).where(SoldierRestrictionIndex.mission_id == mission_id)
+            affected = set(db.execute(restricted_q).scalars())
+            compile_mission_restrictions(db, mission_id, values["name"])
+            affected.update(db.execute(restricted_q).scalars())
+            refresh_soldier_warnings(db, affected)
         db.commit()
+        bump_planner_version()
         return db.get(Mission, mission_id)
     except IntegrityError:
         db.rollback()
@@ -106,10 +125,16 @@ def delete_mission(mission_id: int, db: Session = Depends(get_db)):
     if has_asg:
         raise HTTPException(status_code=400, detail="Mission has assignments; clear them first")
 
+    # Rollups or warnings left by assignments removed outside this API
+    affected = rollup_range(db, mission_id=mission_id)
     res = db.execute(delete(Mission).where(Mission.id == mission_id))
     if res.rowcount == 0:
         raise HTTPException(status_code=404, detail="Mission not found")
+    if affected is not None:
+        refresh_workload_for(db, *affected)
+        refresh_warnings_for(db, *affected)
     db.commit()
+    bump_planner_version()
     return None
 
 
@@ -151,14 +176,15 @@ def mission_slot_coverage(
         for (req, role) in req_rows
     ]
 
-    # Assignments during this window
+    # Assignments during this window (the window by its unique key, then its assignments by id)
     rows = db.execute(
         select(Assignment, Soldier)
+        .join(MissionWindow, MissionWindow.id == Assignment.window_id)
         .join(Soldier, Soldier.id == Assignment.soldier_id)
         .where(
-            Assignment.mission_id == mission_id,
-            Assignment.start_at == start_at,
-            Assignment.end_at == end_at,
+            MissionWindow.mission_id == mission_id,
+            MissionWindow.start_at == start_at,
+            MissionWindow.end_at == end_at,
         )
     ).all()
 
@@ -245,6 +271,7 @@ def create_mission_slot(mission_id: int, payload: MissionSlotCreate, db: Session
     slot = MissionSlot(mission_id=mission_id, start_time=payload.start_time, end_time=payload.end_time)
     db.add(slot)
     db.commit()
+    bump_planner_version()
     db.refresh(slot)
     return slot
 
@@ -279,7 +306,10 @@ def update_mission_slot(
 
     slot.start_time = start
     slot.end_time = end
+    # Assignments keep their times; only which windows the slot generates changes
+    relink_windows(db, mission_id)
     db.commit()
+    bump_planner_version()
     db.refresh(slot)
     return slot
 
@@ -289,6 +319,8 @@ def delete_mission_slot(mission_id: int, slot_id: int, db: Session = Depends(get
     slot = db.get(MissionSlot, slot_id)
     if not slot or slot.mission_id != mission_id:
         raise HTTPException(status_code=404, detail="Slot not found")
+    relink_windows(db, mission_id, dropped_slot_id=slot_id)
     db.delete(slot)
     db.commit()
+    bump_planner_version()
     return None
@@ -1,28 +1,61 @@
 # backend/app/routers/planning.py
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional
+from functools import partial
+from itertools import count
+from typing import Callable, Dict, List, NamedTuple, Optional
+import logging
 import math
+import os
+import pickle
+import threading
+import time
 
-from fastapi import APIRouter, Depends, HTTPException
+import anyio.from_thread
+import numpy as np
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field
 from sqlalchemy import select, and_, delete, text
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm import Session, joinedload
 
 from app.db import get_db
 from app.models.assignment import Assignment
 from app.models.mission import Mission
 from app.models.mission_slot import MissionSlot
-from app.models.mission_requirement import MissionRequirement
 from app.models.soldier import Soldier
-from app.models.soldier_mission_restriction import SoldierMissionRestriction
-from app.models.soldier_friendship import SoldierFriendship
 from app.models.vacation import Vacation
+from app.schemas.warnings import WarningItem
+from app.services.assignment_solver import solve_assignment
+from app.services.bulk_insert import BulkInserter
+from app.services.eligibility import EligibilityMasks
+from app.services.interval_index import IntervalIndex
+from app.services.local_search import LocalSearch, Seat, objective_value, soldier_warnings, window_not_friends
+from app.services.mission_windows import day_windows, window_ids
+from app.services.planner_cache import MissionRow, PlannerSnapshot, SoldierRow
+from app.services.planner_snapshot import planner_snapshot
+from app.services.plan_budget import PlanBudget
+from app.services.plan_profiler import PlanProfiler, emit_metrics, metrics_sample_due
+from app.services.rest_index import RestIndex
+from app.services.vector_scoring import VectorScorer
+from app.services.warning_store import refresh_warnings_for, store_warnings
+from app.services.warnings_engine import (
+    EIGHT_HOURS,
+    LOOKBACK,
+    NEAR_EIGHT_MINUTES,
+    RawWarning,
+    find_warnings,
+    group_by_day,
+    render_warnings,
+)
+from app.services.workload_rollup import SoldierWorkload, load_pair_counts, load_workload, refresh_workload_for
 
 import random
 
 router = APIRouter(prefix="/plan", tags=["planning"])
+logger = logging.getLogger(__name__)
 
 class FillRequest(BaseModel):
     day: str = Field(..., description="YYYY-MM-DD")
@@ -33,15 +66,93 @@ class FillRequest(BaseModel):
     exclude_slots: Optional[List[str]] = None  # NEW: slot keys to exclude from assignment
     locked_assignments: Optional[List[int]] = None  # NEW: assignment IDs to preserve during fill/shuffle
     weights: Optional[Dict[str, float]] = None  # NEW: custom weights for fairness scoring
+    scoring_engine: str = "python"  # "python" (per-candidate) or "numpy" (vectorized, same ranking)
+    preview: bool = False  # plan against an in-memory snapshot; nothing is written (see /plan/apply)
+    candidates: int = 1  # >1: plan this many seeded shuffles in parallel and keep the best by objective
+    top_k: int = 1  # with candidates>1: how many ranked alternatives to return
+    assignment_solver: str = "greedy"  # "greedy" (seat by seat) or "matching" (min-cost matching per window)
+    improve_ms: Optional[int] = None  # local-search post-pass (swap/move) with this deadline; off when None
+    profile: bool = False  # return per-phase / per-term timings and candidate counters (see FillProfile)
+    time_budget_ms: Optional[int] = None  # anytime fill: greedy plan first, improve until the budget runs out (see BudgetReport)
+
+SCORING_ENGINES = ("python", "numpy")
+ASSIGNMENT_SOLVERS = ("greedy", "matching")
 
 class PlanResultItem(BaseModel):
     mission: dict
     created_count: int | None = None
     error: str | None = None
 
+class PlannedAssignment(BaseModel):
+    mission_id: int
+    soldier_id: int
+    role_id: Optional[int] = None  # None = generic seat
+    start_at: datetime
+    end_at: datetime
+    score: Optional[float] = None  # planner score of the chosen candidate (lower is better)
+    candidates: Optional[int] = None  # eligible candidates for the seat
+
+class UnfilledSeat(BaseModel):
+    mission_id: int
+    role_id: Optional[int] = None  # None = generic seat
+    start_at: datetime
+    end_at: datetime
+    position: int  # absolute seat position in the slot (same index as exclude_slots keys)
+    reason: str  # "no_pool" or "no_candidates"
+
+class PlanObjective(BaseModel):
+    unfilled: int  # seats left empty
+    overlap_warnings: int  # rest < 8h before an assignment starting that day
+    rest_warnings: int  # rest of ~8h (8h .. 8h + NEAR_EIGHT_MINUTES)
+    not_friend_warnings: int  # soldiers sharing a window that starts that day with a not-friend
+    hours_spread: float  # max - min assigned hours per soldier over the fairness window
+    value: float  # weighted total (lower is better), see OBJECTIVE_WEIGHTS
+
+class CandidatePlan(BaseModel):
+    seed: int  # replay with shuffle=true, random_seed=seed
+    objective: PlanObjective
+    assignments: Optional[List[PlannedAssignment]] = None  # preview only
+    unfilled: Optional[List[UnfilledSeat]] = None  # preview only
+
+class ImprovementReport(BaseModel):
+    objective_before: PlanObjective
+    objective_after: PlanObjective
+    iterations: int  # neighbor plans evaluated
+    moves: int  # improving changes applied
+    stopped: str  # "local_optimum", "deadline" or "interrupted"
+    elapsed_ms: float
+
+class BudgetReport(BaseModel):
+    time_budget_ms: int
+    first_plan_ms: float  # until the first complete (greedy) plan
+    elapsed_ms: float  # planning and improvement; the write comes after
+    stopped: str  # "finished" (all work done early), "deadline" or "disconnected" (best plan so far returned)
+    candidates_completed: Optional[int] = None  # candidates>1: plans finished within the budget
+
+class PhaseTiming(BaseModel):
+    wall_ms: float
+    cpu_ms: float  # CPU time of the planning thread (summed over worker processes for candidates)
+    calls: int
+
+class FillProfile(BaseModel):
+    phases: Dict[str, PhaseTiming]  # context, clear, load, stats, phase1, phase2/matching, candidates, improve, write, commit, warnings
+    terms: Dict[str, PhaseTiming]  # per candidate: neighbors, hard_constraints, score, rest_gaps (numpy engine: vector_score)
+    candidates_scored: int  # candidates that passed the hard constraints and were scored
+    rejected: Dict[str, int]  # candidates dropped per hard constraint (restricted, same_window, overlap, vacation, rest_8h)
+
 class FillResponse(BaseModel):
     day: str
     results: List[PlanResultItem]
+    preview: bool = False
+    assignments: Optional[List[PlannedAssignment]] = None  # preview only
+    unfilled: Optional[List[UnfilledSeat]] = None  # preview only
+    seed: Optional[int] = None  # candidates>1: seed of the returned/applied plan
+    objective: Optional[PlanObjective] = None  # candidates>1
+    alternatives: Optional[List[CandidatePlan]] = None  # candidates>1: best top_k, best first
+    improvement: Optional[ImprovementReport] = None  # improve_ms only
+    profile: Optional[FillProfile] = None  # profile=true only
+    budget: Optional[BudgetReport] = None  # time_budget_ms only
+    warnings: Optional[List[WarningItem]] = None  # what GET /plan/warnings reports for the day with this plan in place
 
 class UnassignRequest(BaseModel):
     assignment_id: int
@@ -69,7 +180,21 @@ def _slot_bucket(dt: datetime) -> str:
         return "EVENING"
     return "NIGHT"
 
+def _fetch_vacations(db: Session, first_day: date, last_day: date) -> List[Vacation]:
+    # Fetch only vacations that touch [first_day, last_day]
+    return db.execute(
+        select(Vacation).where(
+            and_(
+                Vacation.start_date <= last_day,
+                Vacation.end_date >= first_day,
+            )
+        )
+    ).scalars().all()
+
 def _vacation_blocks_for_day(db: Session, the_day: date) -> Dict[int, List[tuple[datetime, datetime]]]:
+    return _vacation_blocks_from(_fetch_vacations(db, the_day, the_day), the_day)
+
+def _vacation_blocks_from(vacs: List[Vacation], the_day: date) -> Dict[int, List[tuple[datetime, datetime]]]:
     """
     Build, in LOCAL_TZ, the 'blocked' time windows for each soldier on `the_day`,
     then convert to UTC. Rules:
@@ -80,16 +205,6 @@ def _vacation_blocks_for_day(db: Session, the_day: date) -> Dict[int, List[tuple
     """
     blocks: Dict[int, List[tuple[datetime, datetime]]] = {}
 
-    # Fetch only vacations that touch this day
-    vacs = db.execute(
-        select(Vacation).where(
-            and_(
-                Vacation.start_date <= the_day,
-                Vacation.end_date >= the_day,
-            )
-        )
-    ).scalars().all()
-
     day_start_local = datetime(the_day.year, the_day.month, the_day.day, 0, 0, 0)
     day_end_local = day_start_local + timedelta(days=1)
 
@@ -120,8 +235,17 @@ def _vacation_blocks_for_day(db: Session, the_day: date) -> Dict[int, List[tuple
 def _overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
     return (a_start < b_end) and (a_end > b_start)
 
+Neighbors = tuple[bool, Optional[datetime], Optional[datetime]]  # (overlaps, prev_end, next_start)
+NO_NEIGHBORS: Neighbors = (False, None, None)
+
+def _neighbors(occupied: Optional[IntervalIndex], cand_start: datetime, cand_end: datetime) -> Neighbors:
+    """One bisect lookup per candidate, shared by the overlap, 8h-rest and gap checks."""
+    if not occupied:
+        return NO_NEIGHBORS
+    return occupied.neighbors(cand_start, cand_end)
+
 def _has_8h_rest_around(
-    occupied: List[tuple[datetime, datetime]],
+    neighbors: Neighbors,
     cand_start: datetime,
     cand_end: datetime,
     min_gap: timedelta,
@@ -130,53 +254,32 @@ def _has_8h_rest_around(
     Return True if BOTH gaps are satisfied:
       - previous_end -> cand_start >= min_gap
       - cand_end -> next_start >= min_gap
-    Only checks the nearest neighbors among `occupied`. Does NOT consider overlaps
+    Only checks the nearest neighbors (from `_neighbors`). Does NOT consider overlaps
     (you already block overlaps separately).
     """
-    if not occupied:
-        return True
-
-    prev_end = None
-    next_start = None
-
-    for s, e in occupied:
-        if e <= cand_start and (prev_end is None or e > prev_end):
-            prev_end = e
-        if s >= cand_end and (next_start is None or s < next_start):
-            next_start = s
-
+    _, prev_end, next_start = neighbors
     ok_prev = True if prev_end is None else (cand_start - prev_end) >= min_gap
     ok_next = True if next_start is None else (next_start - cand_end) >= min_gap
     return ok_prev and ok_next
 
 def _nearest_gaps_hours(
-    occupied: List[tuple[datetime, datetime]],
+    neighbors: Neighbors,
     cand_start: datetime,
     cand_end: datetime,
 ) -> tuple[float, float]:
     """
     Returns (gap_before_hours, gap_after_hours) with respect to the nearest
-    existing assignments in `occupied`. If none on one side, treat as a large gap.
+    existing assignments (from `_neighbors`). If none on one side, treat as a large gap.
     """
-    if not occupied:
-        # No neighbors -> huge effective rest both sides
-        return 1e6, 1e6
-
-    prev_end = None
-    next_start = None
-    for s, e in occupied:
-        if e <= cand_start and (prev_end is None or e > prev_end):
-            prev_end = e
-        if s >= cand_end and (next_start is None or s < next_start):
-            next_start = s
-
+    _, prev_end, next_start = neighbors
+    # No neighbor on a side -> huge effective rest on that side
     gap_before = (cand_start - prev_end).total_seconds() / 3600.0 if prev_end else 1e6
     gap_after = (next_start - cand_end).total_seconds() / 3600.0 if next_start else 1e6
     return gap_before, gap_after
 
 # -------- Fairness/Rotation configuration --------
 FAIRNESS_WINDOW_DAYS = 14  # look back this many days for rotation/workload stats
-EIGHT_HOURS = timedelta(hours=8)
+NEAR_HISTORY = timedelta(days=1)  # rows before the day still kept in memory (rest/overlap checks) when stats come from the rollup
 
 # We minimize this score (lower = more preferred).
 # Tweak weights to taste; all are >= 0.
@@ -309,6 +412,83 @@ def _build_soldier_stats(recent: List[Assignment], day_start: datetime, day_end:
 
     return stats
 
+class DayHistory(NamedTuple):
+    """Rollup totals of the FAIRNESS_WINDOW_DAYS closed days before a planned day (see `_load_history`)."""
+    workload: Dict[int, SoldierWorkload]
+    pair_counts: Dict[int, Dict[int, int]]
+
+def _build_soldier_stats_from_rollup(
+    history: DayHistory,
+    recent: List[AssignmentRow],
+    day_start: datetime,
+    day_end: datetime,
+) -> Dict[int, SoldierStats]:
+    """
+    `_build_soldier_stats` with the closed days of the window read from the
+    workload rollup; only the rows touching the day itself are folded here.
+    """
+    stats: Dict[int, SoldierStats] = {}
+    for s_id, w in history.workload.items():
+        st = stats[s_id] = SoldierStats()
+        st.last_end_at = w.last_end_at
+        st.second_last_end_at = w.second_last_end_at
+        st.total_hours_window = w.hours
+        st.mission_count = dict(w.mission_count)
+        st.recent_missions = set(w.mission_count)
+        st.slot_bucket_count = dict(w.slot_bucket_count)
+
+    for a in recent:
+        sa = _naive(a.start_at)
+        ea = _naive(a.end_at)
+        if ea <= day_start or sa >= day_end:
+            continue
+        st = stats.setdefault(a.soldier_id, SoldierStats())
+        st.today_count += 1
+        st.total_hours_window += (min(ea, day_end) - max(sa, day_start)).total_seconds() / 3600.0
+        if sa >= day_start:
+            st.mission_count[a.mission_id] = st.mission_count.get(a.mission_id, 0) + 1
+            st.recent_missions.add(a.mission_id)
+            bucket = _slot_bucket(sa)
+            st.slot_bucket_count[bucket] = st.slot_bucket_count.get(bucket, 0) + 1
+
+    return stats
+
+def _build_pair_counts_from_rollup(
+    history: DayHistory,
+    recent: List[AssignmentRow],
+    day_start: datetime,
+    day_end: datetime,
+) -> Dict[int, Dict[int, int]]:
+    """`_build_pair_counts` from the rollup pairs plus the windows starting on the day."""
+    today = _build_pair_counts([r for r in recent if day_start <= r.start_at < day_end])
+    pair_counts = dict(history.pair_counts)
+    for s_id, fellows in today.items():
+        merged = dict(pair_counts.get(s_id, {}))
+        for fellow_id, c in fellows.items():
+            merged[fellow_id] = merged.get(fellow_id, 0) + c
+        pair_counts[s_id] = merged
+    return pair_counts
+
+def _history_hours(history: DayHistory, known_rows: List[AssignmentRow], day_start: datetime) -> Dict[int, float]:
+    """
+    Whole-assignment hours of the rows that started before the day and touch
+    the fairness window (what `_plan_objective` / LocalSearch count for them),
+    from the rollup plus the rows still running at `day_start`.
+    """
+    hours = {s_id: w.hours + w.carried_hours for s_id, w in history.workload.items()}
+    for r in known_rows:
+        if r.soldier_id is not None and r.start_at < day_start < r.end_at:
+            hours[r.soldier_id] = hours.get(r.soldier_id, 0.0) + (r.end_at - day_start).total_seconds() / 3600.0
+    return hours
+
+def _load_history(db: Session, the_day: date, soldier_ids: Optional[set[int]] = None) -> DayHistory:
+    """Rollup totals of the FAIRNESS_WINDOW_DAYS days before `the_day`: two queries, no assignment scan."""
+    first_day, last_day = the_day - timedelta(days=FAIRNESS_WINDOW_DAYS), the_day - timedelta(days=1)
+    return DayHistory(
+        workload=load_workload(db, first_day, last_day),
+        pair_counts=load_pair_counts(db, first_day, last_day, soldier_ids),
+    )
+
 def _overlap_seconds(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> float:
     x_start = max(a_start, b_start)
     x_end = min(a_end, b_end)
@@ -316,7 +496,7 @@ def _overlap_seconds(a_start: datetime, a_end: datetime, b_start: datetime, b_en
         return (x_end - x_start).total_seconds()
     return 0.0
 
-def _is_near_8h_rest(gap: timedelta, tolerance_minutes: int = 10) -> bool:
+def _is_near_8h_rest(gap: timedelta, tolerance_minutes: int = NEAR_EIGHT_MINUTES) -> bool:
     """Check if a rest gap is approximately 8 hours (±tolerance)."""
     gap_seconds = gap.total_seconds()
     eight_hours_seconds = 8 * 3600
@@ -347,7 +527,7 @@ def _score_candidate(
     pair_counts: Dict[int, Dict[int, int]],
     vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
     weights: Dict[str, float],
-    all_stats: Optional[Dict[int, SoldierStats]] = None,  # NEW: for rest equality calculation
+    rest_index: Optional[RestIndex] = None,               # running last_end aggregates for rest equality
     friends_map: Optional[Dict[int, set[int]]] = None,     # NEW: friendship data
     not_friends_map: Optional[Dict[int, set[int]]] = None, # NEW: not-friendship data
 ) -> float:
@@ -401,22 +581,11 @@ def _score_candidate(
         score += weights.get("short_slot_preference_for_rest", -1.0) * (12.0 - duration_hours)  # Assuming max slot is ~12h
     
     # NEW: Rest equality - penalize if this soldier's rest is very different from average
-    if all_stats is not None and rest_from_last is not None:
-        # Calculate average rest time from all other soldiers
-        rest_times = []
-        for other_soldier_id, other_st in all_stats.items():
-            if other_soldier_id != soldier.id and other_st.last_end_at is not None:
-                # Calculate what the rest would be for this candidate time
-                other_gap = _calculate_rest_gap(
-                    other_st.last_end_at, 
-                    start_at, 
-                    vacation_blocks.get(other_soldier_id, [])
-                )
-                if other_gap >= timedelta(0):  # Only count non-overlapping rests
-                    rest_times.append(other_gap.total_seconds() / 3600.0)
-        
-        if rest_times:
-            avg_rest = sum(rest_times) / len(rest_times)
+    if rest_index is not None and rest_from_last is not None:
+        # Average (vacation-adjusted, non-overlapping) rest of all other soldiers for this
+        # candidate time, from the running aggregates instead of a scan over every soldier
+        avg_rest = rest_index.average_excluding(start_at, rest_from_last)
+        if avg_rest is not None:
             rest_diff = abs(rest_from_last - avg_rest)
             # Penalize deviation from average rest time
             score += weights.get("rest_equality_penalty_per_hour_diff", 0.5) * rest_diff
@@ -462,7 +631,16 @@ def _score_candidate(
 
     return score
 
-def _update_stats_after_assignment(st: SoldierStats, mission_id: int, start_at: datetime, end_at: datetime, day_start: datetime, day_end: datetime):
+def _update_stats_after_assignment(
+    st: SoldierStats,
+    mission_id: int,
+    start_at: datetime,
+    end_at: datetime,
+    day_start: datetime,
+    day_end: datetime,
+    rest_index: Optional[RestIndex] = None,
+    soldier_id: Optional[int] = None,
+):
     # Update soldier stats in-memory after we place an assignment, so next picks are fair
     if end_at <= day_start:
         # Assignment ends before the day we're planning - update last_end_at tracking
@@ -471,6 +649,8 @@ def _update_stats_after_assignment(st: SoldierStats, mission_id: int, start_at:
             if st.last_end_at is not None:
                 st.second_last_end_at = st.last_end_at
             st.last_end_at = end_at
+            if rest_index is not None:
+                rest_index.set_last_end(soldier_id, end_at)
         elif st.second_last_end_at is None or end_at > st.second_last_end_at:
             # Update second_last_end_at if it's more recent
             st.second_last_end_at = end_at
@@ -503,101 +683,59 @@ def _update_stats_after_assignment(st: SoldierStats, mission_id: int, start_at:
         st.slot_bucket_count[bucket] = st.slot_bucket_count.get(bucket, 0) + 1
 
 
-def _normalize_mission_name(name: str) -> str:
-    """Normalize mission name for comparison (lowercase, trim)."""
-    return name.lower().strip()
-
-def _parse_restrictions_string(restrictions_str: str) -> List[str]:
-    """Parse comma or semicolon separated restriction names."""
-    if not restrictions_str:
-        return []
-    # Replace semicolons with commas, then split
-    return [_normalize_mission_name(x) for x in restrictions_str.replace(';', ',').split(',') if x.strip()]
-
-def _build_restricted_pairs(
-    db: Session,
-    missions: List[Mission],
-    soldiers: List[Soldier]
-) -> set[tuple[int, int]]:
+def _hard_constraint_violation(
+    cand_id: int,
+    m_id: int,
+    start_at: datetime,
+    end_at: datetime,
+    neighbors: Neighbors,
+    restricted_pairs: set[tuple[int, int]],
+    existing_same_window: set[tuple[int, datetime, datetime]],
+    vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
+    strict: bool,
+    prefiltered: bool = False,
+) -> Optional[str]:
     """
-    Build a set of (soldier_id, mission_id) pairs that are restricted.
-    Checks both:
-    1. soldier_mission_restrictions table
-    2. soldiers.restrictions string field (mission names)
+    Restriction, same-window, overlap, vacation and (strict) 8h-rest checks for one
+    candidate: the first one it fails (the FillProfile rejection reason), or None.
+    `prefiltered`: restriction, same-window and vacation were already applied
+    through EligibilityMasks, so only the interval checks run.
     """
-    restricted: set[tuple[int, int]] = set()
-    
-    # 1. Add table-based restrictions
-    table_restrictions = db.execute(
-        select(SoldierMissionRestriction.soldier_id, SoldierMissionRestriction.mission_id)
-    ).all()
-    restricted.update(table_restrictions)
-    
-    # 2. Add string-based restrictions (by mission name)
-    # Build a mission name -> mission_id mapping
-    mission_name_to_id: Dict[str, List[int]] = {}
-    for m in missions:
-        normalized_name = _normalize_mission_name(m.name)
-        mission_name_to_id.setdefault(normalized_name, []).append(m.id)
-    
-    # Check each soldier's restrictions string
-    for soldier in soldiers:
-        if not soldier.restrictions:
-            continue
-        restricted_names = _parse_restrictions_string(soldier.restrictions)
-        for name in restricted_names:
-            if name in mission_name_to_id:
-                for mission_id in mission_name_to_id[name]:
-                    restricted.add((soldier.id, mission_id))
-    
-    return restricted
-
-def _build_friendship_maps(
-    db: Session,
-    soldiers: List[Soldier]
-) -> tuple[Dict[int, set[int]], Dict[int, set[int]]]:
+    # never violate hard constraints
+    if not prefiltered:
+        if (cand_id, m_id) in restricted_pairs:
+            return "restricted"
+        if (cand_id, start_at, end_at) in existing_same_window:
+            return "same_window"
+    if neighbors[0]:
+        return "overlap"
+    if not prefiltered and any(
+        bs_utc < end_at and be_utc > start_at for (bs_utc, be_utc) in vacation_blocks.get(cand_id, [])
+    ):
+        return "vacation"
+
+    # STRICT MODE: Block assignments with less than 8h rest, but allow REST warnings (~8h rest)
+    # This ensures no OVERLAP warnings (<8h rest), but REST warnings (~8h rest) are allowed
+    # (though minimized in scoring). Note: overlaps are already blocked above.
+    if strict:
+        # Check for minimum 8h rest requirement (allows exactly 8h = REST warning)
+        # This blocks <8h rest (OVERLAP warnings) but allows >=8h rest (including REST warnings)
+        if not _has_8h_rest_around(neighbors, start_at, end_at, EIGHT_HOURS):
+            return "rest_8h"  # Less than 8h rest - never allow (this blocks OVERLAP warnings)
+    # else: soft mode → allow <8h; warnings will be produced by your warnings endpoint
+    return None
+
+def _pool_positions(pool, eligible: Optional[np.ndarray], prof: Optional[PlanProfiler] = None) -> List[int]:
     """
-    Build maps of:
-    - friends_map: soldier_id -> set of friend_ids (status='friend')
-    - not_friends_map: soldier_id -> set of not_friend_ids (status='not_friend')
+    Pool positions worth checking: all of them, or only those set in `eligible`
+    (the others are on vacation in the window, counted into `prof`).
     """
-    friendships = db.execute(
-        select(SoldierFriendship)
-    ).scalars().all()
-    
-    friends_map: Dict[int, set[int]] = {}
-    not_friends_map: Dict[int, set[int]] = {}
-    
-    for f in friendships:
-        if f.status == 'friend':
-            friends_map.setdefault(f.soldier_id, set()).add(f.friend_id)
-        elif f.status == 'not_friend':
-            not_friends_map.setdefault(f.soldier_id, set()).add(f.friend_id)
-    
-    return friends_map, not_friends_map
-
-def _load_context(db: Session) -> dict:
-    missions: List[Mission] = db.execute(
-        select(Mission).options(
-            selectinload(Mission.slots),
-            selectinload(Mission.requirements).selectinload(MissionRequirement.role),
-        )
-    ).scalars().all()
-
-    soldiers: List[Soldier] = db.execute(
-        select(Soldier).options(selectinload(Soldier.roles))
-    ).scalars().all()
-
-    soldiers_by_role: Dict[int, List[Soldier]] = {}
-    for s in soldiers:
-        for r in s.roles:
-            soldiers_by_role.setdefault(r.id, []).append(s)
-
-    return {
-        "missions": missions,
-        "soldiers_by_role": soldiers_by_role,
-        "all_soldiers": soldiers,  # new: pool for generic slots
-    }
+    if eligible is None:
+        return list(range(len(pool)))
+    positions = np.flatnonzero(eligible).tolist()
+    if prof is not None:
+        prof.reject("vacation", len(pool) - len(positions))
+    return positions
 
 def _collect_candidates_for_slot(
     pool,
@@ -607,7 +745,7 @@ def _collect_candidates_for_slot(
     stats_by_soldier: Dict[int, SoldierStats],
     restricted_pairs: set[tuple[int, int]],
     existing_same_window: set[tuple[int, datetime, datetime]],
-    occupied_by_soldier: Dict[int, List[tuple[datetime, datetime]]],
+    occupied_by_soldier: Dict[int, IntervalIndex],
     vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
     rr_start_idx: int,
     strict: bool,
@@ -616,52 +754,62 @@ def _collect_candidates_for_slot(
     weights: Dict[str, float],                                # NEW: weights dict
     friends_map: Dict[int, set[int]],                         # NEW: friendship data
     not_friends_map: Dict[int, set[int]],                    # NEW: not-friendship data
+    rest_index: Optional[RestIndex] = None,
     shuffle_mode: bool = False,
     rng: Optional[random.Random] = None,                   
+    eligible: Optional[np.ndarray] = None,
+    prof: Optional[PlanProfiler] = None,
 ) -> List[tuple[float, int, Soldier]]:
-    """Return scored candidates. If strict=False, relax the 8h rest checks."""
+    """
+    Return scored candidates. If strict=False, relax the 8h rest checks.
+    `eligible` (from EligibilityMasks.pool) marks the positions that already passed
+    the restriction / same-window / vacation filters; the others are skipped.
+    With `prof`, each term is timed per candidate and rejections are counted.
+    """
     scored: List[tuple[float, int, Soldier]] = []
     start_at = _naive(start_at)
     end_at   = _naive(end_at)
-    for i, cand in enumerate(pool):
-        # never violate hard constraints
-        if (cand.id, m_id) in restricted_pairs:
-            continue
-        if (cand.id, start_at, end_at) in existing_same_window:
-            continue
-        if any(_overlaps(start_at, end_at, s, e) for (s, e) in occupied_by_soldier.get(cand.id, [])):
-            continue
-        if any(bs_utc < end_at and be_utc > start_at for (bs_utc, be_utc) in vacation_blocks.get(cand.id, [])):
+    prefiltered = eligible is not None
+    for i in _pool_positions(pool, eligible, prof):
+        cand = pool[i]
+        if prof is not None:
+            t = prof.clock()
+        neighbors = _neighbors(occupied_by_soldier.get(cand.id), start_at, end_at)
+        if prof is not None:
+            prof.add_term("neighbors", t)
+            t = prof.clock()
+        rejected = _hard_constraint_violation(
+            cand.id, m_id, start_at, end_at, neighbors,
+            restricted_pairs, existing_same_window, vacation_blocks, strict, prefiltered,
+        )
+        if prof is not None:
+            prof.add_term("hard_constraints", t)
+        if rejected is not None:
+            if prof is not None:
+                prof.reject(rejected)
             continue
 
         st = stats_by_soldier.setdefault(cand.id, SoldierStats())
 
-        # STRICT MODE: Block assignments with less than 8h rest, but allow REST warnings (~8h rest)
-        # This ensures no OVERLAP warnings (<8h rest), but REST warnings (~8h rest) are allowed
-        # (though minimized in scoring). Note: overlaps are already blocked above (line 546).
-        if strict:
-            occ_list = occupied_by_soldier.get(cand.id, [])
-            # Check for minimum 8h rest requirement (allows exactly 8h = REST warning)
-            # This blocks <8h rest (OVERLAP warnings) but allows >=8h rest (including REST warnings)
-            if not _has_8h_rest_around(occ_list, start_at, end_at, EIGHT_HOURS):
-                continue  # Less than 8h rest - never allow (this blocks OVERLAP warnings)
-        # else: soft mode → allow <8h; warnings will be produced by your warnings endpoint
-
+        if prof is not None:
+            t = prof.clock()
         base_score = _score_candidate(
             cand, m_id, start_at, end_at, st,
             assigned_here=assigned_here,
             pair_counts=pair_counts,
             vacation_blocks=vacation_blocks,
             weights=weights,
-            all_stats=stats_by_soldier,  # NEW: pass all stats for rest equality calculation
+            rest_index=rest_index,
             friends_map=friends_map,
             not_friends_map=not_friends_map,
         )
+        if prof is not None:
+            prof.add_term("score", t)
+            t = prof.clock()
 
         # Fairness add-on: push toward max-min rest across the day.
         # Compute nearest rest gaps around this potential placement.
-        occ_list = occupied_by_soldier.get(cand.id, [])
-        gap_before_h, gap_after_h = _nearest_gaps_hours(occ_list, start_at, end_at)
+        gap_before_h, gap_after_h = _nearest_gaps_hours(neighbors, start_at, end_at)
 
         # Reward assigning the most-rested soldier now (big gap_before),
         # and avoid creating too-short future rests (penalize small gap_after).
@@ -669,6 +817,8 @@ def _collect_candidates_for_slot(
             weights.get("rest_before_priority_per_hour", 0.0) * gap_before_h
             + weights.get("rest_after_priority_per_hour", 0.0) * gap_after_h
         )
+        if prof is not None:
+            prof.add_term("rest_gaps", t)
 
         rr_distance = (i - rr_start_idx) % max(1, len(pool))
         score = base_score + rest_adjust + rr_distance * 0.001
@@ -676,22 +826,196 @@ def _collect_candidates_for_slot(
         scored.append((score, i, cand))
 
 
+    if prof is not None:
+        prof.candidates_scored += len(scored)
     scored.sort(key=lambda t: (t[0], t[1]))
     return scored
 
-@router.post("/fill", response_model=FillResponse)
-def fill(req: FillRequest, db: Session = Depends(get_db)):
-    from datetime import timezone
-    
-    the_day = _parse_day(req.day)
-    day_start, day_end = _day_bounds(the_day)
-    
-    # Convert day bounds to UTC-aware datetimes for database comparisons
-    # The database stores timezone-aware datetimes, so we need to match that for WHERE clauses
-    day_start_aware = day_start.replace(tzinfo=timezone.utc)
-    day_end_aware = day_end.replace(tzinfo=timezone.utc)
-    
-    # Fix sequence if out of sync (prevents duplicate key errors)
+def _collect_candidates_vectorized(
+    pool,
+    m_id: int,
+    start_at: datetime,
+    end_at: datetime,
+    stats_by_soldier: Dict[int, SoldierStats],
+    restricted_pairs: set[tuple[int, int]],
+    existing_same_window: set[tuple[int, datetime, datetime]],
+    occupied_by_soldier: Dict[int, IntervalIndex],
+    vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
+    rr_start_idx: int,
+    strict: bool,
+    assigned_here: set[int],
+    weights: Dict[str, float],
+    scorer: VectorScorer,
+    eligible: Optional[np.ndarray] = None,
+    prof: Optional[PlanProfiler] = None,
+    **_ignored,
+) -> List[tuple[float, int, Soldier]]:
+    """
+    Same contract as `_collect_candidates_for_slot`, but the `_score_candidate`
+    terms are computed for the whole eligible pool at once by `scorer`. With
+    `prof`, the whole collection is timed as one term.
+    """
+    if prof is not None:
+        t = prof.clock()
+    start_at = _naive(start_at)
+    end_at   = _naive(end_at)
+
+    idx: List[int] = []
+    gaps_before: List[float] = []
+    gaps_after: List[float] = []
+    prefiltered = eligible is not None
+    for i in _pool_positions(pool, eligible, prof):
+        cand = pool[i]
+        neighbors = _neighbors(occupied_by_soldier.get(cand.id), start_at, end_at)
+        rejected = _hard_constraint_violation(
+            cand.id, m_id, start_at, end_at, neighbors,
+            restricted_pairs, existing_same_window, vacation_blocks, strict, prefiltered,
+        )
+        if rejected is not None:
+            if prof is not None:
+                prof.reject(rejected)
+            continue
+        gap_before_h, gap_after_h = _nearest_gaps_hours(neighbors, start_at, end_at)
+        idx.append(i)
+        gaps_before.append(gap_before_h)
+        gaps_after.append(gap_after_h)
+
+    if not idx:
+        if prof is not None:
+            prof.add_term("vector_score", t)
+        return []
+
+    positions = np.asarray(idx)
+    rows = scorer.rows_for(pool[i].id for i in idx)
+    base_score = scorer.score(rows, m_id, start_at, end_at, assigned_here)
+    rest_adjust = (
+        weights.get("rest_before_priority_per_hour", 0.0) * np.asarray(gaps_before)
+        + weights.get("rest_after_priority_per_hour", 0.0) * np.asarray(gaps_after)
+    )
+    rr_distance = (positions - rr_start_idx) % max(1, len(pool))
+    score = base_score + rest_adjust + rr_distance * 0.001
+
+    order = np.lexsort((positions, score))
+    if prof is not None:
+        prof.add_term("vector_score", t)
+        prof.candidates_scored += len(order)
+    return [(float(score[k]), int(positions[k]), pool[positions[k]]) for k in order]
+
+def _count_pool_rejections(
+    prof: PlanProfiler,
+    eligibility: EligibilityMasks,
+    role_id: Optional[int],
+    m_id: int,
+    start_at: datetime,
+    end_at: datetime,
+) -> None:
+    """Count the soldiers `_plan_day` filters out of a seat's pool before collecting candidates."""
+    restricted, same_window = eligibility.rejections(role_id, m_id, start_at, end_at)
+    prof.reject("restricted", restricted)
+    prof.reject("same_window", same_window)
+
+class AssignmentRow(NamedTuple):
+    """Plain assignment row used by the in-memory planner (id is None until written)."""
+    id: Optional[int]
+    mission_id: int
+    soldier_id: Optional[int]
+    role_id: Optional[int]
+    start_at: datetime
+    end_at: datetime
+    score: Optional[float] = None  # planner score when created by _plan_day
+    candidates: Optional[int] = None
+
+class DayPlan(NamedTuple):
+    results: List[PlanResultItem]
+    created: List[AssignmentRow]
+    unfilled: List[UnfilledSeat]
+
+class SeatLayout(NamedTuple):
+    """
+    Seats of every window of a mission: one per explicit role demand (sorted by
+    role name to match the API ordering the UI builds exclusion keys from), then
+    the generic ones. Positions are absolute across both.
+    """
+    roles: List[int]
+    generic_count: int
+
+    def key(self, m_id: int, pos: int, start_at: datetime, end_at: datetime) -> str:
+        # Format: mission_id_roleId|GENERIC_start_at_end_at_position; the UI appends
+        # :00 to isoformat(): 2025-10-28T22:00:00 -> 2025-10-28T22:00:00:00
+        role = self.roles[pos] if pos < len(self.roles) else "GENERIC"
+        return f"{m_id}_{role}_{start_at.isoformat()}:00_{end_at.isoformat()}:00_{pos}"
+
+    def open_seats(
+        self,
+        m_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        excluded: set[str],
+        taken: Optional[Dict[Optional[int], int]] = None,
+    ) -> List[tuple[Optional[int], int]]:
+        """
+        (role_id or None, position) of the window's seats whose key is not in
+        `excluded` (the /plan/fill exclude_slots), explicit roles first. `taken`
+        counts soldiers already in the window per role_id (None: generic); they
+        cover the first open seats of their role and that many generic seats.
+        """
+        left = dict(taken or {})
+        seats: List[tuple[Optional[int], int]] = []
+        for pos, role_id in enumerate(self.roles):
+            if self.key(m_id, pos, start_at, end_at) in excluded:
+                continue
+            if left.get(role_id, 0) > 0:
+                left[role_id] -= 1
+                continue
+            seats.append((role_id, pos))
+        generic = [
+            (None, pos) for pos in range(len(self.roles), len(self.roles) + self.generic_count)
+            if self.key(m_id, pos, start_at, end_at) not in excluded
+        ]
+        seats.extend(generic[:max(0, len(generic) - left.get(None, 0))])
+        return seats
+
+def _seat_layout(m: MissionRow) -> SeatLayout:
+    reqs = m.requirements or []
+    roles: List[int] = []
+    for r in sorted(reqs, key=lambda x: (x.role.name if x.role else "", x.role_id)):
+        if r.count and r.count > 0:
+            roles.extend([r.role_id] * r.count)
+    generic_count = max(0, int(m.total_needed or 0) - sum((r.count or 0) for r in reqs))
+    return SeatLayout(roles, generic_count)
+
+def _fetch_assignment_rows(
+    db: Session,
+    window_start: datetime,
+    window_end: datetime,
+    soldier_ids: Optional[set[int]] = None,
+) -> List[AssignmentRow]:
+    """All assignments touching [window_start, window_end) as naive plain rows (optionally for some soldiers)."""
+    q = (
+        select(
+            Assignment.id, Assignment.mission_id, Assignment.soldier_id,
+            Assignment.role_id, Assignment.start_at, Assignment.end_at,
+        )
+        .where(Assignment.end_at > window_start)
+        .where(Assignment.start_at < window_end)
+    )
+    if soldier_ids is not None:
+        q = q.where(Assignment.soldier_id.in_(soldier_ids))
+    return [
+        AssignmentRow(a_id, m_id, s_id, r_id, _naive(s_at), _naive(e_at))
+        for a_id, m_id, s_id, r_id, s_at, e_at in db.execute(q).all()
+    ]
+
+_sequence_checked = False
+
+def _fix_assignments_sequence(db: Session) -> None:
+    # Fix sequence if out of sync (prevents duplicate key errors). The app never
+    # inserts explicit ids, so it can only drift through an outside restore:
+    # check once per process instead of on every fill.
+    global _sequence_checked
+    if _sequence_checked:
+        return
+    _sequence_checked = True
     try:
         result = db.execute(text("SELECT MAX(id) FROM assignments"))
         max_id = result.scalar()
@@ -705,74 +1029,178 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                 db.commit()
     except Exception as e:
         # If sequence fix fails, log but continue (might not be a sequence table)
-        print(f"[WARN] Could not fix sequence: {e}")
+        logger.warning("Could not fix sequence: %s", e)
         pass
-    
+
+def _make_rng(random_seed: Optional[int]) -> random.Random:
+    # Optional shuffle: produce a different yet valid plan
+    if random_seed is not None:
+        return random.Random(random_seed)
+    # Use system time and OS random bytes for a unique seed each time
+    import time
+    import os
+    seed = int.from_bytes(os.urandom(8), 'big') ^ time.time_ns()
+    return random.Random(seed)
+
+def _active_weights(custom: Optional[Dict[str, float]]) -> Dict[str, float]:
     # Merge custom weights with defaults
     active_weights = WEIGHTS.copy()
-    if req.weights:
-        active_weights.update(req.weights)
-    
-    ctx = _load_context(db)
-    vacation_blocks = _vacation_blocks_for_day(db, the_day)
-    recent_assignments = _fetch_recent_assignments(db, day_start_aware, day_end_aware)
-    stats_by_soldier = _build_soldier_stats(recent_assignments, day_start, day_end)
-    pair_counts = _build_pair_counts(recent_assignments)
-    
-    if req.exclude_slots:
-        print(f"[DEBUG] Total excluded slots: {len(req.exclude_slots)}")
-        print(f"[DEBUG] Excluded slots: {req.exclude_slots}")
-    if req.locked_assignments:
-        print(f"[DEBUG] Locked assignment IDs: {req.locked_assignments}")
+    if custom:
+        active_weights.update(custom)
+    return active_weights
+
+def _shuffle_pools(ctx: dict, rng: random.Random) -> None:
+    # Shuffle per-role pools and generic pool in-place (copy-safe as they are lists we own)
+    for role_id, lst in ctx["soldiers_by_role"].items():
+        rng.shuffle(lst)
+    rng.shuffle(ctx["all_soldiers"])
+
+def _snapshot_context(snapshot: PlannerSnapshot) -> dict:
+    """A planner context over the snapshot, with per-request pool lists (the shuffle reorders them in place)."""
+    return {
+        "missions": list(snapshot.missions),
+        "soldiers_by_role": {role_id: list(lst) for role_id, lst in snapshot.soldiers_by_role.items()},
+        "all_soldiers": list(snapshot.soldiers),
+        "restricted_pairs": snapshot.restricted_pairs,
+        "friends_map": snapshot.friends_map,
+        "not_friends_map": snapshot.not_friends_map,
+    }
 
-    # Optional shuffle: produce a different yet valid plan
-    if req.random_seed is not None:
-        rng = random.Random(req.random_seed)
-    else:
-        # Use system time and OS random bytes for a unique seed each time
-        import time
-        import os
-        seed = int.from_bytes(os.urandom(8), 'big') ^ time.time_ns()
-        rng = random.Random(seed)
-    
-    if req.shuffle:
-        # Shuffle per-role pools and generic pool in-place (copy-safe as they are lists we own)
-        for role_id, lst in ctx["soldiers_by_role"].items():
-            rng.shuffle(lst)
-        rng.shuffle(ctx["all_soldiers"])
-
-    # Exact-window duplicates that already exist today
-    existing_same_window = set(
-        (sid, _naive(s_at), _naive(e_at))
-        for sid, s_at, e_at in db.execute(
-            select(Assignment.soldier_id, Assignment.start_at, Assignment.end_at)
-            .where(Assignment.start_at < day_end_aware)
-            .where(Assignment.end_at > day_start_aware)
-        ).all()
-    )
+def _prepare_context(db: Session, req, rng: random.Random) -> tuple[dict, List[MissionRow]]:
+    """The planner_snapshot as a per-request context, with the optional shuffle applied."""
+    ctx = _snapshot_context(planner_snapshot(db))
 
-    # Per-soldier occupied intervals that touch the day (for general overlap checks)
-    occupied_by_soldier: Dict[int, List[tuple[datetime, datetime]]] = {}
-    for sid, s_at, e_at in db.execute(
-        select(Assignment.soldier_id, Assignment.start_at, Assignment.end_at)
-        .where(Assignment.start_at < day_end_aware)
-        .where(Assignment.end_at > day_start_aware)
-    ).all():
-        s_na, e_na = _naive(s_at), _naive(e_at)
-        occupied_by_soldier.setdefault(sid, []).append((s_na, e_na))
-
-    # Build restricted pairs from both table and string field
-    restricted_pairs = _build_restricted_pairs(db, ctx["missions"], ctx["all_soldiers"])
-    
-    # Build friendship maps
-    friends_map, not_friends_map = _build_friendship_maps(db, ctx["all_soldiers"])
+    if req.shuffle:
+        _shuffle_pools(ctx, rng)
 
     mission_list = ctx["missions"]
     if req.mission_ids:
         wanted = set(req.mission_ids)
         mission_list = [m for m in mission_list if m.id in wanted]
+    return ctx, mission_list
+
+def _clear_for_replace(
+    db: Session,
+    mission_list: List[MissionRow],
+    range_start: datetime,
+    range_end: datetime,
+    locked_assignments: Optional[List[int]],
+) -> None:
+    # One-shot clear (so in-memory lookups reflect the actual DB state)
+    ids_to_clear = [mm.id for mm in mission_list]
+    if not ids_to_clear:
+        return
+    delete_conditions = [
+        Assignment.mission_id.in_(ids_to_clear),
+        Assignment.start_at >= range_start,
+        Assignment.start_at < range_end,
+    ]
+
+    # Exclude locked assignments from deletion
+    if locked_assignments:
+        delete_conditions.append(~Assignment.id.in_(locked_assignments))
+
+    db.execute(delete(Assignment).where(and_(*delete_conditions)))
+
+def _rows_after_clear(
+    rows: List[AssignmentRow],
+    mission_list: List[MissionRow],
+    range_start: datetime,
+    range_end: datetime,
+    locked_assignments: Optional[List[int]],
+) -> List[AssignmentRow]:
+    """In-memory counterpart of `_clear_for_replace`, used by preview."""
+    ids_to_clear = {mm.id for mm in mission_list}
+    locked = set(locked_assignments or [])
+    return [
+        r for r in rows
+        if not (
+            r.mission_id in ids_to_clear
+            and range_start <= r.start_at < range_end
+            and r.id not in locked
+        )
+    ]
+
+def _plan_day(
+    req,
+    the_day: date,
+    ctx: dict,
+    mission_list: List[MissionRow],
+    known_rows: List[AssignmentRow],
+    vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
+    active_weights: Dict[str, float],
+    rng: random.Random,
+    history: Optional[DayHistory] = None,
+    prof: Optional[PlanProfiler] = None,
+) -> DayPlan:
+    """
+    Run the two-phase fill for one day against in-memory state.
+
+    `known_rows` must hold every assignment in [day - FAIRNESS_WINDOW_DAYS, day end),
+    or only those in [day - NEAR_HISTORY, day end) when `history` (the rollup totals
+    of the days before, from `_load_history`) is given; rows starting after the day
+    are ignored. Nothing is written: the new assignments are returned as
+    `AssignmentRow`s for the caller to persist, along with the seats that could
+    not be filled. With `prof`, phases and candidate scoring are profiled into it.
+    """
+    if prof is not None:
+        t_phase = prof.clock()
+    day_start, day_end = _day_bounds(the_day)
+    window_start = day_start - timedelta(days=FAIRNESS_WINDOW_DAYS)
+
+    recent_assignments = [r for r in known_rows if r.end_at > window_start and r.start_at < day_end]
+    if history is not None:
+        stats_by_soldier = _build_soldier_stats_from_rollup(history, recent_assignments, day_start, day_end)
+        pair_counts = _build_pair_counts_from_rollup(history, recent_assignments, day_start, day_end)
+    else:
+        stats_by_soldier = _build_soldier_stats(recent_assignments, day_start, day_end)
+        pair_counts = _build_pair_counts(recent_assignments)
+    rest_index = RestIndex.from_stats(stats_by_soldier, vacation_blocks, ref=day_start)
+
+    restricted_pairs = ctx["restricted_pairs"]
+    friends_map, not_friends_map = ctx["friends_map"], ctx["not_friends_map"]
+
+    # Seat pools come from bitmasks (role, restriction, vacation, already in window)
+    # over the soldiers in pool order; the per-window masks fill in as seats are planned
+    eligibility = EligibilityMasks(ctx["all_soldiers"], ctx["soldiers_by_role"], restricted_pairs, vacation_blocks)
+
+    # Exact-window duplicates and per-soldier occupied intervals that touch the day
+    existing_same_window: set[tuple[int, datetime, datetime]] = set()
+    occupied_by_soldier: Dict[int, IntervalIndex] = {}
+    existing_generic_by_window: Dict[tuple[int, datetime, datetime], List[AssignmentRow]] = {}
+    for r in recent_assignments:
+        if r.end_at <= day_start:
+            continue
+        existing_same_window.add((r.soldier_id, r.start_at, r.end_at))
+        eligibility.mark_assigned(r.soldier_id, r.start_at, r.end_at)
+        occupied_by_soldier.setdefault(r.soldier_id, IntervalIndex()).add(r.start_at, r.end_at)
+        if r.role_id is None and day_start <= r.start_at < day_end:
+            existing_generic_by_window.setdefault((r.mission_id, r.start_at, r.end_at), []).append(r)
+
+    # Scoring engine: per-candidate Python or vectorized NumPy (same ranking)
+    scorer: Optional[VectorScorer] = None
+    collect_candidates = _collect_candidates_for_slot
+    if req.scoring_engine == "numpy":
+        scorer = VectorScorer(
+            (s.id for s in ctx["all_soldiers"]),
+            stats_by_soldier,
+            vacation_blocks,
+            pair_counts,
+            friends_map,
+            not_friends_map,
+            active_weights,
+            ref=day_start,
+            rest_index=rest_index,
+        )
+        collect_candidates = partial(_collect_candidates_vectorized, scorer=scorer)
+    if prof is not None:
+        collect_candidates = partial(collect_candidates, prof=prof)
+        prof.add_phase("stats", t_phase)
+        t_phase = prof.clock()
 
     results: List[PlanResultItem] = []
+    created: List[AssignmentRow] = []
+    unfilled: List[UnfilledSeat] = []
     rr_index: Dict[Optional[int], int] = {}  # role_id or None
 
     if req.shuffle:
@@ -781,43 +1209,126 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
             rr_index[role_id] = rng.randrange(0, 1000)
         rr_index[None] = rng.randrange(0, 1000)
 
-    # One-shot clear (so in-memory lookups reflect the actual DB state)
-    if req.replace:
-        ids_to_clear = [mm.id for mm in mission_list]
-        if ids_to_clear:
-            # Build delete statement
-            delete_conditions = [
-                Assignment.mission_id.in_(ids_to_clear),
-                Assignment.start_at >= day_start_aware,
-                Assignment.start_at < day_end_aware,
-            ]
-            
-            # Exclude locked assignments from deletion
-            if req.locked_assignments:
-                delete_conditions.append(~Assignment.id.in_(req.locked_assignments))
-            
-            # Use timezone-aware datetimes for WHERE clause comparison with database
-            stmt = delete(Assignment).where(and_(*delete_conditions))
-            db.execute(stmt)
-
-            # Rebuild lookups from DB after delete
-            existing_same_window = set(
-                (sid, _naive(s_at), _naive(e_at))
-                for sid, s_at, e_at in db.execute(
-                    select(Assignment.soldier_id, Assignment.start_at, Assignment.end_at)
-                    .where(Assignment.start_at < day_end_aware)
-                    .where(Assignment.end_at > day_start_aware)
-                ).all()
-            )
-
-            occupied_by_soldier: Dict[int, List[tuple[datetime, datetime]]] = {}
-            for sid, s_at, e_at in db.execute(
-                select(Assignment.soldier_id, Assignment.start_at, Assignment.end_at)
-                .where(Assignment.start_at < day_end_aware)
-                .where(Assignment.end_at > day_start_aware)
-            ).all():
-                s_na, e_na = _naive(s_at), _naive(e_at)
-                occupied_by_soldier.setdefault(sid, []).append((s_na, e_na))
+    excluded = set(req.exclude_slots or [])
+
+    if req.assignment_solver == "matching":
+        # ----------------------------
+        # Matching: per mission window, fill the seats of each phase in one min-cost solve
+        # ----------------------------
+        # Role seats of every mission first, then generic seats (same order as the greedy phases)
+        created_by_mission: Dict[int, int] = {}
+        errors: Dict[int, str] = {}
+        for phase in ("roles", "generic"):
+            for m in mission_list:
+                if m.id in errors:
+                    continue
+                try:
+                    slots: List[MissionSlot] = sorted(m.slots, key=lambda s: (s.start_time, s.end_time))
+                    layout = _seat_layout(m)
+
+                    created_here = 0
+                    for slot in slots:
+                        start_at, end_at = Assignment.window_for(slot.start_time, slot.end_time, the_day)
+
+                        # Same seats as the greedy phases; kept generic rows cover generic seats
+                        existing_generic = len(existing_generic_by_window.get((m.id, start_at, end_at), []))
+                        seats = [
+                            (role_id, pos)
+                            for role_id, pos in layout.open_seats(m.id, start_at, end_at, excluded, {None: existing_generic})
+                            if (role_id is None) == (phase == "generic")
+                        ]
+                        if not seats:
+                            continue
+
+                        seat_pool = eligibility.pool(None, m.id, start_at, end_at)
+                        pool = seat_pool.soldiers
+                        if prof is not None:
+                            _count_pool_rejections(prof, eligibility, None, m.id, start_at, end_at)
+                        # Seat-independent scores; co-assignment/friendship terms only see soldiers
+                        # already in the window (pairwise terms between new picks are not linear).
+                        scored = collect_candidates(
+                            pool=pool,
+                            m_id=m.id,
+                            start_at=start_at,
+                            end_at=end_at,
+                            stats_by_soldier=stats_by_soldier,
+                            restricted_pairs=restricted_pairs,
+                            existing_same_window=existing_same_window,
+                            occupied_by_soldier=occupied_by_soldier,
+                            vacation_blocks=vacation_blocks,
+                            rr_start_idx=rr_index.get(None, 0),
+                            strict=True,
+                            assigned_here=set(),
+                            pair_counts=pair_counts,
+                            weights=active_weights,
+                            friends_map=friends_map,
+                            not_friends_map=not_friends_map,
+                            rest_index=rest_index,
+                            eligible=seat_pool.eligible,
+                        ) if pool else []
+
+                        scores = np.fromiter((t[0] for t in scored), dtype=float, count=len(scored))
+                        scored_index = seat_pool.index[
+                            np.fromiter((t[1] for t in scored), dtype=np.intp, count=len(scored))
+                        ]
+                        masks: Dict[Optional[int], np.ndarray] = {None: np.ones(len(scored), dtype=bool)}
+                        for role_id, _pos in seats:
+                            if role_id not in masks:
+                                masks[role_id] = eligibility.role_mask(role_id)[scored_index]
+                        eligible = np.array([masks[role_id] for role_id, _pos in seats]).reshape(len(seats), len(scored))
+                        cost = np.where(eligible, scores, np.inf)
+                        chosen = solve_assignment(cost)
+
+                        for row, (role_id, pos) in enumerate(seats):
+                            k = int(chosen[row])
+                            if k < 0:
+                                unfilled.append(UnfilledSeat(
+                                    mission_id=m.id, role_id=role_id, start_at=start_at, end_at=end_at,
+                                    position=pos, reason="no_candidates" if pool else "no_pool",
+                                ))
+                                continue
+                            chosen_score, chosen_i, soldier = scored[k]
+                            rr_index[None] = (chosen_i + 1) % max(1, len(pool))
+
+                            created.append(AssignmentRow(
+                                id=None,
+                                mission_id=m.id,
+                                soldier_id=soldier.id,
+                                role_id=role_id,
+                                start_at=start_at,
+                                end_at=end_at,
+                                score=chosen_score,
+                                candidates=len(scored),
+                            ))
+                            created_here += 1
+
+                            existing_same_window.add((soldier.id, start_at, end_at))
+                            eligibility.mark_assigned(soldier.id, start_at, end_at)
+                            occupied_by_soldier.setdefault(soldier.id, IntervalIndex()).add(start_at, end_at)
+                            st = stats_by_soldier.setdefault(soldier.id, SoldierStats())
+                            _update_stats_after_assignment(
+                                st, m.id, start_at, end_at, day_start, day_end,
+                                rest_index=rest_index, soldier_id=soldier.id,
+                            )
+                            if scorer is not None:
+                                scorer.sync(soldier.id, st)
+
+                    created_by_mission[m.id] = created_by_mission.get(m.id, 0) + created_here
+                except Exception as ex:
+                    errors[m.id] = str(ex)
+
+        for m in mission_list:
+            if m.id in errors:
+                results.append(
+                    PlanResultItem(mission={"id": m.id, "name": m.name}, created_count=None, error=errors[m.id])
+                )
+            else:
+                results.append(
+                    PlanResultItem(mission={"id": m.id, "name": m.name}, created_count=created_by_mission.get(m.id, 0), error=None)
+                )
+        if prof is not None:
+            prof.add_phase("matching", t_phase)
+        return DayPlan(results, created, unfilled)
 
     # ----------------------------
     # Phase 1: assign REQUIRED roles across all missions and slots
@@ -825,7 +1336,6 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
     for m in mission_list:
         try:
             slots: List[MissionSlot] = sorted(m.slots, key=lambda s: (s.start_time, s.end_time))
-            reqs: List[MissionRequirement] = m.requirements or []
 
             # Skip only if there are no slots
             if not slots:
@@ -835,11 +1345,7 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                 continue
 
             # explicit role demands only (no generic here)
-            # Sort by role name to match API ordering (for consistent exclusion keys)
-            explicit_roles: List[int] = []
-            for r in sorted(reqs, key=lambda x: (x.role.name if x.role else "", x.role_id if hasattr(x, 'role_id') else 0)):
-                if r.count and r.count > 0:
-                    explicit_roles.extend([r.role_id] * r.count)
+            layout = _seat_layout(m)
 
             created_here = 0
 
@@ -849,43 +1355,31 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                 # track who we've already placed in THIS slot/window
                 assigned_here: set[int] = set()
 
-                # Track the ABSOLUTE position within THIS slot's assignments (across all roles)
-                absolute_slot_position = 0
-                
-                for role_id in explicit_roles:
-                    # Check if this specific instance should be excluded
-                    # Format: mission_id_roleId_start_at_end_at_index (UI sends absolute position)
-                    # UI appends :00 to isoformat() result: 2025-10-28T22:00:00 → 2025-10-28T22:00:00:00
-                    start_str = f"{start_at.isoformat()}:00"
-                    end_str = f"{end_at.isoformat()}:00"
-                    slot_key_base = f"{m.id}_{role_id}_{start_str}_{end_str}"
-                    slot_key_to_check = f"{slot_key_base}_{absolute_slot_position}"
-                    
-                    if req.exclude_slots and slot_key_to_check in req.exclude_slots:
-                        # This specific instance is excluded - skip it
-                        absolute_slot_position += 1  # Increment even when skipped to keep position tracking
-                        continue
-                    
-                    # decide the pool
-                    pool = [
-                        s for s in ctx["soldiers_by_role"].get(role_id, [])
-                        if (s.id, m.id) not in restricted_pairs
-                    ]
+                for role_id, absolute_slot_position in layout.open_seats(m.id, start_at, end_at, excluded):
+                    if role_id is None:
+                        break
 
-                    # Remove anyone who is already assigned to this exact window
-                    pool = [s for s in pool if (s.id, start_at, end_at) not in existing_same_window]
+                    # decide the pool: role holders not restricted from the mission and
+                    # not already assigned to this exact window
+                    seat_pool = eligibility.pool(role_id, m.id, start_at, end_at)
+                    pool = seat_pool.soldiers
+                    if prof is not None:
+                        _count_pool_rejections(prof, eligibility, role_id, m.id, start_at, end_at)
 
                     # Filter out overlap with vacations or existing assignments
                     # Overlaps handled by occupied_by_soldier; vacations blocked by _collect logic
                     if not pool:
-                        absolute_slot_position += 1  # Increment even when no pool
+                        unfilled.append(UnfilledSeat(
+                            mission_id=m.id, role_id=role_id, start_at=start_at, end_at=end_at,
+                            position=absolute_slot_position, reason="no_pool",
+                        ))
                         continue
 
                     # round-robin starting point for this role
                     start_idx = rr_index.get(role_id, 0)
 
                     # Strict pass ONLY (no red warnings allowed)
-                    scored = _collect_candidates_for_slot(
+                    scored = collect_candidates(
                         pool=pool,
                         m_id=m.id,
                         start_at=start_at,
@@ -902,13 +1396,18 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                         weights=active_weights,                 # NEW: pass weights
                         friends_map=friends_map,                # NEW: friendship data
                         not_friends_map=not_friends_map,         # NEW: not-friendship data
+                        rest_index=rest_index,
                         shuffle_mode=req.shuffle,                # NEW
                         rng=rng if req.shuffle else None,        # NEW
+                        eligible=seat_pool.eligible,
                     )
 
                     # If we have nobody, leave the seat empty
                     if not scored:
-                        absolute_slot_position += 1  # Increment even when no candidates found
+                        unfilled.append(UnfilledSeat(
+                            mission_id=m.id, role_id=role_id, start_at=start_at, end_at=end_at,
+                            position=absolute_slot_position, reason="no_candidates",
+                        ))
                         continue
 
                     # In shuffle mode, pick randomly from top candidates for variety
@@ -928,25 +1427,30 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                     # remember this soldier is used for this slot, so we won't pick them again
                     assigned_here.add(soldier.id)
 
-                    a = Assignment(
+                    created.append(AssignmentRow(
+                        id=None,
                         mission_id=m.id,
                         soldier_id=soldier.id,
                         role_id=role_id,
                         start_at=start_at,
                         end_at=end_at,
-                    )
-                    db.add(a)
+                        score=chosen_score,
+                        candidates=len(scored),
+                    ))
                     created_here += 1
-                    
-                    # Increment the slot position counter
-                    absolute_slot_position += 1
 
                     existing_same_window.add((soldier.id, start_at, end_at))
-                    occupied_by_soldier.setdefault(soldier.id, []).append((start_at, end_at))
+                    eligibility.mark_assigned(soldier.id, start_at, end_at)
+                    occupied_by_soldier.setdefault(soldier.id, IntervalIndex()).add(start_at, end_at)
 
                     # update in-memory stats so later picks remain fair
                     st = stats_by_soldier.setdefault(soldier.id, SoldierStats())
-                    _update_stats_after_assignment(st, m.id, start_at, end_at, day_start, day_end)
+                    _update_stats_after_assignment(
+                        st, m.id, start_at, end_at, day_start, day_end,
+                        rest_index=rest_index, soldier_id=soldier.id,
+                    )
+                    if scorer is not None:
+                        scorer.sync(soldier.id, st)
 
             results.append(
                 PlanResultItem(mission={"id": m.id, "name": m.name}, created_count=created_here, error=None)
@@ -958,25 +1462,22 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                 )
             )
 
+    if prof is not None:
+        prof.add_phase("phase1", t_phase)
+        t_phase = prof.clock()
+
     # ----------------------------
     # Phase 2: assign GENERIC seats across all missions and slots
     # ----------------------------
     for m in mission_list:
         try:
             slots: List[MissionSlot] = sorted(m.slots, key=lambda s: (s.start_time, s.end_time))
-            reqs: List[MissionRequirement] = m.requirements or []
 
             if not slots:
                 # already appended result in phase 1
                 continue
 
-            # calculate how many generics are required
-            sum_explicit = sum((r.count or 0) for r in reqs)
-            generic_count = 0
-            if getattr(m, "total_needed", None):
-                remaining = max(0, int(m.total_needed or 0) - sum_explicit)
-                if remaining > 0:
-                    generic_count = remaining
+            layout = _seat_layout(m)
 
             created_here = 0
 
@@ -985,128 +1486,38 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
 
                 assigned_here: set[int] = set()
 
-                # generic seats for this mission window
-                # Track the position for generic slots (starts after explicit roles)
-                # Calculate explicit roles count for this mission (sorted by role name for consistency with UI)
-                explicit_roles_list: List[int] = []
-                for r in sorted(reqs, key=lambda x: (x.role.name if x.role else "", x.role_id if hasattr(x, 'role_id') else 0)):
-                    if r.count and r.count > 0:
-                        explicit_roles_list.extend([r.role_id] * r.count)
-                
-                # Get existing generic assignments for this time slot
-                existing_generic = db.execute(
-                    select(Assignment)
-                    .where(Assignment.mission_id == m.id)
-                    .where(Assignment.role_id == None)
-                    .where(Assignment.start_at == start_at)
-                    .where(Assignment.end_at == end_at)
-                    .where(Assignment.start_at >= day_start_aware)
-                    .where(Assignment.start_at < day_end_aware)
-                ).scalars().all()
-                
-                # Get the IDs of locked generic assignments
-                locked_generic_ids = set()
-                if req.locked_assignments:
-                    locked_generic_ids = set(req.locked_assignments)
-                
-                # Count how many existing generic slots are locked (won't be deleted)
-                locked_generic_count = sum(1 for a in existing_generic if a.id in locked_generic_ids)
-                
-                # IMPORTANT: The UI generates exclusion keys with positions that include locked slots
-                # So we need to check each position in sequence and skip locked ones
-                # Start checking from the first generic position
-                current_generic_position = len(explicit_roles_list)
-                
-                # Track how many slots we've created in this iteration
+                # Open generic seats (after the explicit roles; excluded positions stay empty).
+                # Existing generic rows of the window (locked, or kept by append mode) cover
+                # that many of them, so fill until the rest is created; a seat that finds
+                # nobody moves on to the next position.
+                generic_seats = [pos for role_id, pos in layout.open_seats(m.id, start_at, end_at, excluded) if role_id is None]
+                min_to_create = len(generic_seats) - len(existing_generic_by_window.get((m.id, start_at, end_at), []))
                 slots_created_this_iteration = 0
-                
-                # Count how many exclusion keys exist for this time slot and mission
-                exclusion_keys_for_this_slot = []
-                if req.exclude_slots:
-                    slot_key_prefix = f"{m.id}_GENERIC_{start_at.isoformat()}:00_{end_at.isoformat()}:00"
-                    exclusion_keys_for_this_slot = [k for k in req.exclude_slots if k.startswith(slot_key_prefix)]
-                
-                # Count how many positions in the first generic_count positions are excluded
-                excluded_in_valid_range = 0
-                for pos in range(generic_count):
-                    position_to_check = len(explicit_roles_list) + pos
-                    start_str = f"{start_at.isoformat()}:00"
-                    end_str = f"{end_at.isoformat()}:00"
-                    key_for_pos = f"{m.id}_GENERIC_{start_str}_{end_str}_{position_to_check}"
-                    if req.exclude_slots and key_for_pos in req.exclude_slots:
-                        excluded_in_valid_range += 1
-                
-                print(f"[DEBUG Phase2] Mission {m.id}: generic_count={generic_count}, existing_locked={len(existing_generic)}, excluded_in_range={excluded_in_valid_range}")
-                
-                # We need: (generic_count) total slots
-                # We have: (existing_locked) locked slots + (slots_created) newly created
-                # We exclude: (excluded_in_valid_range) positions that should remain empty
-                # So: existing_locked + slots_created + excluded_in_valid_range should be <= generic_count
-                # This means we should only create until: existing_locked + created + excluded >= generic_count
-                # Or: slots_created >= generic_count - existing_locked - excluded_in_valid_range
-                
-                # Check positions sequentially until we've filled the requirement
-                # Formula: generic_count = existing_locked + newly_created + (excluded positions that will remain empty)
-                # So: we need to create: generic_count - existing_locked new assignments
-                # BUT if positions in the first generic_count are excluded, we don't need to fill them
-                # So the minimum to create is: generic_count - existing_locked - excluded_in_valid_range
-                min_to_create = generic_count - len(existing_generic) - excluded_in_valid_range
-                print(f"[DEBUG Phase2] Need to create at least {min_to_create} new assignments (total={generic_count}, locked={len(existing_generic)}, excluded={excluded_in_valid_range})")
-                
-                for i in range(generic_count * 2):  # Check more positions in case some are skipped
+
+                for current_generic_position in generic_seats:
                     # Stop when we've created enough
                     if slots_created_this_iteration >= min_to_create:
-                        print(f"[DEBUG Phase2] Done: created={slots_created_this_iteration} >= min={min_to_create}")
                         break
-                    
-                    # Don't go beyond the logical first generic_count positions within THIS time slot
-                    # Each time slot should only have generic_count generic slots
-                    # Calculate position within the generic range (0-based)
-                    position_in_generic_range = current_generic_position - len(explicit_roles_list)
-                    if position_in_generic_range >= generic_count:
-                        print(f"[DEBUG Phase2] Position {current_generic_position} (slot #{position_in_generic_range}) is beyond generic_count ({generic_count}), stopping")
-                        break
-                    
-                    slots_needed = generic_count - len(existing_generic) - slots_created_this_iteration
-                    print(f"[DEBUG Phase2] Checking position {current_generic_position} (slot {position_in_generic_range}): slots_needed={slots_needed}, existing={len(existing_generic)}, created={slots_created_this_iteration}, excluded={excluded_in_valid_range}")
-                    
-                    # Check if this specific generic slot instance should be excluded
-                    # Format: mission_id_GENERIC_start_at_end_at_index 
-                    # The index is the absolute position across all slots (explicit + generic)
-                    # Match Phase 1 format for consistency
-                    start_str = f"{start_at.isoformat()}:00"
-                    end_str = f"{end_at.isoformat()}:00"
-                    slot_key_base = f"{m.id}_GENERIC_{start_str}_{end_str}"
-                    slot_key_to_check = f"{slot_key_base}_{current_generic_position}"
-                    
-                    # Check if this position is excluded
-                    is_excluded = req.exclude_slots and slot_key_to_check in req.exclude_slots
-                    
-                    if is_excluded:
-                        # This position is excluded - skip it
-                        print(f"[DEBUG Phase2] SKIPPING position {current_generic_position}: EXCLUDED (key: {slot_key_to_check})")
-                        current_generic_position += 1
-                        continue
-                    
+
                     # anyone valid for the mission (any role), excluding restricted pairs
-                    pool = [
-                        s for s in ctx["all_soldiers"]
-                        if (s.id, m.id) not in restricted_pairs
-                    ]
+                    # and anyone already assigned to this exact window
+                    seat_pool = eligibility.pool(None, m.id, start_at, end_at)
+                    pool = seat_pool.soldiers
+                    if prof is not None:
+                        _count_pool_rejections(prof, eligibility, None, m.id, start_at, end_at)
 
-                    # Remove anyone who is already assigned to this exact window
-                    pool = [s for s in pool if (s.id, start_at, end_at) not in existing_same_window]
-                    
                     if not pool:
-                        print(f"[DEBUG Phase2] No pool at position {current_generic_position} (already has assignments)")
-                        current_generic_position += 1  # Increment even when no pool
+                        unfilled.append(UnfilledSeat(
+                            mission_id=m.id, role_id=None, start_at=start_at, end_at=end_at,
+                            position=current_generic_position, reason="no_pool",
+                        ))
                         continue
 
                     # round-robin starting point for "generic" (key None)
                     start_idx = rr_index.get(None, 0)
 
                     # Strict pass ONLY (no red warnings allowed)
-                    scored = _collect_candidates_for_slot(
+                    scored = collect_candidates(
                         pool=pool,
                         m_id=m.id,
                         start_at=start_at,
@@ -1123,12 +1534,17 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                         weights=active_weights,                 # NEW: pass weights
                         friends_map=friends_map,                # NEW: friendship data
                         not_friends_map=not_friends_map,         # NEW: not-friendship data
+                        rest_index=rest_index,
                         shuffle_mode=req.shuffle,                # NEW
                         rng=rng if req.shuffle else None,        # NEW
+                        eligible=seat_pool.eligible,
                     )
 
                     if not scored:
-                        current_generic_position += 1  # Increment even when no candidates
+                        unfilled.append(UnfilledSeat(
+                            mission_id=m.id, role_id=None, start_at=start_at, end_at=end_at,
+                            position=current_generic_position, reason="no_candidates",
+                        ))
                         continue
 
                     # In shuffle mode, pick randomly from top candidates for variety
@@ -1147,25 +1563,30 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
 
                     assigned_here.add(soldier.id)
 
-                    a = Assignment(
+                    created.append(AssignmentRow(
+                        id=None,
                         mission_id=m.id,
                         soldier_id=soldier.id,
                         role_id=None,
                         start_at=start_at,
                         end_at=end_at,
-                    )
-                    db.add(a)
+                        score=chosen_score,
+                        candidates=len(scored),
+                    ))
                     created_here += 1
                     slots_created_this_iteration += 1
                     
                     existing_same_window.add((soldier.id, start_at, end_at))
-                    occupied_by_soldier.setdefault(soldier.id, []).append((start_at, end_at))
-                    
-                    # Increment the generic position counter
-                    current_generic_position += 1
+                    eligibility.mark_assigned(soldier.id, start_at, end_at)
+                    occupied_by_soldier.setdefault(soldier.id, IntervalIndex()).add(start_at, end_at)
 
                     st = stats_by_soldier.setdefault(soldier.id, SoldierStats())
-                    _update_stats_after_assignment(st, m.id, start_at, end_at, day_start, day_end)
+                    _update_stats_after_assignment(
+                        st, m.id, start_at, end_at, day_start, day_end,
+                        rest_index=rest_index, soldier_id=soldier.id,
+                    )
+                    if scorer is not None:
+                        scorer.sync(soldier.id, st)
 
             # Phase 2 doesn’t append a second result row; counts for mission were already added in phase 1.
             # If you prefer, you can merge counts or report separately.
@@ -1178,13 +1599,990 @@ def fill(req: FillRequest, db: Session = Depends(get_db)):
                 )
             )
 
-    db.commit()
+    if prof is not None:
+        prof.add_phase("phase2", t_phase)
+    return DayPlan(results, created, unfilled)
+
+def _add_rows(db: Session, rows: List[AssignmentRow], with_ids: bool = False) -> List[AssignmentRow]:
+    """
+    Insert planned rows; with_ids, returns them carrying the ids the DB assigned.
+    Every slot window of the rows' days is created on the way, so later writes
+    to those days find their windows in place.
+    """
+    missions = planner_snapshot(db).missions
+    keys = {(r.mission_id, r.start_at, r.end_at) for r in rows}
+    for day in {r.start_at.date() for r in rows}:
+        keys.update(day_windows(missions, day))
+    windows = window_ids(db, keys, missions)
+    writer = BulkInserter(db, Assignment, returning="id" if with_ids else None)
+    writer.extend(
+        {
+            "mission_id": r.mission_id,
+            "soldier_id": r.soldier_id,
+            "role_id": r.role_id,
+            "start_at": r.start_at,
+            "end_at": r.end_at,
+            "window_id": windows[(r.mission_id, r.start_at, r.end_at)],
+        }
+        for r in rows
+    )
+    writer.flush()
+    if not with_ids:
+        return rows
+    return [r._replace(id=a_id) for r, a_id in zip(rows, writer.returned)]
+
+def _find_warnings(
+    ctx: dict,
+    rows: List[AssignmentRow],
+    range_start: datetime,
+    range_end: datetime,
+) -> List[RawWarning]:
+    """
+    Warnings for assignments starting in [range_start, range_end) given the
+    in-memory state `rows` (everything starting from range_start - LOOKBACK),
+    by the same engine that keeps plan_warnings current.
+    """
+    return find_warnings(rows, range_start, range_end, ctx["restricted_pairs"], ctx["not_friends_map"])
+
+def _render_warnings(ctx: dict, warnings: List[RawWarning]) -> List[WarningItem]:
+    return render_warnings(
+        warnings,
+        {s.id: s.name for s in ctx["all_soldiers"]},
+        {m.id: m.name for m in ctx["missions"]},
+    )
+
+def _day_response(day: str, plan: DayPlan, preview: bool) -> FillResponse:
+    if not preview:
+        return FillResponse(day=day, results=plan.results)
+    return FillResponse(
+        day=day,
+        results=plan.results,
+        preview=True,
+        assignments=[
+            PlannedAssignment(
+                mission_id=r.mission_id,
+                soldier_id=r.soldier_id,
+                role_id=r.role_id,
+                start_at=r.start_at,
+                end_at=r.end_at,
+                score=r.score,
+                candidates=r.candidates,
+            )
+            for r in plan.created
+        ],
+        unfilled=plan.unfilled,
+    )
+
+MAX_CANDIDATES = 32
+MAX_IMPROVE_MS = 10_000
+MAX_TIME_BUDGET_MS = 60_000
+CANDIDATE_POLL_S = 0.05  # anytime fill: how often waiting for candidates checks the budget
+
+# Weights of the plan objective used to rank candidate plans (lower is better)
+OBJECTIVE_WEIGHTS = {
+    "unfilled": 100.0,
+    "overlap_warning": 10.0,
+    "rest_warning": 3.0,
+    "not_friend_warning": 3.0,  # same as the greedy scorer's not_friend_penalty
+    "hours_spread_per_hour": 0.5,
+}
+
+def _plan_objective(
+    rows: List[AssignmentRow],
+    soldier_ids: List[int],
+    day_start: datetime,
+    day_end: datetime,
+    unfilled: int,
+    not_friends_map: Dict[int, set[int]],
+    base_hours: Optional[Dict[int, float]] = None,
+) -> PlanObjective:
+    """
+    Score a day plan. `rows` is the full in-memory state (history + new rows),
+    or only the rows near the day when `base_hours` (`_history_hours`) stands in
+    for the hours of everything that started before it.
+    REST/OVERLAP follow the warnings engine: previous end is the one before by
+    start time per soldier, counted for assignments that start on the day;
+    NOT_FRIENDS per window starting on the day, as in the warnings engine.
+    """
+    window_start = day_start - timedelta(days=FAIRNESS_WINDOW_DAYS)
+    by_soldier: Dict[int, List[tuple[datetime, datetime]]] = {}
+    hours: Dict[int, float] = {sid: 0.0 for sid in soldier_ids}
+    if base_hours is not None:
+        hours.update(base_hours)
+    by_window: Dict[tuple[int, datetime, datetime], List[int]] = {}
+    for r in rows:
+        if r.soldier_id is None or r.start_at >= day_end:
+            continue
+        by_soldier.setdefault(r.soldier_id, []).append((r.start_at, r.end_at))
+        if r.start_at >= day_start:
+            by_window.setdefault((r.mission_id, r.start_at, r.end_at), []).append(r.soldier_id)
+        if r.end_at > window_start and (base_hours is None or r.start_at >= day_start):
+            hours[r.soldier_id] = hours.get(r.soldier_id, 0.0) + (r.end_at - r.start_at).total_seconds() / 3600.0
+
+    overlap = rest = 0
+    for lst in by_soldier.values():
+        o, r = soldier_warnings(sorted(lst), day_start, day_end)
+        overlap += o
+        rest += r
+    not_friends = sum(window_not_friends(sids, not_friends_map) for sids in by_window.values())
+
+    spread = (max(hours.values()) - min(hours.values())) if hours else 0.0
+    return PlanObjective(
+        unfilled=unfilled,
+        overlap_warnings=overlap,
+        rest_warnings=rest,
+        not_friend_warnings=not_friends,
+        hours_spread=round(spread, 2),
+        value=objective_value(unfilled, overlap, rest, not_friends, spread, OBJECTIVE_WEIGHTS),
+    )
+
+def _improve_day(
+    the_day: date,
+    ctx: dict,
+    known_rows: List[AssignmentRow],
+    vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
+    plan: DayPlan,
+    budget_ms: int,
+    base_hours: Optional[Dict[int, float]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> tuple[DayPlan, ImprovementReport]:
+    """
+    Local-search post-pass over the seats of `plan` (filled and unfilled) within
+    `budget_ms`, or until `should_stop()`. `known_rows` are the rows that existed
+    before planning; they stay put. `base_hours` as in `_plan_objective`.
+    """
+    day_start, day_end = _day_bounds(the_day)
+    started = time.perf_counter()
+
+    seats = [Seat(r.mission_id, r.role_id, r.start_at, r.end_at, None, r.soldier_id) for r in plan.created]
+    seats += [Seat(u.mission_id, u.role_id, _naive(u.start_at), _naive(u.end_at), u.position, None) for u in plan.unfilled]
+    scores = {id(seat): (r.score, r.candidates) for seat, r in zip(seats, plan.created)}
+    reasons = {id(seat): u.reason for seat, u in zip(seats[len(plan.created):], plan.unfilled)}
+
+    search = LocalSearch(
+        seats,
+        ((r.soldier_id, r.mission_id, r.start_at, r.end_at) for r in known_rows),
+        [s.id for s in ctx["all_soldiers"]],
+        {role_id: {s.id for s in lst} for role_id, lst in ctx["soldiers_by_role"].items()},
+        ctx["restricted_pairs"],
+        vacation_blocks,
+        day_start,
+        day_end,
+        day_start - timedelta(days=FAIRNESS_WINDOW_DAYS),
+        OBJECTIVE_WEIGHTS,
+        base_hours=base_hours,
+        not_friends_map=ctx["not_friends_map"],
+    )
+    before = PlanObjective(**search.breakdown())
+    outcome = search.run(budget_ms, should_stop)
+    after = PlanObjective(**search.breakdown())
+
+    created: List[AssignmentRow] = []
+    unfilled: List[UnfilledSeat] = []
+    for seat in seats:
+        if seat.soldier_id is None:
+            unfilled.append(UnfilledSeat(
+                mission_id=seat.mission_id, role_id=seat.role_id, start_at=seat.start_at, end_at=seat.end_at,
+                position=seat.position if seat.position is not None else -1,
+                reason=reasons.get(id(seat), "no_candidates"),
+            ))
+            continue
+        score, candidates = scores.get(id(seat), (None, None))
+        if seat.soldier_id != seat.initial_soldier_id:
+            score = None  # planner score no longer describes this soldier
+        created.append(AssignmentRow(
+            None, seat.mission_id, seat.soldier_id, seat.role_id, seat.start_at, seat.end_at, score, candidates,
+        ))
+
+    counts: Dict[int, int] = {}
+    for r in created:
+        counts[r.mission_id] = counts.get(r.mission_id, 0) + 1
+    results = [
+        item if item.error else item.model_copy(update={"created_count": counts.get(item.mission["id"], 0)})
+        for item in plan.results
+    ]
+
+    report = ImprovementReport(
+        objective_before=before,
+        objective_after=after,
+        iterations=outcome["iterations"],
+        moves=outcome["moves"],
+        stopped=outcome["stopped"],
+        elapsed_ms=round((time.perf_counter() - started) * 1000.0, 1),
+    )
+    return DayPlan(results, created, unfilled), report
+
+def _plan_candidate(
+    req,
+    seed: int,
+    the_day: date,
+    ctx: dict,
+    mission_list: List[MissionRow],
+    known_rows: List[AssignmentRow],
+    vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
+    active_weights: Dict[str, float],
+    history: Optional[DayHistory] = None,
+    profile: bool = False,
+) -> tuple[int, DayPlan, PlanObjective, Optional[PlanProfiler]]:
+    """
+    One seeded shuffle of the day; runs in a worker process. Produces exactly what
+    /plan/fill returns for shuffle=true, random_seed=seed on the same snapshot
+    (plus this run's profile when `profile`).
+    """
+    prof = PlanProfiler() if profile else None
+    rng = random.Random(seed)
+    ctx = dict(
+        ctx,
+        soldiers_by_role={k: list(v) for k, v in ctx["soldiers_by_role"].items()},
+        all_soldiers=list(ctx["all_soldiers"]),
+    )
+    _shuffle_pools(ctx, rng)
+    plan = _plan_day(req, the_day, ctx, mission_list, known_rows, vacation_blocks, active_weights, rng, history, prof)
+    day_start, day_end = _day_bounds(the_day)
+    if prof is not None:
+        t = prof.clock()
+    objective = _plan_objective(
+        known_rows + plan.created, [s.id for s in ctx["all_soldiers"]], day_start, day_end, len(plan.unfilled),
+        ctx["not_friends_map"],
+        _history_hours(history, known_rows, day_start) if history is not None else None,
+    )
+    if prof is not None:
+        prof.add_phase("objective", t)
+    return seed, plan, objective, prof
+
+# The candidate pool. Its workers get the planner snapshot once, from the pool
+# initializer, so the pool is replaced when the planner version moves. Tasks
+# carry only the per-fill inputs, pickled once per fill and unpickled once per
+# worker (see _plan_candidate_in_worker).
+_candidate_lock = threading.Lock()
+_candidate_executor: Optional[ProcessPoolExecutor] = None
+_candidate_version: Optional[int] = None
+_candidate_calls = count()
+
+# Worker-process side of the pool
+_worker_snapshot: Optional[PlannerSnapshot] = None
+_worker_call: Optional[tuple] = None  # (call id, unpickled per-fill inputs)
+
+def _init_candidate_worker(snapshot: PlannerSnapshot) -> None:
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+def _plan_candidate_in_worker(call_id: int, payload: bytes, seed: int):
+    """_plan_candidate on the worker's snapshot; `payload` is unpickled on the first seed of each fill only."""
+    global _worker_call
+    if _worker_call is None or _worker_call[0] != call_id:
+        _worker_call = (call_id, pickle.loads(payload))
+    req, the_day, mission_ids, known_rows, vacation_blocks, active_weights, history, profile = _worker_call[1]
+    ctx = _snapshot_context(_worker_snapshot)
+    by_id = {m.id: m for m in ctx["missions"]}
+    return _plan_candidate(
+        req, seed, the_day, ctx, [by_id[m_id] for m_id in mission_ids],
+        known_rows, vacation_blocks, active_weights, history, profile,
+    )
+
+def _get_candidate_executor(snapshot: PlannerSnapshot) -> ProcessPoolExecutor:
+    """The pool for this snapshot's version; call with _candidate_lock held."""
+    global _candidate_executor, _candidate_version
+    if _candidate_executor is None or _candidate_version != snapshot.version:
+        if _candidate_executor is not None:
+            # Work already queued on the old pool still runs to completion
+            _candidate_executor.shutdown(wait=False)
+        _candidate_executor = ProcessPoolExecutor(
+            max_workers=min(MAX_CANDIDATES, os.cpu_count() or 1),
+            initializer=_init_candidate_worker,
+            initargs=(snapshot,),
+        )
+        _candidate_version = snapshot.version
+    return _candidate_executor
+
+def shutdown_candidate_executor() -> None:
+    """Stop the candidate worker processes (app shutdown)."""
+    global _candidate_executor, _candidate_version
+    with _candidate_lock:
+        if _candidate_executor is not None:
+            _candidate_executor.shutdown(wait=True, cancel_futures=True)
+        _candidate_executor, _candidate_version = None, None
+
+def _collect_candidates(futures, budget: PlanBudget) -> list:
+    """
+    Results of the candidate futures that finish before `budget` stops, in submit
+    order; waits for at least one. Queued ones are cancelled, running ones finish
+    in the pool and are dropped.
+    """
+    pending = set(futures)
+    while pending and not budget.should_stop():
+        remaining = budget.remaining_ms()
+        timeout = CANDIDATE_POLL_S if remaining is None else min(CANDIDATE_POLL_S, remaining / 1000.0)
+        _done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+    if len(pending) == len(futures):
+        _done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    for f in pending:
+        f.cancel()
+    return [f.result() for f in futures if f not in pending]
+
+def _run_candidates(
+    req, the_day, snapshot, ctx, mission_list, known_rows, vacation_blocks, active_weights, seeds, history=None,
+    prof=None, budget: Optional[PlanBudget] = None,
+):
+    """
+    Plan every seed (in the process pool when there is more than one CPU), best
+    objective first. `ctx` is the unshuffled context over `snapshot`. With
+    `prof`, the workers' profiles are summed into it. With `budget`, only the
+    plans finished before it stops are ranked (at least one).
+    """
+    cand_req = req.model_copy(update={"shuffle": True})
+    if (os.cpu_count() or 1) > 1:
+        payload = pickle.dumps((
+            cand_req, the_day, [m.id for m in mission_list], known_rows, vacation_blocks, active_weights,
+            history, prof is not None,
+        ))
+        call_id = next(_candidate_calls)
+        with _candidate_lock:
+            executor = _get_candidate_executor(snapshot)
+            futures = [executor.submit(_plan_candidate_in_worker, call_id, payload, seed) for seed in seeds]
+        outcomes = [f.result() for f in futures] if budget is None else _collect_candidates(futures, budget)
+    else:
+        args = (the_day, ctx, mission_list, known_rows, vacation_blocks, active_weights, history, prof is not None)
+        outcomes = []
+        for seed in seeds:
+            outcomes.append(_plan_candidate(cand_req, seed, *args))
+            if budget is not None and budget.should_stop():
+                break
+    if prof is not None:
+        for *_plan, cand_prof in outcomes:
+            prof.merge(cand_prof)
+    # Stable: ties keep seed order
+    return sorted((o[:3] for o in outcomes), key=lambda o: o[2].value)
+
+def _check_scoring_engine(engine: str) -> None:
+    if engine not in SCORING_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown scoring_engine; expected one of {SCORING_ENGINES}")
+
+def _check_assignment_solver(solver: str) -> None:
+    if solver not in ASSIGNMENT_SOLVERS:
+        raise HTTPException(status_code=400, detail=f"Unknown assignment_solver; expected one of {ASSIGNMENT_SOLVERS}")
+
+def _check_improve_ms(improve_ms: Optional[int]) -> None:
+    if improve_ms is not None and not 0 < improve_ms <= MAX_IMPROVE_MS:
+        raise HTTPException(status_code=400, detail=f"improve_ms must be between 1 and {MAX_IMPROVE_MS}")
+
+def _disconnect_probe(request: Request) -> Callable[[], bool]:
+    """request.is_disconnected() for a sync route, which runs in a worker thread off the event loop."""
+    def disconnected() -> bool:
+        try:
+            return anyio.from_thread.run(request.is_disconnected)
+        except RuntimeError:
+            return False  # not inside a request's worker thread (called directly)
+    return disconnected
+
+@router.post("/fill", response_model=FillResponse)
+def fill(req: FillRequest, request: Request, db: Session = Depends(get_db)):
+    """
+    Plan a day. With time_budget_ms the fill is anytime: a complete greedy plan
+    comes first, the rest of the budget goes to improvement, and the best plan
+    so far is returned (and written) once the budget runs out or the client
+    disconnects; `budget.stopped` says which. Without a budget the fill runs to
+    the end and the connection is not polled.
+    """
+    return run_fill(req, db, interrupt=_disconnect_probe(request) if req.time_budget_ms else None)
+
+def run_fill(
+    req: FillRequest,
+    db: Session,
+    interrupt: Optional[Callable[[], bool]] = None,
+) -> FillResponse:
+    """
+    Body of /plan/fill. `interrupt()` is polled between candidates and during
+    improvement; once true the fill stops there and keeps the best plan so far.
+    It may raise instead to abort without writing (background job cancel).
+    """
+    the_day = _parse_day(req.day)
+    day_start, day_end = _day_bounds(the_day)
+    _check_scoring_engine(req.scoring_engine)
+    _check_assignment_solver(req.assignment_solver)
+    _check_improve_ms(req.improve_ms)
+    if req.time_budget_ms is not None and not 0 < req.time_budget_ms <= MAX_TIME_BUDGET_MS:
+        raise HTTPException(status_code=400, detail=f"time_budget_ms must be between 1 and {MAX_TIME_BUDGET_MS}")
+    if not 1 <= req.candidates <= MAX_CANDIDATES:
+        raise HTTPException(status_code=400, detail=f"candidates must be between 1 and {MAX_CANDIDATES}")
+    if not 1 <= req.top_k <= req.candidates:
+        raise HTTPException(status_code=400, detail="top_k must be between 1 and candidates")
+
+    # Profiled when asked for, or for a sample of the fills while a metrics hook
+    # listens; otherwise no timing at all
+    prof = PlanProfiler() if req.profile or metrics_sample_due() else None
+    budget = PlanBudget(req.time_budget_ms, interrupt)
+    # Nothing to poll between candidates or in improvement without a budget or a probe
+    polled = bool(req.time_budget_ms or interrupt)
+    stopped: Optional[str] = None  # why planning stopped short of the full work, if it did
+
+    if not req.preview:
+        _fix_assignments_sequence(db)
+
+    if req.exclude_slots:
+        logger.debug("fill: %d excluded slots: %s", len(req.exclude_slots), req.exclude_slots)
+    if req.locked_assignments:
+        logger.debug("fill: locked assignment ids: %s", req.locked_assignments)
+
+    rng = _make_rng(req.random_seed)
+    multi = req.candidates > 1
+    if prof is not None:
+        t = prof.clock()
+    # With candidates the pools are shuffled per seed in _plan_candidate instead
+    ctx, mission_list = _prepare_context(db, req.model_copy(update={"shuffle": False}) if multi else req, rng)
+    if prof is not None:
+        prof.add_phase("context", t)
+
+    if req.replace and not req.preview:
+        if prof is not None:
+            t = prof.clock()
+        _clear_for_replace(db, mission_list, day_start, day_end, req.locked_assignments)
+        if prof is not None:
+            prof.add_phase("clear", t)
+
+    if prof is not None:
+        t = prof.clock()
+    vacation_blocks = _vacation_blocks_for_day(db, the_day)
+    # Fairness history comes from the rollups (days before the_day are untouched by
+    # the replace clear); only the rows near the day are loaded
+    history = _load_history(db, the_day)
+    # Rows within LOOKBACK of the day feed the warnings of the day and of the
+    # days after it (their rests run back into it); the planner itself only
+    # needs those near the day
+    context_rows = _fetch_assignment_rows(db, day_start - LOOKBACK, day_end + LOOKBACK)
+    if req.replace and req.preview:
+        context_rows = _rows_after_clear(context_rows, mission_list, day_start, day_end, req.locked_assignments)
+    known_rows = [r for r in context_rows if r.end_at > day_start - NEAR_HISTORY and r.start_at < day_end]
+    if prof is not None:
+        prof.add_phase("load", t)
+
+    active_weights = _active_weights(req.weights)
+    if multi:
+        seeds = [rng.randrange(0, 2**31) for _ in range(req.candidates)]
+        if prof is not None:
+            t = prof.clock()
+        ranked = _run_candidates(
+            req, the_day, planner_snapshot(db), ctx, mission_list, known_rows, vacation_blocks, active_weights, seeds, history, prof,
+            budget if polled else None,
+        )
+        if prof is not None:
+            prof.add_phase("candidates", t)
+        best_seed, plan, best_objective = ranked[0]
+        if len(ranked) < len(seeds):
+            stopped = budget.stop_reason()
+    else:
+        plan = _plan_day(
+            req, the_day, ctx, mission_list, known_rows, vacation_blocks, active_weights, rng, history, prof,
+        )
+    first_plan_ms = budget.elapsed_ms()
+
+    # With a time budget, improvement gets whatever is left of it (capped by improve_ms)
+    improve_ms = req.improve_ms
+    budget_bound = False
+    if req.time_budget_ms:
+        remaining = int(budget.remaining_ms())
+        if improve_ms is None or remaining < improve_ms:
+            improve_ms, budget_bound = remaining, True
+
+    improvement: Optional[ImprovementReport] = None
+    if improve_ms and stopped is None:
+        stopped = budget.stop_reason()
+    if improve_ms and stopped is None:
+        if prof is not None:
+            t = prof.clock()
+        plan, improvement = _improve_day(
+            the_day, ctx, known_rows, vacation_blocks, plan, improve_ms,
+            _history_hours(history, known_rows, day_start), budget.interrupted if interrupt else None,
+        )
+        if prof is not None:
+            prof.add_phase("improve", t)
+        if improvement.stopped == "interrupted" or (improvement.stopped == "deadline" and budget_bound):
+            stopped = budget.stop_reason() or "deadline"
+    elif budget_bound and stopped is None:
+        stopped = "deadline"  # the greedy plan used up the whole budget
+    planning_ms = budget.elapsed_ms()
+
+    created = plan.created
+    if not req.preview:
+        if prof is not None:
+            t = prof.clock()
+        created = _add_rows(db, plan.created, with_ids=True)
+        refresh_workload_for(db, day_start, day_end)
+        if prof is not None:
+            prof.add_phase("write", t)
+            t = prof.clock()
+        # plan_warnings from the in-memory state, as refresh_warnings_for would redo them
+        warnings = _find_warnings(ctx, context_rows + created, day_start, day_end + LOOKBACK)
+        store_warnings(db, warnings, day_start, day_end + LOOKBACK)
+        if prof is not None:
+            prof.add_phase("warnings", t)
+            t = prof.clock()
+        db.commit()
+        if prof is not None:
+            prof.add_phase("commit", t)
+    else:
+        if prof is not None:
+            t = prof.clock()
+        warnings = _find_warnings(ctx, context_rows + created, day_start, day_end)
+        if prof is not None:
+            prof.add_phase("warnings", t)
     
-    # Debug: log how many assignments were created
-    total_created = sum(r.created_count or 0 for r in results)
-    print(f"[DEBUG] fill: day={req.day}, replace={req.replace}, shuffle={req.shuffle}, total_assignments_created={total_created}")
+    logger.debug(
+        "fill: day=%s replace=%s shuffle=%s preview=%s candidates=%s created=%d",
+        req.day, req.replace, req.shuffle, req.preview, req.candidates,
+        sum(r.created_count or 0 for r in plan.results),
+    )
     
-    return FillResponse(day=req.day, results=results)
+    response = _day_response(req.day, plan, req.preview)
+    response.warnings = _render_warnings(ctx, [w for w in warnings if w.start_at < day_end])
+    response.improvement = improvement
+    if req.time_budget_ms:
+        response.budget = BudgetReport(
+            time_budget_ms=req.time_budget_ms,
+            first_plan_ms=round(first_plan_ms, 1),
+            elapsed_ms=round(planning_ms, 1),
+            stopped=stopped or "finished",
+            candidates_completed=len(ranked) if multi else None,
+        )
+    if multi:
+        response.seed = best_seed
+        response.objective = best_objective
+        response.alternatives = []
+        for seed, alt_plan, objective in ranked[:req.top_k]:
+            alt = _day_response(req.day, alt_plan, req.preview)
+            response.alternatives.append(CandidatePlan(
+                seed=seed, objective=objective, assignments=alt.assignments, unfilled=alt.unfilled,
+            ))
+    if prof is not None:
+        report = prof.report()
+        emit_metrics("plan.fill", report)
+        if req.profile:
+            response.profile = FillProfile(**report)
+    return response
+
+MAX_RANGE_DAYS = 31
+
+class FillRangeRequest(BaseModel):
+    from_day: str = Field(..., description="YYYY-MM-DD (first day to plan)")
+    to_day: str = Field(..., description="YYYY-MM-DD (last day to plan, inclusive)")
+    mission_ids: Optional[List[int]] = None
+    replace: bool = False  # if true, clear existing assignments for these missions/days before filling
+    shuffle: bool = False
+    random_seed: Optional[int] = None
+    exclude_slots: Optional[List[str]] = None
+    locked_assignments: Optional[List[int]] = None
+    weights: Optional[Dict[str, float]] = None
+    scoring_engine: str = "python"
+    preview: bool = False
+    assignment_solver: str = "greedy"
+    improve_ms: Optional[int] = None  # per day
+
+class FillRangeResponse(BaseModel):
+    from_day: str
+    to_day: str
+    days: List[FillResponse]
+
+@router.post("/fill-range", response_model=FillRangeResponse)
+def fill_range(req: FillRangeRequest, db: Session = Depends(get_db)):
+    """
+    Plan [from_day, to_day] in one request: load everything once for
+    [from_day - FAIRNESS_WINDOW_DAYS, to_day], plan the days in order while each
+    day's new assignments feed the next day's stats in memory, and commit once.
+    """
+    return run_fill_range(req, db)
+
+def run_fill_range(
+    req: FillRangeRequest,
+    db: Session,
+    on_day: Optional[Callable[[int, int, date], None]] = None,
+) -> FillRangeResponse:
+    """
+    Body of /plan/fill-range. `on_day(done, total, day)` is called after each
+    planned day (before anything is written), so a background job can report
+    progress and abort by raising.
+    """
+    first_day = _parse_day(req.from_day)
+    last_day = _parse_day(req.to_day)
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="to_day must be on/after from_day")
+    n_days = (last_day - first_day).days + 1
+    if n_days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too long; at most {MAX_RANGE_DAYS} days")
+    _check_scoring_engine(req.scoring_engine)
+    _check_assignment_solver(req.assignment_solver)
+    _check_improve_ms(req.improve_ms)
+
+    range_start, _ = _day_bounds(first_day)
+    _, range_end = _day_bounds(last_day)
+
+    if not req.preview:
+        _fix_assignments_sequence(db)
+
+    rng = _make_rng(req.random_seed)
+    ctx, mission_list = _prepare_context(db, req, rng)
+
+    if req.replace and not req.preview:
+        _clear_for_replace(db, mission_list, range_start, range_end, req.locked_assignments)
+
+    vacations = _fetch_vacations(db, first_day, last_day)
+    known_rows = _fetch_assignment_rows(db, range_start - timedelta(days=FAIRNESS_WINDOW_DAYS), range_end)
+    if req.replace and req.preview:
+        known_rows = _rows_after_clear(known_rows, mission_list, range_start, range_end, req.locked_assignments)
+    active_weights = _active_weights(req.weights)
+
+    days: List[FillResponse] = []
+    all_created: List[AssignmentRow] = []
+    n_known = len(known_rows)
+    for offset in range(n_days):
+        the_day = first_day + timedelta(days=offset)
+        vacation_blocks = _vacation_blocks_from(vacations, the_day)
+        plan = _plan_day(
+            req, the_day, ctx, mission_list, known_rows, vacation_blocks, active_weights, rng,
+        )
+        improvement: Optional[ImprovementReport] = None
+        if req.improve_ms:
+            plan, improvement = _improve_day(the_day, ctx, known_rows, vacation_blocks, plan, req.improve_ms)
+        known_rows.extend(plan.created)
+        all_created.extend(plan.created)
+        day_response = _day_response(the_day.isoformat(), plan, req.preview)
+        day_response.improvement = improvement
+        days.append(day_response)
+        if on_day is not None:
+            on_day(offset + 1, n_days, the_day)
+
+    if not req.preview:
+        all_created = _add_rows(db, all_created, with_ids=True)
+        refresh_workload_for(db, range_start, range_end)
+        refresh_warnings_for(db, range_start, range_end)
+        db.commit()
+
+    # known_rows reach back FAIRNESS_WINDOW_DAYS, more than the warnings LOOKBACK
+    warnings = _find_warnings(ctx, known_rows[:n_known] + all_created, range_start, range_end)
+    by_day = group_by_day(_render_warnings(ctx, warnings), first_day, n_days)
+    for day_response in days:
+        day_response.warnings = by_day[day_response.day]
+
+    logger.debug(
+        "fill-range: %s..%s replace=%s shuffle=%s preview=%s created=%d",
+        req.from_day, req.to_day, req.replace, req.shuffle, req.preview, len(all_created),
+    )
+
+    return FillRangeResponse(from_day=req.from_day, to_day=req.to_day, days=days)
+
+class ApplyRequest(BaseModel):
+    day: str = Field(..., description="YYYY-MM-DD (first day of the previewed plan)")
+    to_day: Optional[str] = None  # last day for a /plan/fill-range preview (defaults to `day`)
+    mission_ids: Optional[List[int]] = None
+    replace: bool = False  # must match the preview request
+    locked_assignments: Optional[List[int]] = None
+    assignments: List[PlannedAssignment]
+
+class ApplyResponse(BaseModel):
+    day: str
+    to_day: str
+    created_count: int
+
+@router.post("/apply", response_model=ApplyResponse)
+def apply_plan(req: ApplyRequest, db: Session = Depends(get_db)):
+    """
+    Commit a plan returned by /plan/fill (or /plan/fill-range) with preview=true.
+
+    Every row must name a known soldier and mission and the window of one of the
+    mission's slots. The clear for replace=true and all inserts run in one
+    transaction. If the assignments table changed since the preview so that a
+    planned row fails the planner's strict checks (overlap or < 8h rest next to
+    an assignment of its soldier touching the row's day), or fills its window
+    past the mission's seats, nothing is written and 409 is returned.
+    """
+    first_day = _parse_day(req.day)
+    last_day = _parse_day(req.to_day) if req.to_day else first_day
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="to_day must be on/after day")
+    range_start, _ = _day_bounds(first_day)
+    _, range_end = _day_bounds(last_day)
+
+    planned = [
+        AssignmentRow(None, p.mission_id, p.soldier_id, p.role_id, _naive(p.start_at), _naive(p.end_at))
+        for p in req.assignments
+    ]
+    for r in planned:
+        if not (range_start <= r.start_at < range_end):
+            raise HTTPException(status_code=400, detail=f"Assignment for mission {r.mission_id} starts outside the plan range")
+    if req.mission_ids:
+        wanted = set(req.mission_ids)
+        if any(r.mission_id not in wanted for r in planned):
+            raise HTTPException(status_code=400, detail="Assignment mission is not in mission_ids")
+
+    snapshot = planner_snapshot(db)
+    missions = {m.id: m for m in snapshot.missions}
+    soldier_ids = {s.id for s in snapshot.soldiers}
+    if any(r.mission_id not in missions for r in planned):
+        raise HTTPException(status_code=404, detail="Mission not found")
+    if any(r.soldier_id not in soldier_ids for r in planned):
+        raise HTTPException(status_code=404, detail="Soldier not found")
+    for r in planned:
+        if not any(
+            Assignment.window_for(slot.start_time, slot.end_time, r.start_at.date()) == (r.start_at, r.end_at)
+            for slot in missions[r.mission_id].slots
+        ):
+            raise HTTPException(status_code=400, detail="Window does not match a slot of the mission")
+
+    _fix_assignments_sequence(db)
+
+    if req.replace:
+        q = select(Mission)
+        if req.mission_ids:
+            q = q.where(Mission.id.in_(req.mission_ids))
+        _clear_for_replace(db, db.execute(q).scalars().all(), range_start, range_end, req.locked_assignments)
+
+    # The planner's strict checks for each planned row (in the plan's order), against
+    # what /plan/fill sees for its day: the rows touching the day, including the
+    # plan's own earlier rows
+    current = _fetch_assignment_rows(db, range_start, range_end)
+    seated: Dict[tuple[int, datetime, datetime], int] = {}
+    for r in current:
+        if r.soldier_id is not None:
+            key = (r.mission_id, r.start_at, r.end_at)
+            seated[key] = seated.get(key, 0) + 1
+
+    busy = 0
+    accepted: List[AssignmentRow] = []
+    for the_day in sorted({r.start_at.date() for r in planned}):
+        day_start, day_end = _day_bounds(the_day)
+        occupied_by_soldier: Dict[int, IntervalIndex] = {}
+        for r in current + accepted:
+            if r.soldier_id is not None and r.end_at > day_start and r.start_at < day_end:
+                occupied_by_soldier.setdefault(r.soldier_id, IntervalIndex()).add(r.start_at, r.end_at)
+        for r in planned:
+            if r.start_at.date() != the_day:
+                continue
+            neighbors = _neighbors(occupied_by_soldier.get(r.soldier_id), r.start_at, r.end_at)
+            if neighbors[0] or not _has_8h_rest_around(neighbors, r.start_at, r.end_at, EIGHT_HOURS):
+                busy += 1
+            occupied_by_soldier.setdefault(r.soldier_id, IntervalIndex()).add(r.start_at, r.end_at)
+            accepted.append(r)
+            key = (r.mission_id, r.start_at, r.end_at)
+            seated[key] = seated.get(key, 0) + 1
+    overfilled = 0
+    for key in {(r.mission_id, r.start_at, r.end_at) for r in planned}:
+        layout = _seat_layout(missions[key[0]])
+        if seated[key] > len(layout.roles) + layout.generic_count:
+            overfilled += 1
+    if busy or overfilled:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                f"Plan is stale: {busy} assignment(s) overlap or leave < 8h rest, "
+                f"{overfilled} window(s) over capacity; preview again"
+            ),
+        )
+
+    _add_rows(db, planned)
+    refresh_workload_for(db, range_start, range_end)
+    refresh_warnings_for(db, range_start, range_end)
+    db.commit()
+
+    return ApplyResponse(day=first_day.isoformat(), to_day=last_day.isoformat(), created_count=len(planned))
+
+class RepairWindow(BaseModel):
+    mission_id: int
+    start_at: datetime
+    end_at: datetime
+
+class RepairRequest(BaseModel):
+    day: str = Field(..., description="YYYY-MM-DD")
+    windows: Optional[List[RepairWindow]] = None  # e.g. the window of an unassigned (deleted) assignment
+    assignment_ids: Optional[List[int]] = None  # existing assignments whose windows should be repaired
+    exclude_slots: Optional[List[str]] = None  # same keys as /plan/fill
+    weights: Optional[Dict[str, float]] = None
+    preview: bool = False
+
+class RepairResponse(BaseModel):
+    day: str
+    preview: bool = False
+    created: List[PlannedAssignment]
+    unfilled: List[UnfilledSeat]
+    loaded_soldiers: int  # soldiers whose history was loaded to score the open seats
+
+@router.post("/repair", response_model=RepairResponse)
+def repair(req: RepairRequest, db: Session = Depends(get_db)):
+    """
+    Refill only the open seats of the given mission windows.
+
+    Each window must be the window of one of its mission's slots on the day.
+    Instead of reloading the whole day like /plan/fill, this reads the rows around
+    the windows (+/- 8h) to find who is free under the strict rules, takes the
+    fairness history from the rollups like /plan/fill (day rows only for those
+    soldiers and the ones already in the windows) and fills the open seats
+    greedily with the same scoring. Returns the delta.
+    """
+    the_day = _parse_day(req.day)
+    day_start, day_end = _day_bounds(the_day)
+
+    windows: set[tuple[int, datetime, datetime]] = {
+        (w.mission_id, _naive(w.start_at), _naive(w.end_at)) for w in (req.windows or [])
+    }
+    if req.assignment_ids:
+        found = db.execute(
+            select(Assignment.id, Assignment.mission_id, Assignment.start_at, Assignment.end_at)
+            .where(Assignment.id.in_(req.assignment_ids))
+        ).all()
+        if len(found) != len(set(req.assignment_ids)):
+            raise HTTPException(status_code=404, detail="Assignment not found")
+        windows.update((m_id, _naive(s_at), _naive(e_at)) for _a_id, m_id, s_at, e_at in found)
+    if not windows:
+        raise HTTPException(status_code=400, detail="Provide windows or assignment_ids")
+    for _m_id, s_at, e_at in windows:
+        if not (day_start <= s_at < day_end) or e_at <= s_at:
+            raise HTTPException(status_code=400, detail="Window must start on the requested day")
+
+    snapshot = planner_snapshot(db)
+    wanted = {w[0] for w in windows}
+    missions = {m.id: m for m in snapshot.missions if m.id in wanted}
+    if len(missions) != len(wanted):
+        raise HTTPException(status_code=404, detail="Mission not found")
+    for m_id, s_at, e_at in windows:
+        if not any(
+            Assignment.window_for(slot.start_time, slot.end_time, the_day) == (s_at, e_at)
+            for slot in missions[m_id].slots
+        ):
+            raise HTTPException(status_code=400, detail="Window does not match a slot of the mission")
+
+    soldiers = snapshot.soldiers
+    restricted_pairs = snapshot.restricted_pairs
+    vacation_blocks = _vacation_blocks_for_day(db, the_day)
+
+    # Rows inside the strict rest envelope of the windows decide who is blocked
+    envelope_start = min(w[1] for w in windows) - EIGHT_HOURS
+    envelope_end = max(w[2] for w in windows) + EIGHT_HOURS
+    nearby = _fetch_assignment_rows(db, envelope_start, envelope_end)
+
+    blocked: Dict[tuple[int, datetime, datetime], set[int]] = {}
+    in_window: Dict[tuple[int, datetime, datetime], List[AssignmentRow]] = {}
+    for w in windows:
+        _m_id, s_at, e_at = w
+        blocked[w] = {
+            r.soldier_id for r in nearby
+            if r.soldier_id is not None and r.start_at < e_at + EIGHT_HOURS and r.end_at > s_at - EIGHT_HOURS
+        }
+        in_window[w] = [r for r in nearby if (r.mission_id, r.start_at, r.end_at) == w and r.soldier_id is not None]
+
+    # Soldiers free (strict rest, restriction, vacation) for at least one window
+    candidate_ids = {
+        s.id for s in soldiers
+        if any(
+            s.id not in blocked[w]
+            and (s.id, w[0]) not in restricted_pairs
+            and not any(bs < w[2] and be > w[1] for bs, be in vacation_blocks.get(s.id, []))
+            for w in windows
+        )
+    }
+    fellow_ids = {r.soldier_id for rows in in_window.values() for r in rows}
+    loaded_ids = candidate_ids | fellow_ids
+
+    # Fairness history from the rollups as in /plan/fill; the rows near the day
+    # only for the soldiers that can be picked (and their would-be fellows)
+    history = _load_history(db, the_day, loaded_ids)
+    known: Dict[Optional[int], AssignmentRow] = {r.id: r for r in nearby}
+    for r in _fetch_assignment_rows(db, day_start - NEAR_HISTORY, day_end, soldier_ids=loaded_ids):
+        known[r.id] = r
+    known_rows = list(known.values())
+
+    stats_by_soldier = _build_soldier_stats_from_rollup(history, known_rows, day_start, day_end)
+    pair_counts = _build_pair_counts_from_rollup(history, known_rows, day_start, day_end)
+    rest_index = RestIndex.from_stats(stats_by_soldier, vacation_blocks, ref=day_start)
+    friends_map, not_friends_map = snapshot.friends_map, snapshot.not_friends_map
+    active_weights = _active_weights(req.weights)
+
+    existing_same_window: set[tuple[int, datetime, datetime]] = set()
+    occupied_by_soldier: Dict[int, IntervalIndex] = {}
+    for r in known_rows:
+        if r.end_at > day_start - EIGHT_HOURS:
+            existing_same_window.add((r.soldier_id, r.start_at, r.end_at))
+            occupied_by_soldier.setdefault(r.soldier_id, IntervalIndex()).add(r.start_at, r.end_at)
+
+    candidates = [s for s in soldiers if s.id in candidate_ids]
+    by_role: Dict[int, List[SoldierRow]] = {}
+    for s in candidates:
+        for r in s.roles:
+            by_role.setdefault(r.id, []).append(s)
+    excluded = set(req.exclude_slots or [])
+
+    created: List[AssignmentRow] = []
+    unfilled: List[UnfilledSeat] = []
+    for w in sorted(windows, key=lambda w: (w[1], w[0])):
+        m_id, start_at, end_at = w
+        m = missions[m_id]
+        # Open seats: layout positions not covered by the soldiers already in the window
+        taken_by_role: Dict[Optional[int], int] = {}
+        for r in in_window[w]:
+            taken_by_role[r.role_id] = taken_by_role.get(r.role_id, 0) + 1
+        seats = _seat_layout(m).open_seats(m_id, start_at, end_at, excluded, taken_by_role)
+
+        assigned_here = {r.soldier_id for r in in_window[w]}
+        for role_id, pos in seats:
+            pool = by_role.get(role_id, []) if role_id is not None else candidates
+            pool = [s for s in pool if (s.id, m_id) not in restricted_pairs]
+            scored = _collect_candidates_for_slot(
+                pool=pool,
+                m_id=m_id,
+                start_at=start_at,
+                end_at=end_at,
+                stats_by_soldier=stats_by_soldier,
+                restricted_pairs=restricted_pairs,
+                existing_same_window=existing_same_window,
+                occupied_by_soldier=occupied_by_soldier,
+                vacation_blocks=vacation_blocks,
+                rr_start_idx=0,
+                strict=True,
+                assigned_here=assigned_here,
+                pair_counts=pair_counts,
+                weights=active_weights,
+                friends_map=friends_map,
+                not_friends_map=not_friends_map,
+                rest_index=rest_index,
+            )
+            if not scored:
+                unfilled.append(UnfilledSeat(
+                    mission_id=m_id, role_id=role_id, start_at=start_at, end_at=end_at,
+                    position=pos, reason="no_candidates" if pool else "no_pool",
+                ))
+                continue
+
+            chosen_score, _chosen_i, soldier = scored[0]
+            assigned_here.add(soldier.id)
+            created.append(AssignmentRow(
+                None, m_id, soldier.id, role_id, start_at, end_at, chosen_score, len(scored),
+            ))
+            existing_same_window.add((soldier.id, start_at, end_at))
+            occupied_by_soldier.setdefault(soldier.id, IntervalIndex()).add(start_at, end_at)
+            st = stats_by_soldier.setdefault(soldier.id, SoldierStats())
+            _update_stats_after_assignment(
+                st, m_id, start_at, end_at, day_start, day_end,
+                rest_index=rest_index, soldier_id=soldier.id,
+            )
+
+    if not req.preview and created:
+        _fix_assignments_sequence(db)
+        _add_rows(db, created)
+        refresh_workload_for(db, day_start, day_end)
+        refresh_warnings_for(db, day_start, day_end, {r.soldier_id for r in created})
+        db.commit()
+
+    return RepairResponse(
+        day=req.day,
+        preview=req.preview,
+        created=[
+            PlannedAssignment(
+                mission_id=r.mission_id, soldier_id=r.soldier_id, role_id=r.role_id,
+                start_at=r.start_at, end_at=r.end_at, score=r.score, candidates=r.candidates,
+            )
+            for r in created
+        ],
+        unfilled=unfilled,
+        loaded_soldiers=len(loaded_ids),
+    )
 
 @router.post("/unassign_assignment")
 def unassign_assignment(req: UnassignRequest, db: Session = Depends(get_db)):
@@ -1201,7 +2599,10 @@ def unassign_assignment(req: UnassignRequest, db: Session = Depends(get_db)):
 
     # Delete the assignment entirely instead of setting soldier_id to null
     # This avoids unique constraint violations when multiple unassigned slots exist
+    start_at, end_at = a.start_at, a.end_at
     db.delete(a)
+    refresh_workload_for(db, start_at, end_at)
+    refresh_warnings_for(db, start_at, end_at, {soldier_id})
     db.commit()
 
     return {
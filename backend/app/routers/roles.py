@@ -7,6 +7,7 @@ from sqlalchemy.exc import IntegrityError
 from app.db import SessionLocal
 from app.models.role import Role
 from app.models.soldier_role import SoldierRole
+from app.services.planner_cache import bump_planner_version
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
@@ -32,6 +33,7 @@ def create_role(payload: RoleIn):
                 .returning(Role.id)
             ).scalar_one()
             s.commit()
+            bump_planner_version()
             return {"id": rid}
         except IntegrityError:
             s.rollback()
@@ -50,6 +52,7 @@ def update_role(role_id: int, payload: RoleUpdate):
             if res.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Role not found")
             s.commit()
+            bump_planner_version()
             return {"id": role_id}
         except IntegrityError:
             s.rollback()
@@ -68,4 +71,5 @@ def delete_role(role_id: int):
         if res.rowcount == 0:
             raise HTTPException(status_code=404, detail="Role not found")
         s.commit()
+        bump_planner_version()
         return None
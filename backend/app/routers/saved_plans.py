@@ -15,6 +15,10 @@ from app.models.assignment import Assignment
 from app.models.mission_slot import MissionSlot
 from app.models.mission_requirement import MissionRequirement
 from app.models.mission import Mission
+from app.services.bulk_insert import BulkInserter
+from app.services.mission_windows import link_windows
+from app.services.warning_store import refresh_warnings_for
+from app.services.workload_rollup import refresh_workload_for
 
 router = APIRouter(prefix="/saved-plans", tags=["saved-plans"])
 
@@ -134,7 +138,7 @@ def load_plan(plan_id: int, day: Optional[str] = None, db: Session = Depends(get
     )
     
     # Now create the assignments from the saved plan
-    created_count = 0
+    writer = BulkInserter(db, Assignment)
     for assignment_data in plan_data.assignments:
         # assignment_data should have: mission_id, role_id, soldier_id, start_at, end_at
         # Parse the original datetime, then adjust to target_day while keeping the time
@@ -157,16 +161,18 @@ def load_plan(plan_id: int, day: Optional[str] = None, db: Session = Depends(get
             original_end.hour, original_end.minute, original_end.second
         ) + timedelta(days=day_offset)
         
-        assignment = Assignment(
+        writer.add(
             mission_id=assignment_data["mission"]["id"],
             role_id=assignment_data.get("role_id"),
             soldier_id=assignment_data.get("soldier_id"),
             start_at=new_start,
             end_at=new_end,
         )
-        db.add(assignment)
-        created_count += 1
+    created_count = writer.flush()
+    link_windows(db, day_start, day_end)
     
+    refresh_workload_for(db, day_start, day_end)
+    refresh_warnings_for(db, day_start, day_end)
     db.commit()
     
     return {
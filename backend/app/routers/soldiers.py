@@ -18,6 +18,11 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import selectinload, joinedload  # add this import
 from app.models.soldier_mission_restriction import SoldierMissionRestriction  # add
 from app.models.mission import Mission  # optional, but nice to have the type
+from app.models.soldier_restriction_index import SoldierRestrictionIndex
+from app.services.planner_cache import bump_planner_version
+from app.services.restriction_index import compile_soldier_restrictions
+from app.services.warning_store import refresh_soldier_warnings, refresh_warnings_for
+from app.services.workload_rollup import refresh_workload_for, rollup_range
 
 
 router = APIRouter(prefix="/soldiers", tags=["soldiers"])
@@ -168,7 +173,9 @@ def create_soldier(payload: SoldierIn):
             # set roles
             for rid in payload.role_ids:
                 s.execute(insert(SoldierRole).values(soldier_id=new_id, role_id=rid))
+            compile_soldier_restrictions(s, new_id, _normalize_restrictions(payload.restrictions))
             s.commit()
+            bump_planner_version()
             return {"id": new_id}
         except IntegrityError:
             s.rollback()
@@ -204,6 +211,9 @@ def update_soldier(soldier_id: int, payload: SoldierUpdate):
             # Apply simple column updates first (if any)
             if values:
                 s.execute(update(Soldier).where(Soldier.id == soldier_id).values(**values))
+            if "restrictions" in values:
+                compile_soldier_restrictions(s, soldier_id, values["restrictions"])
+                refresh_soldier_warnings(s, [soldier_id])
 
             # Replace roles if provided
             if payload.role_ids is not None:
@@ -219,6 +229,7 @@ def update_soldier(soldier_id: int, payload: SoldierUpdate):
                     s.execute(insert(SoldierRole).values(soldier_id=soldier_id, role_id=rid))
 
             s.commit()
+            bump_planner_version()
             return {"id": soldier_id}
 
         except IntegrityError:
@@ -245,9 +256,18 @@ def delete_soldier(soldier_id: int):
         if not exists:
             raise HTTPException(status_code=404, detail="Soldier not found")
 
+        # Days of rollups or warnings (also as a not-friend fellow) that would outlive
+        # the soldier: left by assignments removed outside this API
+        affected = rollup_range(s, soldier_id=soldier_id)
+
         # Cleanup junctions & vacations, then soldier row
         s.execute(delete(SoldierRole).where(SoldierRole.soldier_id == soldier_id))
         s.execute(delete(Vacation).where(Vacation.soldier_id == soldier_id))
+        s.execute(delete(SoldierRestrictionIndex).where(SoldierRestrictionIndex.soldier_id == soldier_id))
         s.execute(delete(Soldier).where(Soldier.id == soldier_id))
+        if affected is not None:
+            refresh_workload_for(s, *affected)
+            refresh_warnings_for(s, *affected)
         s.commit()
+        bump_planner_version()
         return None
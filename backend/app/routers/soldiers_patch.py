@@ -6,6 +6,9 @@ from app.db import SessionLocal, get_db
 from app.models.soldier import Soldier
 from app.models.soldier_mission_restriction import SoldierMissionRestriction
 from app.models.mission import Mission
+from app.services.planner_cache import bump_planner_version
+from app.services.restriction_index import compile_soldier_restrictions
+from app.services.warning_store import refresh_soldier_warnings
 
 
 router = APIRouter(prefix="/soldiers", tags=["soldiers"])
@@ -26,7 +29,11 @@ def update_soldier(soldier_id: int, payload: SoldierUpdate):
             return {"id": soldier_id}
 
         s.execute(update(Soldier).where(Soldier.id == soldier_id).values(**values))
+        if "restrictions" in values:
+            compile_soldier_restrictions(s, soldier_id, values["restrictions"])
+            refresh_soldier_warnings(s, [soldier_id])
         s.commit()
+        bump_planner_version()
         return {"id": soldier_id, **values}
 
 class SoldierMissionRestrictionsOut(BaseModel):
@@ -77,7 +84,9 @@ def put_soldier_mission_restrictions(soldier_id: int, body: SoldierMissionRestri
     for mid in set(body.mission_ids):
         db.add(SoldierMissionRestriction(soldier_id=soldier_id, mission_id=mid))
 
+    refresh_soldier_warnings(db, [soldier_id])
     db.commit()
+    bump_planner_version()
 
     return SoldierMissionRestrictionsOut(
         soldier_id=soldier_id,
@@ -0,0 +1,2 @@
+# backend/app/services/__init__.py
+# Planner engines and shared helpers used by the routers.
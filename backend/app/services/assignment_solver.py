@@ -0,0 +1,77 @@
+# backend/app/services/assignment_solver.py
+from __future__ import annotations
+
+import numpy as np
+
+
+def solve_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    Min-cost assignment of rows (seats) to distinct columns (candidates).
+
+    `cost` is a (rows x cols) float matrix; `np.inf` marks a forbidden pair.
+    Returns, for every row, the chosen column or -1 when the row stays empty.
+    The result fills as many rows as possible and, among those, has minimum
+    total cost: each row gets a private "leave empty" column whose cost is
+    larger than any difference the real columns can make.
+
+    Shortest augmenting path Hungarian (Jonker-Volgenant style) with row/column
+    potentials, O(rows^2 * cols); the inner column scan is vectorized.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+
+    finite = cost[np.isfinite(cost)]
+    if finite.size:
+        big = (np.abs(finite).max() + (finite.max() - finite.min()) + 1.0) * (n + 1)
+    else:
+        big = 1.0
+    dummy = np.full((n, n), np.inf)
+    np.fill_diagonal(dummy, big)
+    c = np.hstack([cost, dummy])
+    cols = m + n
+
+    # 1-based arrays as in the classic formulation; column 0 is the virtual root
+    u = np.zeros(n + 1)
+    v = np.zeros(cols + 1)
+    p = np.zeros(cols + 1, dtype=np.intp)  # p[j] = row matched to column j (0 = free)
+    way = np.zeros(cols + 1, dtype=np.intp)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(cols + 1, np.inf)
+        used = np.zeros(cols + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            with np.errstate(invalid="ignore"):
+                cur = c[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Augment along the alternating path back to the root
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = np.full(n, -1, dtype=np.intp)
+    for j in range(1, m + 1):
+        if p[j]:
+            assignment[p[j] - 1] = j - 1
+    return assignment
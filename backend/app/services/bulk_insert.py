@@ -0,0 +1,72 @@
+# backend/app/services/bulk_insert.py
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class BulkInserter:
+    """
+    Collects plain row dicts for one table and writes them with a Core
+    executemany per batch (SQLAlchemy 2 sends it as multi-row
+    INSERT ... VALUES on Postgres) instead of one ORM object per row.
+
+    Rows go out when a batch fills or on `flush()`; the caller commits.
+    Column defaults (e.g. Assignment.created_at) are applied by Core. The
+    insert targets the Table, not the ORM entity: ORM bulk insert splits a
+    batch wherever the set of None-valued keys changes, which makes the
+    statement count depend on the data.
+
+    With `returning="id"` (an autoincrement key) each batch is sent with
+    RETURNING, still one statement per batch, and the generated values are
+    collected in `returned` in the order the rows were added.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        model: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        returning: Optional[str] = None,
+    ):
+        self.db = db
+        self.model = model
+        self.batch_size = batch_size
+        self.written = 0
+        self.returned: List[Any] = []
+        self._returning = returning
+        self._pending: List[Dict[str, Any]] = []
+
+    def add(self, **row: Any) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> int:
+        """Write the pending rows; returns how many were written in total so far."""
+        if self._pending:
+            table = self.model.__table__
+            if self._returning is None:
+                self.db.execute(insert(table), self._pending)
+            elif self.db.get_bind().dialect.name == "sqlite":
+                # SQLAlchemy cannot pair RETURNING rows with parameters on SQLite and
+                # would go row by row; one multi-row INSERT hands out rowids in VALUES
+                # order there, so an autoincrement key sorts back into place
+                stmt = insert(table).returning(table.c[self._returning])
+                self.returned.extend(sorted(self.db.execute(stmt, self._pending).scalars().all()))
+            else:
+                stmt = insert(table).returning(table.c[self._returning], sort_by_parameter_order=True)
+                self.returned.extend(self.db.execute(stmt, self._pending).scalars().all())
+            self.written += len(self._pending)
+            self._pending = []
+        return self.written
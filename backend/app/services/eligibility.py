@@ -0,0 +1,124 @@
+# backend/app/services/eligibility.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+Window = Tuple[datetime, datetime]
+
+_EMPTY = np.zeros(0, dtype=np.intp)
+
+
+class SeatPool(NamedTuple):
+    soldiers: list  # the pool, in the order of its source list (role list or all soldiers)
+    index: np.ndarray  # soldier index per pool position
+    eligible: np.ndarray  # per pool position: not on vacation during the window
+
+
+class EligibilityMasks:
+    """
+    The planner's per-seat filters as bool masks over soldiers indexed 0..N-1
+    (in `soldiers` order): role membership, mission restrictions, vacation per
+    window and already-assigned per window.
+
+    A seat's pool is the role's index order with the restricted / already-in-
+    window soldiers masked out, so it comes back in the same order (and with
+    the same positions) as filtering the role list soldier by soldier. Vacation
+    is returned as a per-position mask rather than dropped from the pool, since
+    pool positions drive the round-robin cursor. Masks per window are built on
+    first use; `mark_assigned` keeps the in-window masks current while planning.
+    """
+
+    def __init__(
+        self,
+        soldiers: Sequence,
+        soldiers_by_role: Mapping[int, Sequence],
+        restricted_pairs: Iterable[Tuple[int, int]],
+        vacation_blocks: Mapping[int, List[Window]],
+    ):
+        self.soldiers = list(soldiers)
+        self.index: Dict[int, int] = {s.id: i for i, s in enumerate(self.soldiers)}
+        n = self._n = len(self.soldiers)
+
+        # Pool orders: soldier indices in the order of each role list (None: generic seats)
+        self._order: Dict[Optional[int], np.ndarray] = {None: np.arange(n, dtype=np.intp)}
+        for role_id, lst in soldiers_by_role.items():
+            self._order[role_id] = np.fromiter((self.index[s.id] for s in lst), dtype=np.intp, count=len(lst))
+        self._role: Dict[Optional[int], np.ndarray] = {}
+
+        self._restricted: Dict[int, np.ndarray] = {}
+        for soldier_id, mission_id in restricted_pairs:
+            i = self.index.get(soldier_id)
+            if i is None:
+                continue
+            mask = self._restricted.get(mission_id)
+            if mask is None:
+                mask = self._restricted[mission_id] = np.zeros(n, dtype=bool)
+            mask[i] = True
+
+        self._vacation_blocks = vacation_blocks
+        self._on_vacation: Dict[Window, np.ndarray] = {}
+        self._in_window: Dict[Window, np.ndarray] = {}
+
+    def role_mask(self, role_id: Optional[int]) -> np.ndarray:
+        """Soldiers holding `role_id` (everyone for None)."""
+        mask = self._role.get(role_id)
+        if mask is None:
+            mask = np.zeros(self._n, dtype=bool)
+            mask[self._order.get(role_id, _EMPTY)] = True
+            self._role[role_id] = mask
+        return mask
+
+    def on_vacation(self, start_at: datetime, end_at: datetime) -> np.ndarray:
+        """Soldiers with a vacation block overlapping [start_at, end_at)."""
+        key = (start_at, end_at)
+        mask = self._on_vacation.get(key)
+        if mask is None:
+            mask = np.zeros(self._n, dtype=bool)
+            for soldier_id, blocks in self._vacation_blocks.items():
+                i = self.index.get(soldier_id)
+                if i is not None and any(bs < end_at and be > start_at for bs, be in blocks):
+                    mask[i] = True
+            self._on_vacation[key] = mask
+        return mask
+
+    def mark_assigned(self, soldier_id: Optional[int], start_at: datetime, end_at: datetime) -> None:
+        """Record that the soldier holds the exact window [start_at, end_at)."""
+        i = self.index.get(soldier_id)
+        if i is None:
+            return
+        key = (start_at, end_at)
+        mask = self._in_window.get(key)
+        if mask is None:
+            mask = self._in_window[key] = np.zeros(self._n, dtype=bool)
+        mask[i] = True
+
+    def pool(self, role_id: Optional[int], mission_id: int, start_at: datetime, end_at: datetime) -> SeatPool:
+        """Soldiers of the role (or all, for None) neither restricted from the mission nor already in the window."""
+        order = self._order.get(role_id, _EMPTY)
+        restricted = self._restricted.get(mission_id)
+        in_window = self._in_window.get((start_at, end_at))
+        if restricted is None and in_window is None:
+            idx = order
+        elif in_window is None:
+            idx = order[~restricted[order]]
+        elif restricted is None:
+            idx = order[~in_window[order]]
+        else:
+            idx = order[~(restricted | in_window)[order]]
+        return SeatPool(
+            [self.soldiers[i] for i in idx.tolist()],
+            idx,
+            ~self.on_vacation(start_at, end_at)[idx],
+        )
+
+    def rejections(self, role_id: Optional[int], mission_id: int, start_at: datetime, end_at: datetime) -> Tuple[int, int]:
+        """(restricted, already in window) counts dropped from the seat's pool, restriction first."""
+        order = self._order.get(role_id, _EMPTY)
+        restricted = self._restricted.get(mission_id)
+        in_window = self._in_window.get((start_at, end_at))
+        r = restricted[order] if restricted is not None else np.zeros(len(order), dtype=bool)
+        w = in_window[order] & ~r if in_window is not None else r[:0]
+        return int(r.sum()), int(w.sum())
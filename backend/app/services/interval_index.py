@@ -0,0 +1,60 @@
+# backend/app/services/interval_index.py
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class IntervalIndex:
+    """
+    One soldier's occupied (start, end) intervals, kept sorted for bisect lookups.
+
+    Intervals may overlap each other (the DB does not forbid it), so besides the
+    start-sorted list we keep a running max of ends in start order (for overlap
+    checks) and a separate sorted list of ends (for the previous neighbor).
+    `neighbors()` answers overlap / previous end / next start with two bisects.
+    """
+
+    __slots__ = ("_intervals", "_starts", "_ends", "_max_end")
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime]] = ()):
+        self._intervals: List[Tuple[datetime, datetime]] = sorted(intervals)
+        self._starts: List[datetime] = [s for s, _ in self._intervals]
+        self._ends: List[datetime] = sorted(e for _, e in self._intervals)
+        self._max_end: List[datetime] = []
+        self._rebuild_max_end(0)
+
+    def _rebuild_max_end(self, pos: int) -> None:
+        del self._max_end[pos:]
+        running = self._max_end[-1] if self._max_end else None
+        for _, e in self._intervals[pos:]:
+            running = e if running is None or e > running else running
+            self._max_end.append(running)
+
+    def add(self, start: datetime, end: datetime) -> None:
+        pos = bisect_right(self._intervals, (start, end))
+        self._intervals.insert(pos, (start, end))
+        self._starts.insert(pos, start)
+        insort(self._ends, end)
+        self._rebuild_max_end(pos)
+
+    def neighbors(self, start: datetime, end: datetime) -> Tuple[bool, Optional[datetime], Optional[datetime]]:
+        """
+        Return (overlaps, prev_end, next_start) for a candidate [start, end):
+          - overlaps: some interval has s < end and e > start
+          - prev_end: latest interval end that is <= start
+          - next_start: earliest interval start that is >= end
+        """
+        k = bisect_left(self._starts, end)
+        overlaps = k > 0 and self._max_end[k - 1] > start
+        next_start = self._starts[k] if k < len(self._starts) else None
+        j = bisect_right(self._ends, start)
+        prev_end = self._ends[j - 1] if j > 0 else None
+        return overlaps, prev_end, next_start
+
+    def __iter__(self) -> Iterator[Tuple[datetime, datetime]]:
+        return iter(self._intervals)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
@@ -0,0 +1,192 @@
+# backend/app/services/job_runner.py
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.plan_job import PlanJob
+from app.services.planner_cache import bump_planner_version
+
+# Handlers run in the job pool: handler(params, db, progress) -> JSON-able result.
+# They must be module-level functions (they are pickled to the workers), use
+# `db` for their writes and commit it themselves, and call `progress.update()`
+# between steps so cancellation can take effect.
+JobHandler = Callable[[dict, Session, "JobProgress"], Any]
+
+MAX_JOB_WORKERS = 2
+ACTIVE_STATUSES = ("queued", "running")
+CANCEL_CHECK_S = 1.0  # JobProgress.check reads the cancel flag at most this often
+
+
+class JobCancelled(Exception):
+    """Raised by `JobProgress.update` once a cancel was requested for the job."""
+
+
+class JobProgress:
+    """Progress reporter handed to a job handler; each update is its own short transaction."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._next_check = 0.0
+
+    def update(self, fraction: float, message: Optional[str] = None) -> None:
+        """Store progress (0..1) and a status line; raises JobCancelled if the job was cancelled."""
+        with SessionLocal() as s:
+            s.execute(
+                update(PlanJob)
+                .where(PlanJob.id == self.job_id)
+                .values(progress=max(0.0, min(1.0, fraction)), message=message)
+            )
+            cancel = s.scalar(select(PlanJob.cancel_requested).where(PlanJob.id == self.job_id))
+            s.commit()
+        if cancel:
+            raise JobCancelled()
+
+    def check(self) -> bool:
+        """
+        Raise JobCancelled if the job was cancelled; usable as a planner `interrupt`
+        probe. Reads the flag at most every CANCEL_CHECK_S (calls in between return False).
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + CANCEL_CHECK_S
+        with SessionLocal() as s:
+            cancel = s.scalar(select(PlanJob.cancel_requested).where(PlanJob.id == self.job_id))
+        if cancel:
+            raise JobCancelled()
+        return False
+
+
+def _finish(job_id: int, status: str, **values) -> None:
+    with SessionLocal() as s:
+        s.execute(
+            update(PlanJob)
+            .where(PlanJob.id == job_id)
+            .values(status=status, finished_at=datetime.now(), **values)
+        )
+        s.commit()
+
+
+def execute_job(job_id: int, handler: JobHandler) -> None:
+    """Worker-process entry point: run one queued job and persist its outcome."""
+    # Workers outlive jobs, and API writes only bump the server's planner cache:
+    # drop this worker's snapshot so the job plans on the current data
+    bump_planner_version()
+    with SessionLocal() as s:
+        job = s.get(PlanJob, job_id)
+        if job is None or job.status != "queued":
+            return  # cancelled while queued
+        if job.cancel_requested:
+            s.execute(update(PlanJob).where(PlanJob.id == job_id).values(status="cancelled", finished_at=datetime.now()))
+            s.commit()
+            return
+        params = job.params
+        s.execute(
+            update(PlanJob).where(PlanJob.id == job_id).values(status="running", started_at=datetime.now())
+        )
+        s.commit()
+
+    progress = JobProgress(job_id)
+    try:
+        with SessionLocal() as db:
+            try:
+                result = handler(params, db, progress)
+            except BaseException:
+                db.rollback()
+                raise
+    except JobCancelled:
+        _finish(job_id, "cancelled", message="cancelled")
+    except HTTPException as e:
+        _finish(job_id, "failed", error=str(e.detail))
+    except Exception as e:
+        _finish(job_id, "failed", error=f"{type(e).__name__}: {e}")
+    else:
+        _finish(job_id, "succeeded", progress=1.0, message=None, result=result)
+
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_futures: Dict[int, Future] = {}
+
+
+def fail_orphaned_jobs() -> None:
+    """
+    Mark jobs left queued/running by an earlier server process as failed; they
+    will never finish (app startup, before any job is submitted).
+    """
+    with SessionLocal() as s:
+        s.execute(
+            update(PlanJob)
+            .where(PlanJob.status.in_(ACTIVE_STATUSES))
+            .values(status="failed", error="interrupted by a server restart", finished_at=datetime.now())
+        )
+        s.commit()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # spawn: workers get a fresh interpreter, not a fork of the server's
+            # DB connection pool, planner cache and candidate pool
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_JOB_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_job_executor() -> None:
+    """
+    Stop the job worker processes (app shutdown). Queued jobs are dropped and
+    running ones waited for; anything left active is failed on the next startup.
+    """
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def submit_job(db: Session, kind: str, params: dict, handler: JobHandler) -> PlanJob:
+    """Persist a queued job and hand it to the pool; returns the job row."""
+    executor = _get_executor()
+    job = PlanJob(kind=kind, status="queued", progress=0.0, params=params)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    future = executor.submit(execute_job, job.id, handler)
+    _futures[job.id] = future
+    future.add_done_callback(lambda _f, job_id=job.id: _job_done(job_id))
+    return job
+
+
+def _job_done(job_id: int) -> None:
+    # Runs in this (server) process. The job wrote through another process, so
+    # this process's planner cache cannot have seen e.g. imported soldiers.
+    _futures.pop(job_id, None)
+    bump_planner_version()
+
+
+def cancel_job(db: Session, job: PlanJob) -> PlanJob:
+    """Cancel a queued job now; flag a running one (it stops at its next progress update)."""
+    if job.status not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    future = _futures.get(job.id)
+    if job.status == "queued" and future is not None and future.cancel():
+        job.status = "cancelled"
+        job.finished_at = datetime.now()
+    job.cancel_requested = True
+    db.commit()
+    db.refresh(job)
+    return job
@@ -0,0 +1,327 @@
+# backend/app/services/local_search.py
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import AbstractSet, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.services.warnings_engine import EIGHT_HOURS, classify_rest
+
+STOP_CHECK_EVERY = 64  # neighbors evaluated between should_stop() calls
+
+Interval = Tuple[datetime, datetime]
+WindowKey = Tuple[int, datetime, datetime]  # (mission_id, start_at, end_at)
+
+
+def soldier_warnings(
+    intervals: List[Interval],
+    day_start: datetime,
+    day_end: datetime,
+) -> Tuple[int, int]:
+    """
+    (overlap, rest) warnings for one soldier's intervals sorted by (start, end).
+    Same rules as the warnings engine: previous end is the one before by start
+    time, and only assignments starting in [day_start, day_end) are counted.
+    """
+    overlap = rest = 0
+    for (_ps, pe), (cs, _ce) in zip(intervals, intervals[1:]):
+        if not (day_start <= cs < day_end):
+            continue
+        kind = classify_rest(cs - pe, None)
+        if kind is None:
+            continue
+        if kind[0] == "OVERLAP":
+            overlap += 1
+        else:
+            rest += 1
+    return overlap, rest
+
+
+def window_not_friends(soldier_ids: List[int], not_friends_map: Mapping[int, AbstractSet[int]]) -> int:
+    """
+    NOT_FRIENDS warnings for the soldiers of one window, as the warnings engine
+    counts them: one per soldier per not-friend of theirs in the same window.
+    """
+    n = 0
+    for i, a in enumerate(soldier_ids):
+        for b in soldier_ids[i + 1:]:
+            if a != b:
+                n += (b in not_friends_map.get(a, ())) + (a in not_friends_map.get(b, ()))
+    return n
+
+
+def objective_value(
+    unfilled: int, overlap: int, rest: int, not_friends: int, hours_spread: float, weights: Dict[str, float],
+) -> float:
+    return round(
+        weights["unfilled"] * unfilled
+        + weights["overlap_warning"] * overlap
+        + weights["rest_warning"] * rest
+        + weights["not_friend_warning"] * not_friends
+        + weights["hours_spread_per_hour"] * hours_spread,
+        4,
+    )
+
+
+class Seat:
+    """One planned seat of the day; `soldier_id` is None while it is empty."""
+
+    __slots__ = ("mission_id", "role_id", "start_at", "end_at", "position", "soldier_id", "initial_soldier_id")
+
+    def __init__(self, mission_id: int, role_id: Optional[int], start_at: datetime, end_at: datetime,
+                 position: Optional[int], soldier_id: Optional[int]):
+        self.mission_id = mission_id
+        self.role_id = role_id
+        self.start_at = start_at
+        self.end_at = end_at
+        self.position = position
+        self.soldier_id = soldier_id
+        self.initial_soldier_id = soldier_id
+
+
+class LocalSearch:
+    """
+    Move / swap / ejection neighborhood search over the seats planned for one day.
+
+    Fixed rows (history and assignments that were not planned now, given as
+    (soldier_id, mission_id, start_at, end_at)) never move. Every candidate
+    change keeps the strict-mode hard rules (role, restriction, vacation, no
+    overlap and >= 8h rest around the seat). Changes are applied, the objective
+    is updated incrementally (only the soldiers and windows touched are
+    recounted; hours stay in a sorted list for the spread), and undone unless
+    the objective drops. The search stops at a local optimum or at the deadline.
+    """
+
+    def __init__(
+        self,
+        seats: List[Seat],
+        fixed: Iterable[Tuple[Optional[int], int, datetime, datetime]],
+        soldier_ids: Iterable[int],
+        role_members: Dict[int, set[int]],
+        restricted_pairs: set[tuple[int, int]],
+        vacation_blocks: Dict[int, List[Interval]],
+        day_start: datetime,
+        day_end: datetime,
+        window_start: datetime,
+        weights: Dict[str, float],
+        base_hours: Optional[Dict[int, float]] = None,
+        not_friends_map: Optional[Mapping[int, AbstractSet[int]]] = None,
+    ):
+        self.seats = seats
+        self.soldier_ids = list(soldier_ids)
+        self.role_members = role_members
+        self.restricted_pairs = restricted_pairs
+        self.vacation_blocks = vacation_blocks
+        self.day_start = day_start
+        self.day_end = day_end
+        self.window_start = window_start
+        self.weights = weights
+        self.not_friends_map = not_friends_map or {}
+
+        # With base_hours (hours of everything that started before the day),
+        # fixed rows starting before day_start only add their intervals
+        self.intervals: Dict[int, List[Interval]] = {}
+        self.hours: Dict[int, float] = {sid: 0.0 for sid in self.soldier_ids}
+        # Soldiers per window starting on the day, for NOT_FRIENDS
+        self.windows: Dict[WindowKey, List[int]] = {}
+        if base_hours is not None:
+            self.hours.update(base_hours)
+        for sid, mission_id, s, e in fixed:
+            if sid is not None and s < day_end:
+                if base_hours is not None and s < day_start:
+                    insort(self.intervals.setdefault(sid, []), (s, e))
+                else:
+                    self._insert(sid, (s, e))
+                if s >= day_start:
+                    self.windows.setdefault((mission_id, s, e), []).append(sid)
+        for seat in seats:
+            if seat.soldier_id is not None:
+                self._insert(seat.soldier_id, (seat.start_at, seat.end_at))
+                if day_start <= seat.start_at < day_end:
+                    self.windows.setdefault(self._window(seat), []).append(seat.soldier_id)
+
+        self.sorted_hours: List[float] = sorted(self.hours.values())
+        self.warnings: Dict[int, Tuple[int, int]] = {
+            sid: soldier_warnings(iv, day_start, day_end) for sid, iv in self.intervals.items()
+        }
+        self.overlap = sum(o for o, _ in self.warnings.values())
+        self.rest = sum(r for _, r in self.warnings.values())
+        self.window_warnings: Dict[WindowKey, int] = {
+            key: window_not_friends(sids, self.not_friends_map) for key, sids in self.windows.items()
+        }
+        self.not_friends = sum(self.window_warnings.values())
+        self.unfilled = sum(1 for seat in seats if seat.soldier_id is None)
+
+    # ---- state -------------------------------------------------------------
+
+    @staticmethod
+    def _window(seat: Seat) -> WindowKey:
+        return seat.mission_id, seat.start_at, seat.end_at
+
+    def _hours_of(self, iv: Interval) -> float:
+        s, e = iv
+        if e > self.window_start and s < self.day_end:
+            return (e - s).total_seconds() / 3600.0
+        return 0.0
+
+    def _insert(self, sid: int, iv: Interval) -> None:
+        insort(self.intervals.setdefault(sid, []), iv)
+        self.hours[sid] = self.hours.get(sid, 0.0) + self._hours_of(iv)
+
+    def _set_hours(self, sid: int, delta: float) -> None:
+        if not delta:
+            return
+        old = self.hours.get(sid, 0.0)
+        if sid in self.hours:
+            del self.sorted_hours[bisect_left(self.sorted_hours, old)]
+        self.hours[sid] = old + delta
+        insort(self.sorted_hours, old + delta)
+
+    def _recount(self, sid: int) -> None:
+        o, r = self.warnings.get(sid, (0, 0))
+        no, nr = soldier_warnings(self.intervals.get(sid, []), self.day_start, self.day_end)
+        self.warnings[sid] = (no, nr)
+        self.overlap += no - o
+        self.rest += nr - r
+
+    def _recount_window(self, key: WindowKey) -> None:
+        n = window_not_friends(self.windows.get(key, []), self.not_friends_map)
+        self.not_friends += n - self.window_warnings.get(key, 0)
+        self.window_warnings[key] = n
+
+    def _add(self, sid: int, iv: Interval) -> None:
+        insort(self.intervals.setdefault(sid, []), iv)
+        self._set_hours(sid, self._hours_of(iv))
+        self._recount(sid)
+
+    def _remove(self, sid: int, iv: Interval) -> None:
+        lst = self.intervals[sid]
+        del lst[bisect_left(lst, iv)]
+        self._set_hours(sid, -self._hours_of(iv))
+        self._recount(sid)
+
+    def _assign(self, seat: Seat, sid: Optional[int]) -> None:
+        iv = (seat.start_at, seat.end_at)
+        in_day = self.day_start <= seat.start_at < self.day_end
+        key = self._window(seat)
+        if seat.soldier_id is not None:
+            self._remove(seat.soldier_id, iv)
+            self.unfilled += 1
+            if in_day:
+                self.windows[key].remove(seat.soldier_id)
+        if sid is not None:
+            self._add(sid, iv)
+            self.unfilled -= 1
+            if in_day:
+                self.windows.setdefault(key, []).append(sid)
+        seat.soldier_id = sid
+        if in_day and self.not_friends_map:
+            self._recount_window(key)
+
+    # ---- objective ---------------------------------------------------------
+
+    def spread(self) -> float:
+        return (self.sorted_hours[-1] - self.sorted_hours[0]) if self.sorted_hours else 0.0
+
+    def value(self) -> float:
+        return objective_value(self.unfilled, self.overlap, self.rest, self.not_friends, self.spread(), self.weights)
+
+    def breakdown(self) -> dict:
+        return {
+            "unfilled": self.unfilled,
+            "overlap_warnings": self.overlap,
+            "rest_warnings": self.rest,
+            "not_friend_warnings": self.not_friends,
+            "hours_spread": round(self.spread(), 2),
+            "value": self.value(),
+        }
+
+    # ---- moves -------------------------------------------------------------
+
+    def _feasible(self, sid: int, seat: Seat) -> bool:
+        """Strict-mode rules for putting `sid` in `seat` (seat itself must not be in sid's intervals)."""
+        if seat.role_id is not None and sid not in self.role_members.get(seat.role_id, ()):
+            return False
+        if (sid, seat.mission_id) in self.restricted_pairs:
+            return False
+        s, e = seat.start_at, seat.end_at
+        if any(bs < e and be > s for bs, be in self.vacation_blocks.get(sid, [])):
+            return False
+        for a, b in self.intervals.get(sid, []):
+            if a < e and b > s:
+                return False
+            if b <= s and s - b < EIGHT_HOURS:
+                return False
+            if a >= e and a - e < EIGHT_HOURS:
+                return False
+        return True
+
+    def _try(self, changes: List[Tuple[Seat, Optional[int]]], current: float) -> bool:
+        """Apply `changes` if all placements are feasible and the objective drops; else undo."""
+        previous = [(seat, seat.soldier_id) for seat, _ in changes]
+        for seat, _ in changes:
+            self._assign(seat, None)
+        ok = True
+        for seat, sid in changes:
+            if sid is not None:
+                if not self._feasible(sid, seat):
+                    ok = False
+                    break
+                self._assign(seat, sid)
+        if ok and self.value() < current - 1e-9:
+            return True
+        for seat, _ in changes:
+            self._assign(seat, None)
+        for seat, sid in previous:
+            if sid is not None:
+                self._assign(seat, sid)
+        return False
+
+    def _neighborhood(self, seat: Seat):
+        if seat.soldier_id is None:
+            # Insert: anyone who fits the empty seat
+            for sid in self.soldier_ids:
+                yield [(seat, sid)]
+            # Ejection: move a planned soldier here and refill their seat
+            for other in self.seats:
+                if other is seat or other.soldier_id is None:
+                    continue
+                for sid in self.soldier_ids:
+                    if sid != other.soldier_id:
+                        yield [(seat, other.soldier_id), (other, sid)]
+        else:
+            # Move: another soldier takes the seat
+            for sid in self.soldier_ids:
+                if sid != seat.soldier_id:
+                    yield [(seat, sid)]
+            # Swap: exchange soldiers with another planned seat
+            for other in self.seats:
+                if other is not seat and other.soldier_id not in (None, seat.soldier_id):
+                    yield [(seat, other.soldier_id), (other, seat.soldier_id)]
+
+    def run(self, budget_ms: float, should_stop: Optional[Callable[[], bool]] = None) -> dict:
+        """
+        First-improvement passes over all seats until none improves, the deadline
+        passes or `should_stop()` (checked every STOP_CHECK_EVERY neighbors) says so.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        iterations = moves = 0
+
+        improved = True
+        while improved:
+            improved = False
+            for seat in self.seats:
+                current = self.value()
+                for changes in self._neighborhood(seat):
+                    if time.perf_counter() >= deadline:
+                        return {"iterations": iterations, "moves": moves, "stopped": "deadline"}
+                    if should_stop is not None and iterations % STOP_CHECK_EVERY == 0 and should_stop():
+                        return {"iterations": iterations, "moves": moves, "stopped": "interrupted"}
+                    iterations += 1
+                    if self._try(changes, current):
+                        moves += 1
+                        improved = True
+                        break
+
+        return {"iterations": iterations, "moves": moves, "stopped": "local_optimum"}
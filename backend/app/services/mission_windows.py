@@ -0,0 +1,153 @@
+# backend/app/services/mission_windows.py
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.mission_slot import MissionSlot
+from app.models.mission_window import MissionWindow
+from app.services.bulk_insert import BulkInserter
+
+# A shift instance by value: (mission_id, start_at, end_at)
+WindowKey = Tuple[int, datetime, datetime]
+
+
+def day_windows(missions: Iterable, day: date) -> List[WindowKey]:
+    """The windows every slot of `missions` (rows with .id and .slots) generates on `day`."""
+    return [(m.id, *Assignment.window_for(slot.start_time, slot.end_time, day)) for m in missions for slot in m.slots]
+
+
+def _slot_id(slots: Iterable, key: WindowKey) -> Optional[int]:
+    """The slot (rows with .id / .start_time / .end_time) whose window on the key's start day is the key's window."""
+    _mission_id, start_at, end_at = key
+    for slot in slots:
+        if slot.start_time == start_at.time() and Assignment.window_for(
+            slot.start_time, slot.end_time, start_at.date()
+        ) == (start_at, end_at):
+            return slot.id
+    return None
+
+
+def window_ids(db: Session, keys: Iterable[WindowKey], missions: Optional[Iterable] = None) -> Dict[WindowKey, int]:
+    """
+    Window id per key, creating the missing windows (one select, plus one
+    batched insert when any is missing). `missions` (rows with .id and .slots,
+    e.g. the planner snapshot) resolves slot_id for new windows; without it
+    the slots of their missions are read.
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+    starts = [k[1] for k in keys]
+    existing = db.execute(
+        select(MissionWindow.id, MissionWindow.mission_id, MissionWindow.start_at, MissionWindow.end_at).where(
+            MissionWindow.mission_id.in_({k[0] for k in keys}),
+            MissionWindow.start_at >= min(starts),
+            MissionWindow.start_at <= max(starts),
+        )
+    ).all()
+    out = {(m_id, s, e): w_id for w_id, m_id, s, e in existing if (m_id, s, e) in keys}
+
+    missing = sorted(keys - out.keys())
+    if missing:
+        slots_by_mission: Dict[int, list] = {}
+        if missions is not None:
+            for m in missions:
+                slots_by_mission[m.id] = list(m.slots)
+        else:
+            for slot in db.execute(
+                select(MissionSlot).where(MissionSlot.mission_id.in_({k[0] for k in missing}))
+            ).scalars():
+                slots_by_mission.setdefault(slot.mission_id, []).append(slot)
+        writer = BulkInserter(db, MissionWindow, returning="id")
+        for key in missing:
+            writer.add(
+                mission_id=key[0],
+                slot_id=_slot_id(slots_by_mission.get(key[0], ()), key),
+                start_at=key[1],
+                end_at=key[2],
+            )
+        writer.flush()
+        out.update(zip(missing, writer.returned))
+    return out
+
+
+def link_windows(db: Session, start_at: Optional[datetime], end_at: Optional[datetime]) -> None:
+    """
+    Point the assignments starting in [start_at, end_at) (None: unbounded) that
+    have no window_id yet at their window, for bulk writers that insert without
+    one. Call in the same transaction as the write.
+    """
+    conds = [Assignment.window_id.is_(None)]
+    if start_at is not None:
+        conds.append(Assignment.start_at >= start_at)
+    if end_at is not None:
+        conds.append(Assignment.start_at < end_at)
+    unlinked = db.execute(
+        select(Assignment.mission_id, Assignment.start_at, Assignment.end_at).distinct().where(*conds)
+    ).all()
+    if not unlinked:
+        return
+    ids = window_ids(db, [tuple(r) for r in unlinked])
+    db.execute(
+        update(Assignment.__table__)
+        .where(and_(
+            Assignment.window_id.is_(None),
+            Assignment.mission_id == bindparam("k_mission_id"),
+            Assignment.start_at == bindparam("k_start_at"),
+            Assignment.end_at == bindparam("k_end_at"),
+        ))
+        .values(window_id=bindparam("k_window_id")),
+        [
+            {"k_mission_id": m_id, "k_start_at": s, "k_end_at": e, "k_window_id": w_id}
+            for (m_id, s, e), w_id in ids.items()
+        ],
+    )
+
+
+def relink_windows(db: Session, mission_id: int, dropped_slot_id: Optional[int] = None) -> None:
+    """
+    Re-derive slot_id of the mission's windows from its current slots after a
+    slot was edited, or before `dropped_slot_id` is deleted. Windows no slot
+    generates any more are detached (slot_id NULL) while assignments reference
+    them, and deleted otherwise; existing windows the edited slot now generates
+    are tied to it. Call in the same transaction as the slot write.
+    """
+    db.flush()
+    slots = db.execute(
+        select(MissionSlot).where(MissionSlot.mission_id == mission_id, MissionSlot.id != dropped_slot_id)
+    ).scalars().all()
+    windows = db.execute(
+        select(MissionWindow.id, MissionWindow.slot_id, MissionWindow.start_at, MissionWindow.end_at)
+        .where(MissionWindow.mission_id == mission_id)
+    ).all()
+    if not windows:
+        return
+    used = set(db.execute(
+        select(Assignment.window_id).distinct().where(Assignment.mission_id == mission_id)
+    ).scalars())
+
+    relinked: List[dict] = []
+    unused: List[int] = []
+    for w_id, slot_id, start_at, end_at in windows:
+        new_slot_id = _slot_id(slots, (mission_id, start_at, end_at))
+        if new_slot_id == slot_id:
+            continue
+        if new_slot_id is None and w_id not in used:
+            unused.append(w_id)
+        else:
+            relinked.append({"k_id": w_id, "k_slot_id": new_slot_id})
+
+    if relinked:
+        db.execute(
+            update(MissionWindow.__table__)
+            .where(MissionWindow.id == bindparam("k_id"))
+            .values(slot_id=bindparam("k_slot_id")),
+            relinked,
+        )
+    if unused:
+        db.execute(delete(MissionWindow).where(MissionWindow.id.in_(unused)))
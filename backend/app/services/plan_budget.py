@@ -0,0 +1,59 @@
+# backend/app/services/plan_budget.py
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+
+class PlanBudget:
+    """
+    Stop signal for one anytime fill: an optional wall-clock budget plus an
+    optional `interrupt()` probe (client disconnected, job cancelled).
+
+    The probe may be expensive (a hop to the event loop, a DB read), so it is
+    polled at most every `poll_s` seconds and a positive answer is sticky. A
+    probe may also raise to abort the fill outright (see JobProgress.check).
+    """
+
+    def __init__(
+        self,
+        budget_ms: Optional[int] = None,
+        interrupt: Optional[Callable[[], bool]] = None,
+        interrupt_reason: str = "disconnected",
+        poll_s: float = 0.05,
+    ):
+        self.started = time.perf_counter()
+        self.deadline = self.started + budget_ms / 1000.0 if budget_ms else None
+        self.budget_ms = budget_ms
+        self._interrupt = interrupt
+        self._interrupt_reason = interrupt_reason
+        self._poll_s = poll_s
+        self._next_poll = self.started
+        self._interrupted = False
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def remaining_ms(self) -> Optional[float]:
+        """Milliseconds left (never negative), or None without a budget."""
+        if self.deadline is None:
+            return None
+        return max(0.0, (self.deadline - time.perf_counter()) * 1000.0)
+
+    def interrupted(self) -> bool:
+        """The (throttled) interrupt probe alone; the deadline is not checked."""
+        if self._interrupt is not None and not self._interrupted:
+            now = time.perf_counter()
+            if now >= self._next_poll:
+                self._next_poll = now + self._poll_s
+                self._interrupted = bool(self._interrupt())
+        return self._interrupted
+
+    def stop_reason(self) -> Optional[str]:
+        """"deadline", the interrupt reason, or None while planning may go on."""
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return "deadline"
+        return self._interrupt_reason if self.interrupted() else None
+
+    def should_stop(self) -> bool:
+        return self.stop_reason() is not None
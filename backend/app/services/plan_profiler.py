@@ -0,0 +1,122 @@
+# backend/app/services/plan_profiler.py
+from __future__ import annotations
+
+import time
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+
+Clock = Tuple[float, float]
+
+# Metrics hooks get (name, report) after every profiled planner run, e.g.
+# ("plan.fill", {...}). Besides the runs asked with profile=true, a registered
+# hook gets one fill in METRICS_SAMPLE_EVERY profiled for it (metrics_sample_due);
+# the other fills still do no timing.
+METRICS_SAMPLE_EVERY = 50
+
+_metrics_hooks: List[Callable[[str, dict], None]] = []
+_metrics_calls = count()
+
+
+def add_metrics_hook(hook: Callable[[str, dict], None]) -> None:
+    if hook not in _metrics_hooks:
+        _metrics_hooks.append(hook)
+
+
+def remove_metrics_hook(hook: Callable[[str, dict], None]) -> None:
+    if hook in _metrics_hooks:
+        _metrics_hooks.remove(hook)
+
+
+def metrics_hooks_active() -> bool:
+    return bool(_metrics_hooks)
+
+
+def metrics_sample_due() -> bool:
+    """Whether to profile this run for the metrics hooks: one call in METRICS_SAMPLE_EVERY while any is registered."""
+    return bool(_metrics_hooks) and next(_metrics_calls) % METRICS_SAMPLE_EVERY == 0
+
+
+def emit_metrics(name: str, report: dict) -> None:
+    for hook in list(_metrics_hooks):
+        try:
+            hook(name, report)
+        except Exception as e:
+            # A broken exporter must not fail the request
+            print(f"[WARN] metrics hook failed: {e}")
+
+
+class _Timing:
+    __slots__ = ("wall", "cpu", "calls")
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+
+    def as_dict(self) -> dict:
+        return {"wall_ms": round(self.wall * 1000.0, 3), "cpu_ms": round(self.cpu * 1000.0, 3), "calls": self.calls}
+
+
+class PlanProfiler:
+    """
+    Wall/CPU time and call counts per planner phase and per candidate-scoring
+    term, plus candidate counters (scored, rejected per hard constraint).
+
+    Only created for profiled runs; the planner checks `prof is not None` at
+    phase boundaries and the candidate collectors take it as an optional
+    argument, so an unprofiled fill does no timing at all. CPU time is the
+    calling thread's.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, _Timing] = {}
+        self.terms: Dict[str, _Timing] = {}
+        self.candidates_scored = 0
+        self.rejected: Dict[str, int] = {}
+
+    @staticmethod
+    def clock() -> Clock:
+        return time.perf_counter(), time.thread_time()
+
+    def add_phase(self, name: str, started: Clock) -> None:
+        self._add(self.phases, name, started)
+
+    def add_term(self, name: str, started: Clock) -> None:
+        self._add(self.terms, name, started)
+
+    def _add(self, table: Dict[str, _Timing], name: str, started: Clock) -> None:
+        wall, cpu = self.clock()
+        t = table.get(name)
+        if t is None:
+            t = table[name] = _Timing()
+        t.wall += wall - started[0]
+        t.cpu += cpu - started[1]
+        t.calls += 1
+
+    def reject(self, reason: str, n: int = 1) -> None:
+        if n:
+            self.rejected[reason] = self.rejected.get(reason, 0) + n
+
+    def merge(self, other: Optional["PlanProfiler"]) -> None:
+        """Add another profile (e.g. from a candidate worker process) into this one."""
+        if other is None:
+            return
+        for mine, theirs in ((self.phases, other.phases), (self.terms, other.terms)):
+            for name, t in theirs.items():
+                m = mine.get(name)
+                if m is None:
+                    m = mine[name] = _Timing()
+                m.wall += t.wall
+                m.cpu += t.cpu
+                m.calls += t.calls
+        self.candidates_scored += other.candidates_scored
+        for reason, n in other.rejected.items():
+            self.reject(reason, n)
+
+    def report(self) -> dict:
+        return {
+            "phases": {name: t.as_dict() for name, t in self.phases.items()},
+            "terms": {name: t.as_dict() for name, t in self.terms.items()},
+            "candidates_scored": self.candidates_scored,
+            "rejected": dict(self.rejected),
+        }
@@ -0,0 +1,90 @@
+# backend/app/services/planner_cache.py
+from __future__ import annotations
+
+import threading
+from datetime import time
+from typing import Callable, Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+# Plain-tuple mirrors of the ORM rows the planner reads. They expose the same
+# attribute names (m.slots, r.role.name, s.roles, ...) so planner code works on
+# either, and they pickle cheaply for the candidate process pool.
+
+class RoleRow(NamedTuple):
+    id: int
+    name: str
+
+class SlotRow(NamedTuple):
+    id: int
+    start_time: time
+    end_time: time
+
+class RequirementRow(NamedTuple):
+    role_id: int
+    count: int
+    role: Optional[RoleRow]
+
+class MissionRow(NamedTuple):
+    id: int
+    name: str
+    total_needed: Optional[int]
+    slots: Tuple[SlotRow, ...]
+    requirements: Tuple[RequirementRow, ...]
+
+class SoldierRow(NamedTuple):
+    id: int
+    name: str
+    restrictions: Optional[str]
+    roles: Tuple[RoleRow, ...]
+
+class PlannerSnapshot(NamedTuple):
+    version: int
+    missions: Tuple[MissionRow, ...]
+    soldiers: Tuple[SoldierRow, ...]
+    soldiers_by_role: Dict[int, Tuple[SoldierRow, ...]]
+    restricted_pairs: FrozenSet[Tuple[int, int]]
+    friends_map: Dict[int, FrozenSet[int]]
+    not_friends_map: Dict[int, FrozenSet[int]]
+
+
+_lock = threading.Lock()
+_version = 0
+_snapshot: Optional[PlannerSnapshot] = None
+
+
+def planner_version() -> int:
+    return _version
+
+
+def bump_planner_version() -> None:
+    """
+    Invalidate the cached planner context. Call after committing any write to
+    soldiers, soldier roles, roles, missions, mission slots, requirements,
+    friendships or restrictions.
+    """
+    global _version
+    with _lock:
+        _version += 1
+
+
+def get_planner_snapshot(db: Session, build: Callable[[Session, int], PlannerSnapshot]) -> PlannerSnapshot:
+    """
+    Return the cached snapshot, rebuilding it with `build(db, version)` only when
+    the version moved since it was built. The cache is per process: writes made
+    outside the API (scripts, another server process) are not seen until the
+    next bump or restart.
+    """
+    global _snapshot
+    with _lock:
+        version = _version
+        snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    snapshot = build(db, version)
+    with _lock:
+        # A write that raced the build leaves the version ahead, so the next call rebuilds
+        if _snapshot is None or snapshot.version >= _snapshot.version:
+            _snapshot = snapshot
+    return snapshot
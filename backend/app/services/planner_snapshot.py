@@ -0,0 +1,134 @@
+# backend/app/services/planner_snapshot.py
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.mission import Mission
+from app.models.mission_requirement import MissionRequirement
+from app.models.soldier import Soldier
+from app.models.soldier_friendship import SoldierFriendship
+from app.models.soldier_mission_restriction import SoldierMissionRestriction
+from app.models.soldier_restriction_index import SoldierRestrictionIndex
+from app.services.planner_cache import (
+    MissionRow,
+    PlannerSnapshot,
+    RequirementRow,
+    RoleRow,
+    SlotRow,
+    SoldierRow,
+    get_planner_snapshot,
+)
+
+
+def _build_restricted_pairs(db: Session) -> set[tuple[int, int]]:
+    """
+    Build a set of (soldier_id, mission_id) pairs that are restricted.
+    Reads both:
+    1. soldier_mission_restrictions table
+    2. soldier_restriction_index (compiled from the soldiers.restrictions string on write)
+    """
+    rows = db.execute(
+        union(
+            select(SoldierMissionRestriction.soldier_id, SoldierMissionRestriction.mission_id),
+            select(SoldierRestrictionIndex.soldier_id, SoldierRestrictionIndex.mission_id),
+        )
+    ).all()
+    return {(sid, mid) for sid, mid in rows}
+
+
+def _build_friendship_maps(
+    db: Session,
+    soldiers: List[Soldier]
+) -> tuple[Dict[int, set[int]], Dict[int, set[int]]]:
+    """
+    Build maps of:
+    - friends_map: soldier_id -> set of friend_ids (status='friend')
+    - not_friends_map: soldier_id -> set of not_friend_ids (status='not_friend')
+    """
+    friendships = db.execute(
+        select(SoldierFriendship)
+    ).scalars().all()
+    
+    friends_map: Dict[int, set[int]] = {}
+    not_friends_map: Dict[int, set[int]] = {}
+    
+    for f in friendships:
+        if f.status == 'friend':
+            friends_map.setdefault(f.soldier_id, set()).add(f.friend_id)
+        elif f.status == 'not_friend':
+            not_friends_map.setdefault(f.soldier_id, set()).add(f.friend_id)
+    
+    return friends_map, not_friends_map
+
+
+def _load_context(db: Session) -> dict:
+    missions: List[Mission] = db.execute(
+        select(Mission).options(
+            selectinload(Mission.slots),
+            selectinload(Mission.requirements).selectinload(MissionRequirement.role),
+        )
+    ).scalars().all()
+
+    soldiers: List[Soldier] = db.execute(
+        select(Soldier).options(selectinload(Soldier.roles))
+    ).scalars().all()
+
+    soldiers_by_role: Dict[int, List[Soldier]] = {}
+    for s in soldiers:
+        for r in s.roles:
+            soldiers_by_role.setdefault(r.id, []).append(s)
+
+    return {
+        "missions": missions,
+        "soldiers_by_role": soldiers_by_role,
+        "all_soldiers": soldiers,  # new: pool for generic slots
+    }
+
+
+def build_planner_snapshot(db: Session, version: int) -> PlannerSnapshot:
+    """Load the planner context from the DB and freeze it into plain tuples (see planner_cache)."""
+    ctx = _load_context(db)
+
+    def role_row(r) -> Optional[RoleRow]:
+        return RoleRow(r.id, r.name) if r is not None else None
+
+    missions = tuple(
+        MissionRow(
+            id=m.id,
+            name=m.name,
+            total_needed=m.total_needed,
+            slots=tuple(SlotRow(sl.id, sl.start_time, sl.end_time) for sl in m.slots),
+            requirements=tuple(RequirementRow(r.role_id, r.count, role_row(r.role)) for r in (m.requirements or [])),
+        )
+        for m in ctx["missions"]
+    )
+    soldier_rows = {
+        s.id: SoldierRow(s.id, s.name, s.restrictions, tuple(role_row(r) for r in s.roles))
+        for s in ctx["all_soldiers"]
+    }
+
+    # Build restricted pairs from the explicit table and the compiled string index
+    restricted_pairs = _build_restricted_pairs(db)
+
+    # Build friendship maps
+    friends_map, not_friends_map = _build_friendship_maps(db, ctx["all_soldiers"])
+
+    return PlannerSnapshot(
+        version=version,
+        missions=missions,
+        soldiers=tuple(soldier_rows[s.id] for s in ctx["all_soldiers"]),
+        soldiers_by_role={
+            role_id: tuple(soldier_rows[s.id] for s in lst) for role_id, lst in ctx["soldiers_by_role"].items()
+        },
+        restricted_pairs=frozenset(restricted_pairs),
+        friends_map={k: frozenset(v) for k, v in friends_map.items()},
+        not_friends_map={k: frozenset(v) for k, v in not_friends_map.items()},
+    )
+
+
+def planner_snapshot(db: Session) -> PlannerSnapshot:
+    """Missions/soldiers, restrictions and friendships from the versioned planner cache (rebuilt only after a write)."""
+    return get_planner_snapshot(db, build_planner_snapshot)
@@ -0,0 +1,40 @@
+# backend/app/services/query_counter.py
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db import engine as default_engine
+
+
+class QueryCounter:
+    """Statements sent to the database while a `count_queries` block is open (an executemany counts once)."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(bind: Optional[Engine] = None) -> Iterator[QueryCounter]:
+    """
+    Count the statements executed on `bind` (the app engine by default):
+
+        with count_queries() as q:
+            client.post("/plan/fill", json={...})
+        assert q.count <= BUDGET, q.statements
+    """
+    target = bind if bind is not None else default_engine
+    counter = QueryCounter()
+    event.listen(target, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", counter._on_execute)
@@ -0,0 +1,106 @@
+# backend/app/services/rest_index.py
+from __future__ import annotations
+
+from bisect import bisect_right, insort
+from datetime import datetime
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+
+def _remove(sorted_list: List[float], value: float) -> None:
+    i = bisect_right(sorted_list, value) - 1
+    if i >= 0 and sorted_list[i] == value:
+        del sorted_list[i]
+
+
+class RestIndex:
+    """
+    Running aggregates of every soldier's `last_end_at` for the rest-equality term.
+
+    For a candidate window starting at `t`, the rest of soldier i is
+        (t - last_end_i) - vacation seconds inside [last_end_i, t]
+    and soldiers whose last end is after `t` are ignored. Both parts are sums of
+    piecewise-linear functions of `t`, so they come from sorted arrays plus
+    prefix sums:
+      - sum over last_end <= t of (t - last_end)
+      - minus each vacation block clipped to start at last_end, as a ramp that
+        grows from its start to its end.
+    Queries are O(log N). Updates keep the sorted arrays current and rebuild the
+    prefix sums lazily on the next query.
+    """
+
+    def __init__(self, ref: datetime, vacation_blocks: Dict[int, List[tuple[datetime, datetime]]]):
+        self.ref = ref
+        self._vac = {
+            sid: [((bs - ref).total_seconds(), (be - ref).total_seconds()) for bs, be in blocks]
+            for sid, blocks in vacation_blocks.items()
+        }
+        self._last: Dict[Optional[int], float] = {}
+        self._ends: List[float] = []
+        self._ramp_starts: List[float] = []
+        self._ramp_ends: List[float] = []
+        self._prefix: Optional[tuple[List[float], List[float], List[float]]] = None
+
+    @classmethod
+    def from_stats(cls, stats_by_soldier: Dict, vacation_blocks, ref: datetime) -> "RestIndex":
+        idx = cls(ref, vacation_blocks)
+        for sid, st in stats_by_soldier.items():
+            idx.set_last_end(sid, st.last_end_at)
+        return idx
+
+    def _ramps(self, sid: Optional[int], last: float) -> List[tuple[float, float]]:
+        out = []
+        for bs, be in self._vac.get(sid, []):
+            a = max(bs, last)
+            if be > a:
+                out.append((a, be))
+        return out
+
+    def set_last_end(self, soldier_id: Optional[int], last_end_at: Optional[datetime]) -> None:
+        """Replace a soldier's contribution (call whenever `last_end_at` changes)."""
+        old = self._last.pop(soldier_id, None)
+        if old is not None:
+            _remove(self._ends, old)
+            for a, e in self._ramps(soldier_id, old):
+                _remove(self._ramp_starts, a)
+                _remove(self._ramp_ends, e)
+        if last_end_at is not None:
+            new = (last_end_at - self.ref).total_seconds()
+            self._last[soldier_id] = new
+            insort(self._ends, new)
+            for a, e in self._ramps(soldier_id, new):
+                insort(self._ramp_starts, a)
+                insort(self._ramp_ends, e)
+        self._prefix = None
+
+    def _prefixes(self) -> tuple[List[float], List[float], List[float]]:
+        if self._prefix is None:
+            self._prefix = tuple(
+                [0.0] + list(accumulate(values)) for values in (self._ends, self._ramp_starts, self._ramp_ends)
+            )
+        return self._prefix
+
+    def totals(self, start_at: datetime) -> tuple[float, int]:
+        """(sum of rest hours, number of soldiers) over soldiers whose last end is <= start_at."""
+        t = (start_at - self.ref).total_seconds()
+        p_ends, p_starts, p_ramp_ends = self._prefixes()
+
+        n = bisect_right(self._ends, t)
+        rest = n * t - p_ends[n]
+
+        k = bisect_right(self._ramp_starts, t)
+        vac = k * t - p_starts[k]
+        j = bisect_right(self._ramp_ends, t)
+        vac -= j * t - p_ramp_ends[j]
+
+        return (rest - vac) / 3600.0, n
+
+    def average_excluding(self, start_at: datetime, own_rest_hours: Optional[float]) -> Optional[float]:
+        """Average rest of all other soldiers at `start_at`, or None if there are none."""
+        total, count = self.totals(start_at)
+        if own_rest_hours is not None and own_rest_hours >= 0:
+            total -= own_rest_hours
+            count -= 1
+        if count <= 0:
+            return None
+        return total / count
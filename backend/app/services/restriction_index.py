@@ -0,0 +1,75 @@
+# backend/app/services/restriction_index.py
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.mission import Mission
+from app.models.soldier import Soldier
+from app.models.soldier_restriction_index import SoldierRestrictionIndex
+
+
+def normalize_mission_name(name: str) -> str:
+    """Normalize mission name for comparison (lowercase, trim)."""
+    return name.lower().strip()
+
+
+def parse_restrictions(restrictions: Optional[str]) -> List[str]:
+    """Split a restrictions string by comma/semicolon into normalized mission names."""
+    if not restrictions:
+        return []
+    return [normalize_mission_name(x) for x in restrictions.replace(';', ',').split(',') if x.strip()]
+
+
+def _mission_ids_by_name(db: Session) -> Dict[str, List[int]]:
+    by_name: Dict[str, List[int]] = {}
+    for m_id, name in db.execute(select(Mission.id, Mission.name)).all():
+        by_name.setdefault(normalize_mission_name(name), []).append(m_id)
+    return by_name
+
+
+def compile_soldier_restrictions(db: Session, soldier_id: int, restrictions: Optional[str]) -> None:
+    """Replace one soldier's keys from their restrictions string (call in the same transaction as the write)."""
+    db.execute(delete(SoldierRestrictionIndex).where(SoldierRestrictionIndex.soldier_id == soldier_id))
+    names = set(parse_restrictions(restrictions))
+    if not names:
+        return
+    by_name = _mission_ids_by_name(db)
+    rows = [
+        {"soldier_id": soldier_id, "mission_id": m_id}
+        for name in names
+        for m_id in by_name.get(name, [])
+    ]
+    if rows:
+        db.execute(insert(SoldierRestrictionIndex), rows)
+
+
+def compile_mission_restrictions(db: Session, mission_id: int, name: str) -> None:
+    """Replace one mission's keys after it is created or renamed."""
+    db.execute(delete(SoldierRestrictionIndex).where(SoldierRestrictionIndex.mission_id == mission_id))
+    wanted = normalize_mission_name(name)
+    rows = [
+        {"soldier_id": s_id, "mission_id": mission_id}
+        for s_id, restrictions in db.execute(
+            select(Soldier.id, Soldier.restrictions).where(Soldier.restrictions != "")
+        ).all()
+        if wanted in parse_restrictions(restrictions)
+    ]
+    if rows:
+        db.execute(insert(SoldierRestrictionIndex), rows)
+
+
+def rebuild_restriction_index(db: Session) -> None:
+    """Recompile every key (bulk imports touching many soldiers or missions)."""
+    db.execute(delete(SoldierRestrictionIndex))
+    by_name = _mission_ids_by_name(db)
+    rows = []
+    for s_id, restrictions in db.execute(
+        select(Soldier.id, Soldier.restrictions).where(Soldier.restrictions != "")
+    ).all():
+        for name in set(parse_restrictions(restrictions)):
+            rows.extend({"soldier_id": s_id, "mission_id": m_id} for m_id in by_name.get(name, []))
+    if rows:
+        db.execute(insert(SoldierRestrictionIndex), rows)
@@ -0,0 +1,246 @@
+# backend/app/services/vector_scoring.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.services.rest_index import RestIndex
+from app.services.warnings_engine import EIGHT_HOURS, NEAR_EIGHT
+
+# planning.EIGHT_HOURS / _is_near_8h_rest (8h ± tolerance), in seconds
+EIGHT_HOURS_S = EIGHT_HOURS.total_seconds()
+NEAR_8H_TOLERANCE_S = NEAR_EIGHT.total_seconds()
+
+BUCKETS = ("MORNING", "EVENING", "NIGHT")
+
+
+def _slot_bucket(dt: datetime) -> str:
+    h = dt.hour
+    if 6 <= h < 14:
+        return "MORNING"
+    if 14 <= h < 22:
+        return "EVENING"
+    return "NIGHT"
+
+
+class VectorScorer:
+    """
+    Columnar copy of the planner state used by `_score_candidate`.
+
+    Every soldier (plus any id that only appears in the stats, e.g. unassigned
+    rows with soldier_id NULL) gets a row. Times are stored as float seconds
+    relative to `ref` (the planning day start) so comparisons stay exact for
+    minute-aligned windows. `score()` returns the same values as calling
+    `_score_candidate` for each row, computed in one pass over the pool; the
+    rest-equality average comes from the shared `RestIndex`.
+    """
+
+    def __init__(
+        self,
+        soldier_ids: Iterable[Optional[int]],
+        stats_by_soldier: Dict,
+        vacation_blocks: Dict[int, List[tuple[datetime, datetime]]],
+        pair_counts: Dict[int, Dict[int, int]],
+        friends_map: Dict[int, set[int]],
+        not_friends_map: Dict[int, set[int]],
+        weights: Dict[str, float],
+        ref: datetime,
+        rest_index: Optional[RestIndex] = None,
+    ):
+        ids: List[Optional[int]] = []
+        seen: set = set()
+        for sid in list(soldier_ids) + list(stats_by_soldier.keys()):
+            if sid not in seen:
+                seen.add(sid)
+                ids.append(sid)
+
+        self.ids = ids
+        self.row_of: Dict[Optional[int], int] = {sid: i for i, sid in enumerate(ids)}
+        self.weights = weights
+        self.ref = ref
+        self.rest_index = rest_index
+        n = len(ids)
+
+        self.last_end = np.full(n, np.nan)
+        self.second_last_end = np.full(n, np.nan)
+        self.today_count = np.zeros(n)
+        self.total_hours = np.zeros(n)
+        self.bucket_count = {b: np.zeros(n) for b in BUCKETS}
+        self._mission_count: Dict[int, np.ndarray] = {}
+        self._stats = stats_by_soldier
+
+        for sid, st in stats_by_soldier.items():
+            self._load_row(self.row_of[sid], st)
+
+        # Vacation blocks, NaN-padded to the widest soldier
+        width = max([len(v) for v in vacation_blocks.values()] + [1])
+        self.vac_start = np.full((n, width), np.nan)
+        self.vac_end = np.full((n, width), np.nan)
+        for sid, blocks in vacation_blocks.items():
+            r = self.row_of.get(sid)
+            if r is None:
+                continue
+            for k, (bs, be) in enumerate(blocks):
+                self.vac_start[r, k] = self._secs(bs)
+                self.vac_end[r, k] = self._secs(be)
+
+        # Dense pair / friendship matrices (rows x rows)
+        self.pairs = np.zeros((n, n))
+        for sid, fellows in pair_counts.items():
+            r = self.row_of.get(sid)
+            if r is None:
+                continue
+            for fid, c in fellows.items():
+                fr = self.row_of.get(fid)
+                if fr is not None:
+                    self.pairs[r, fr] = c
+        self.friends = self._relation_matrix(friends_map)
+        self.not_friends = self._relation_matrix(not_friends_map)
+
+    # ---- state -------------------------------------------------------------
+
+    def _secs(self, dt: Optional[datetime]) -> float:
+        if dt is None:
+            return np.nan
+        return (dt - self.ref).total_seconds()
+
+    def _relation_matrix(self, relation: Dict[int, set[int]]) -> np.ndarray:
+        m = np.zeros((len(self.ids), len(self.ids)), dtype=bool)
+        for sid, others in (relation or {}).items():
+            r = self.row_of.get(sid)
+            if r is None:
+                continue
+            for oid in others:
+                o = self.row_of.get(oid)
+                if o is not None:
+                    m[r, o] = True
+        return m
+
+    def _load_row(self, r: int, st) -> None:
+        self.last_end[r] = self._secs(st.last_end_at)
+        self.second_last_end[r] = self._secs(st.second_last_end_at)
+        self.today_count[r] = st.today_count
+        self.total_hours[r] = st.total_hours_window
+        for b in BUCKETS:
+            self.bucket_count[b][r] = st.slot_bucket_count.get(b, 0)
+        for mid, col in self._mission_count.items():
+            col[r] = st.mission_count.get(mid, 0)
+
+    def sync(self, soldier_id: Optional[int], st) -> None:
+        """Refresh one soldier's row after `_update_stats_after_assignment`."""
+        r = self.row_of.get(soldier_id)
+        if r is not None:
+            self._load_row(r, st)
+
+    def _mission_col(self, mission_id: int) -> np.ndarray:
+        col = self._mission_count.get(mission_id)
+        if col is None:
+            col = np.zeros(len(self.ids))
+            for sid, st in self._stats.items():
+                col[self.row_of[sid]] = st.mission_count.get(mission_id, 0)
+            self._mission_count[mission_id] = col
+        return col
+
+    def rows_for(self, soldier_ids: Iterable[Optional[int]]) -> np.ndarray:
+        return np.fromiter((self.row_of[sid] for sid in soldier_ids), dtype=np.intp)
+
+    # ---- scoring -----------------------------------------------------------
+
+    def _rest_gap(self, prev_end: np.ndarray, until: np.ndarray | float, rows: np.ndarray) -> np.ndarray:
+        """Vectorized `_calculate_rest_gap` in seconds (vacation time is not rest)."""
+        gap = until - prev_end
+        bs = self.vac_start[rows]
+        be = self.vac_end[rows]
+        lo = np.maximum(prev_end[:, None], bs)
+        hi = np.minimum(np.broadcast_to(np.asarray(until, dtype=float), prev_end.shape)[:, None], be)
+        overlap = np.where(hi > lo, hi - lo, 0.0)
+        vac = overlap.sum(axis=1)
+        return np.where(vac > 0, np.maximum(0.0, gap - vac), gap)
+
+    @staticmethod
+    def _near_8h(gap: np.ndarray) -> np.ndarray:
+        return (gap >= EIGHT_HOURS_S - NEAR_8H_TOLERANCE_S) & (gap <= EIGHT_HOURS_S + NEAR_8H_TOLERANCE_S)
+
+    def score(
+        self,
+        rows: np.ndarray,
+        mission_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        assigned_here: set[int],
+    ) -> np.ndarray:
+        w = self.weights
+        start = self._secs(start_at)
+        score = np.zeros(len(rows))
+
+        last = self.last_end[rows]
+        has_last = ~np.isnan(last)
+
+        # 1) Rest from last assignment (vacation-adjusted)
+        gap = self._rest_gap(last, start, rows)
+        overlap = has_last & (gap < 0)
+        short = has_last & (gap >= 0) & (gap < EIGHT_HOURS_S)
+        near = has_last & (gap >= EIGHT_HOURS_S) & self._near_8h(gap)
+        extra = has_last & (gap >= EIGHT_HOURS_S) & ~near
+
+        score = score + np.where(
+            overlap, w["recent_gap_penalty_per_hour_missing"] * (8.0 + np.abs(gap) / 3600.0), 0.0
+        )
+        score = score + np.where(
+            short, w["recent_gap_penalty_per_hour_missing"] * ((EIGHT_HOURS_S - gap) / 3600.0), 0.0
+        )
+        score = score + np.where(near, w.get("rest_warning_penalty", 2.0), 0.0)
+
+        second = self.second_last_end[rows]
+        prev_gap = self._rest_gap(second, last, rows)
+        double = near & ~np.isnan(second) & self._near_8h(prev_gap)
+        score = score + np.where(double, w.get("rest_warning_double_penalty", 5.0), 0.0)
+        score = score + np.where(extra, w["recent_gap_boost_per_hour"] * ((gap - EIGHT_HOURS_S) / 3600.0), 0.0)
+
+        # Prefer shorter slots when a REST warning is unavoidable
+        duration_hours = (end_at - start_at).total_seconds() / 3600.0
+        score = score + np.where(
+            near, w.get("short_slot_preference_for_rest", -1.0) * (12.0 - duration_hours), 0.0
+        )
+
+        # Rest equality: deviation from the average rest of every other soldier
+        if self.rest_index is not None:
+            total, count = self.rest_index.totals(start_at)
+            rest_hours = gap / 3600.0
+            own_valid = has_last & (gap >= 0)
+            others_sum = total - np.where(own_valid, rest_hours, 0.0)
+            others_cnt = count - own_valid
+            with np.errstate(invalid="ignore", divide="ignore"):
+                avg_rest = others_sum / others_cnt
+            rest_diff = np.abs(rest_hours - avg_rest)
+            score = score + np.where(
+                has_last & (others_cnt > 0), w.get("rest_equality_penalty_per_hour_diff", 0.5) * rest_diff, 0.0
+            )
+
+        score = score + np.where(~has_last, w["recent_gap_boost_per_hour"] * 4.0, 0.0)
+
+        # 2) Rotation: same mission / same time bucket
+        count_m = self._mission_col(mission_id)[rows]
+        repeat = count_m > 0
+        score = score + np.where(repeat, w["same_mission_recent_penalty"], 0.0)
+        score = score + np.where(repeat, w["mission_repeat_count_penalty"] * count_m, 0.0)
+
+        bucket_count = self.bucket_count[_slot_bucket(start_at)][rows]
+        score = score + np.where(bucket_count > 0, w.get("slot_repeat_count_penalty", 0.75) * bucket_count, 0.0)
+
+        # Co-assignment and friendship terms against soldiers already in this window
+        for fellow_id in assigned_here:
+            f = self.row_of.get(fellow_id)
+            if f is None:
+                continue
+            c = self.pairs[rows, f]
+            score = score + np.where(c > 0, w.get("coassignment_repeat_penalty", 0.5) * c, 0.0)
+            score = score + np.where(self.friends[rows, f], w.get("friend_preference_bonus", -1.5), 0.0)
+            score = score + np.where(self.not_friends[rows, f], w.get("not_friend_penalty", 3.0), 0.0)
+
+        # 3) Intra-day load, 4) recent workload
+        score = score + w["today_assignment_count_penalty"] * self.today_count[rows]
+        score = score + w["total_hours_window_penalty_per_hour"] * self.total_hours[rows]
+        return score
@@ -0,0 +1,160 @@
+# backend/app/services/warning_store.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, insert, or_, select, union
+from sqlalchemy.orm import Session, aliased
+
+from app.models.assignment import Assignment
+from app.models.plan_warning import PlanWarning
+from app.models.soldier_friendship import SoldierFriendship
+from app.models.soldier_mission_restriction import SoldierMissionRestriction
+from app.models.soldier_restriction_index import SoldierRestrictionIndex
+from app.schemas.warnings import WarningItem
+from app.services.warnings_engine import LOOKBACK, RawWarning, find_warnings, render_warnings
+
+
+def store_warnings(
+    db: Session,
+    warnings: Iterable[RawWarning],
+    range_start: Optional[datetime],
+    range_end: Optional[datetime],
+    soldier_ids: Optional[AbstractSet[int]] = None,
+) -> None:
+    """
+    Replace the stored warnings of the assignments starting in [range_start,
+    range_end) (None: unbounded) with `warnings`, found over the same range.
+    With `soldier_ids` only those soldiers' warnings are replaced, plus the
+    NOT_FRIENDS warnings of other soldiers that name one of them.
+    """
+    conds = []
+    if range_start is not None:
+        conds.append(PlanWarning.start_at >= range_start)
+    if range_end is not None:
+        conds.append(PlanWarning.start_at < range_end)
+    if soldier_ids is not None:
+        conds.append(or_(PlanWarning.soldier_id.in_(soldier_ids), PlanWarning.fellow_id.in_(soldier_ids)))
+        warnings = [w for w in warnings if w.soldier_id in soldier_ids or w.fellow_id in soldier_ids]
+    db.execute(delete(PlanWarning).where(*conds))
+    rows = [w._asdict() for w in warnings]
+    if rows:
+        db.execute(insert(PlanWarning.__table__), rows)
+
+
+def _load_pairs(
+    db: Session,
+    soldier_ids: Optional[AbstractSet[int]],
+) -> Tuple[Set[Tuple[int, int]], Dict[int, Set[int]]]:
+    """Restricted (soldier, mission) pairs and not-friend lists, limited to pairs involving `soldier_ids`."""
+    restricted_q = select(SoldierMissionRestriction.soldier_id, SoldierMissionRestriction.mission_id)
+    index_q = select(SoldierRestrictionIndex.soldier_id, SoldierRestrictionIndex.mission_id)
+    friends_q = select(SoldierFriendship.soldier_id, SoldierFriendship.friend_id).where(
+        SoldierFriendship.status == "not_friend"
+    )
+    if soldier_ids is not None:
+        restricted_q = restricted_q.where(SoldierMissionRestriction.soldier_id.in_(soldier_ids))
+        index_q = index_q.where(SoldierRestrictionIndex.soldier_id.in_(soldier_ids))
+        friends_q = friends_q.where(
+            or_(SoldierFriendship.soldier_id.in_(soldier_ids), SoldierFriendship.friend_id.in_(soldier_ids))
+        )
+    restricted = {(s_id, m_id) for s_id, m_id in db.execute(union(restricted_q, index_q)).all()}
+    not_friends: Dict[int, Set[int]] = {}
+    for s_id, f_id in db.execute(friends_q).all():
+        not_friends.setdefault(s_id, set()).add(f_id)
+    return restricted, not_friends
+
+
+def _refresh(
+    db: Session,
+    range_start: Optional[datetime],
+    range_end: Optional[datetime],
+    soldier_ids: Optional[Iterable[int]],
+) -> None:
+    db.flush()
+    ids = {s_id for s_id in soldier_ids if s_id is not None} if soldier_ids is not None else None
+    if ids is not None and not ids:
+        return
+
+    cols = (Assignment.id, Assignment.mission_id, Assignment.soldier_id, Assignment.start_at, Assignment.end_at)
+    conds = [Assignment.soldier_id.isnot(None)]
+    if range_start is not None:
+        conds.append(Assignment.start_at >= range_start - LOOKBACK)
+    if range_end is not None:
+        conds.append(Assignment.start_at < range_end)
+    if ids is not None:
+        conds.append(Assignment.soldier_id.in_(ids))
+    rows = list(db.execute(select(*cols).where(*conds)).all())
+
+    if ids is not None:
+        # Other soldiers sharing a window (shift instance) with theirs: needed for NOT_FRIENDS only
+        mine = aliased(Assignment)
+        shared = [
+            mine.soldier_id.in_(ids),
+            Assignment.soldier_id.isnot(None),
+            Assignment.soldier_id.notin_(ids),
+        ]
+        if range_start is not None:
+            shared.append(mine.start_at >= range_start)
+        if range_end is not None:
+            shared.append(mine.start_at < range_end)
+        rows.extend(db.execute(
+            select(*cols).distinct()
+            .join(mine, mine.window_id == Assignment.window_id)
+            .where(*shared)
+        ).all())
+
+    restricted, not_friends = _load_pairs(db, ids)
+    found = find_warnings(rows, range_start or datetime.min, range_end or datetime.max, restricted, not_friends)
+    store_warnings(db, found, range_start, range_end, ids)
+
+
+def refresh_warnings_for(
+    db: Session,
+    start_at: datetime,
+    end_at: datetime,
+    soldier_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """
+    Recompute the stored warnings after a write to assignments starting in
+    [start_at, end_at): for `soldier_ids` (the old and the new soldier of a
+    reassignment), or for everyone. Assignments up to LOOKBACK later are redone
+    too, since their rests run back into the changed ones. Call in the same
+    transaction as the write.
+    """
+    _refresh(db, start_at, end_at + LOOKBACK, soldier_ids)
+
+
+def refresh_soldier_warnings(db: Session, soldier_ids: Iterable[int]) -> None:
+    """Recompute every warning of these soldiers (their restrictions or friendships changed)."""
+    _refresh(db, None, None, soldier_ids)
+
+
+def rebuild_warnings(db: Session) -> None:
+    """Recompute the whole table (bulk imports; restrictions recompiled for everyone)."""
+    _refresh(db, None, None, None)
+
+
+def load_warnings(
+    db: Session,
+    range_start: datetime,
+    range_end: datetime,
+    soldier_names: Mapping[int, str],
+    mission_names: Mapping[int, str],
+) -> List[WarningItem]:
+    """Stored warnings of the assignments starting in [range_start, range_end), one indexed query."""
+    rows = db.execute(
+        select(
+            PlanWarning.type,
+            PlanWarning.level,
+            PlanWarning.assignment_id,
+            PlanWarning.soldier_id,
+            PlanWarning.mission_id,
+            PlanWarning.start_at,
+            PlanWarning.end_at,
+            PlanWarning.details,
+            PlanWarning.fellow_id,
+        ).where(and_(PlanWarning.start_at >= range_start, PlanWarning.start_at < range_end))
+    ).all()
+    return render_warnings(rows, soldier_names, mission_names)
@@ -0,0 +1,196 @@
+# backend/app/services/warnings_engine.py
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import AbstractSet, Dict, Iterable, List, Mapping, NamedTuple, Optional, Protocol, Tuple
+
+from app.schemas.warnings import WarningItem
+
+# Minimum rest between two assignments of a soldier
+EIGHT_HOURS = timedelta(hours=8)
+# Treat "about 8 hours" as 8h ± this many minutes
+NEAR_EIGHT_MINUTES = 10
+NEAR_EIGHT = timedelta(minutes=NEAR_EIGHT_MINUTES)
+
+# Longest assignment: a slot window, at most one day (Assignment.window_for)
+MAX_ASSIGNMENT = timedelta(days=1)
+# Rows starting this long before a range are enough to compute the two previous
+# rests of every assignment in it: a rest that can still warn is at most
+# 8h + tolerance, and the assignments around it are at most MAX_ASSIGNMENT long.
+# Anything earlier can only produce longer rests, which never warn.
+LOOKBACK = 2 * (MAX_ASSIGNMENT + EIGHT_HOURS + NEAR_EIGHT)
+
+
+class WarningRow(Protocol):
+    """What the engine reads from an assignment (ORM row, planner AssignmentRow, ...)."""
+    id: Optional[int]  # None for planned rows not written yet
+    mission_id: int
+    soldier_id: Optional[int]
+    start_at: datetime
+    end_at: datetime
+
+
+def classify_rest(rest: timedelta, prev_rest: Optional[timedelta]) -> Optional[Tuple[str, str]]:
+    """
+    (type, level) for the rest before an assignment, given the rest before the
+    previous one, or None when it does not warn:
+    overlap (rest < 0) is OVERLAP/RED, a short rest (< 8h) OVERLAP/ORANGE, a rest
+    of ~8h (8h .. 8h + tolerance) REST/ORANGE, or REST/RED when the previous rest
+    was ~8h too (8h ± tolerance).
+    """
+    if rest < timedelta(0):
+        return "OVERLAP", "RED"
+    if rest < EIGHT_HOURS:
+        return "OVERLAP", "ORANGE"
+    if rest <= EIGHT_HOURS + NEAR_EIGHT:
+        if prev_rest is not None and EIGHT_HOURS - NEAR_EIGHT <= prev_rest <= EIGHT_HOURS + NEAR_EIGHT:
+            return "REST", "RED"
+        return "REST", "ORANGE"
+    return None
+
+
+def _hhmm(td: timedelta) -> str:
+    minutes = int(round(td.total_seconds())) // 60
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class RawWarning(NamedTuple):
+    """A warning by ids, as stored in plan_warnings; render_warnings adds the names."""
+    type: str
+    level: str
+    assignment_id: Optional[int]
+    soldier_id: int
+    mission_id: int
+    start_at: datetime
+    end_at: datetime
+    details: Optional[str]  # None for RESTRICTED and NOT_FRIENDS (rendered from fellow_id)
+    fellow_id: Optional[int] = None  # NOT_FRIENDS: the other soldier in the window
+
+
+def find_warnings(
+    rows: Iterable[WarningRow],
+    range_start: datetime,
+    range_end: datetime,
+    restricted_pairs: AbstractSet[Tuple[int, int]],
+    not_friends_map: Mapping[int, AbstractSet[int]],
+) -> List[RawWarning]:
+    """
+    RESTRICTED / OVERLAP / REST / NOT_FRIENDS warnings for the assignments
+    starting in [range_start, range_end), unordered.
+
+    `rows` must include every assignment starting in [range_start - LOOKBACK,
+    range_end); rest gaps run over each soldier's rows sorted by (start, end), so
+    the previous rest is the gap before the previous assignment by start time.
+    """
+    by_soldier: Dict[int, List[WarningRow]] = {}
+    for r in rows:
+        if r.soldier_id is not None and r.start_at < range_end:
+            by_soldier.setdefault(r.soldier_id, []).append(r)
+
+    out: List[RawWarning] = []
+    in_range: List[WarningRow] = []
+    for soldier_id, lst in by_soldier.items():
+        lst.sort(key=lambda r: (r.start_at, r.end_at))
+        prev_end: Optional[datetime] = None
+        prev_rest: Optional[timedelta] = None
+        for r in lst:
+            rest = r.start_at - prev_end if prev_end is not None else None
+            if r.start_at >= range_start:
+                in_range.append(r)
+                if (soldier_id, r.mission_id) in restricted_pairs:
+                    out.append(RawWarning("RESTRICTED", "GRAY", r.id, soldier_id, r.mission_id, r.start_at, r.end_at, None))
+                kind = classify_rest(rest, prev_rest) if rest is not None else None
+                if kind == ("OVERLAP", "RED"):
+                    details = f"Overlaps with previous assignment ending at {prev_end:%Y-%m-%d %H:%M}"
+                elif kind == ("REST", "RED"):
+                    details = f"Two consecutive ~8h rests: {_hhmm(rest)} and {_hhmm(prev_rest)}"
+                elif kind is not None:
+                    details = f"Rest between missions is {_hhmm(rest)}"
+                if kind is not None:
+                    out.append(RawWarning(kind[0], kind[1], r.id, soldier_id, r.mission_id, r.start_at, r.end_at, details))
+            prev_rest = rest
+            prev_end = r.end_at
+
+    # NOT_FRIENDS: each soldier in a window whose not-friend list names another soldier there
+    by_window: Dict[Tuple[int, datetime, datetime], List[WarningRow]] = {}
+    for r in in_range:
+        by_window.setdefault((r.mission_id, r.start_at, r.end_at), []).append(r)
+    for fellows in by_window.values():
+        for i, a in enumerate(fellows):
+            for b in fellows[i + 1:]:
+                if a.soldier_id == b.soldier_id:
+                    continue
+                for x, y in ((a, b), (b, a)):
+                    if y.soldier_id in not_friends_map.get(x.soldier_id, ()):
+                        out.append(RawWarning(
+                            "NOT_FRIENDS", "GRAY", x.id, x.soldier_id, x.mission_id, x.start_at, x.end_at, None, y.soldier_id,
+                        ))
+    return out
+
+
+def render_warnings(
+    warnings: Iterable[RawWarning],
+    soldier_names: Mapping[int, str],
+    mission_names: Mapping[int, str],
+) -> List[WarningItem]:
+    """
+    API items ordered by type, soldier name, start (latest first). Warnings of
+    soldiers or missions missing from the name maps, or NOT_FRIENDS with one
+    missing, are dropped. Accepts plan_warnings rows as well as RawWarnings.
+    """
+    out: List[WarningItem] = []
+    for w in warnings:
+        soldier_name = soldier_names.get(w.soldier_id)
+        mission_name = mission_names.get(w.mission_id)
+        if soldier_name is None or mission_name is None:
+            continue
+        details = w.details
+        if w.fellow_id is not None:
+            fellow_name = soldier_names.get(w.fellow_id)
+            if fellow_name is None:
+                continue
+            details = f"Assigned with {fellow_name}"
+        out.append(WarningItem(
+            type=w.type,
+            soldier_id=w.soldier_id,
+            soldier_name=soldier_name,
+            mission_id=w.mission_id,
+            mission_name=mission_name,
+            start_at=w.start_at.isoformat(timespec="seconds"),
+            end_at=w.end_at.isoformat(timespec="seconds"),
+            details=details,
+            assignment_id=w.assignment_id,
+            level=w.level,
+        ))
+    out.sort(key=lambda w: w.start_at, reverse=True)
+    out.sort(key=lambda w: (w.type, w.soldier_name))
+    return out
+
+
+def compute_warnings(
+    rows: Iterable[WarningRow],
+    range_start: datetime,
+    range_end: datetime,
+    soldier_names: Mapping[int, str],
+    mission_names: Mapping[int, str],
+    restricted_pairs: AbstractSet[Tuple[int, int]],
+    not_friends_map: Mapping[int, AbstractSet[int]],
+) -> List[WarningItem]:
+    """find_warnings + render_warnings: the API items for [range_start, range_end)."""
+    return render_warnings(
+        find_warnings(rows, range_start, range_end, restricted_pairs, not_friends_map),
+        soldier_names,
+        mission_names,
+    )
+
+
+def group_by_day(items: Iterable[WarningItem], first_day: date, n_days: int) -> Dict[str, List[WarningItem]]:
+    """Warnings keyed by the day (YYYY-MM-DD) their assignment starts, for every day of the range, order kept."""
+    out: Dict[str, List[WarningItem]] = {
+        (first_day + timedelta(days=i)).isoformat(): [] for i in range(n_days)
+    }
+    for w in items:
+        lst = out.get(w.start_at[:10])
+        if lst is not None:
+            lst.append(w)
+    return out
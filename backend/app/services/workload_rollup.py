@@ -0,0 +1,287 @@
+# backend/app/services/workload_rollup.py
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.soldier_pair_day import SoldierPairDay
+from app.models.soldier_workload_day import SoldierWorkloadDay
+
+ONE_DAY = timedelta(days=1)
+_EPS = timedelta(microseconds=1)
+
+
+def _slot_bucket(dt: datetime) -> str:
+    h = dt.hour
+    if 6 <= h < 14:
+        return "MORNING"
+    if 14 <= h < 22:
+        return "EVENING"
+    return "NIGHT"
+
+
+def end_day(end_at: datetime) -> date:
+    """Calendar day holding the last moment of an interval ending at `end_at` (midnight ends count for the day before)."""
+    return (end_at - _EPS).date()
+
+
+def _day_start(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day)
+
+
+def _days_touched(start_at: datetime, end_at: datetime, first_day: date, last_day: date) -> Iterable[date]:
+    d = max(start_at.date(), first_day)
+    last = min(end_day(end_at), last_day)
+    while d <= last:
+        yield d
+        d += ONE_DAY
+
+
+def _compute_rows(
+    assignments: Iterable[Tuple[int, int, datetime, datetime]],
+    first_day: date,
+    last_day: date,
+) -> List[dict]:
+    """Rollup rows of [first_day, last_day] from (soldier_id, mission_id, start_at, end_at) tuples touching those days."""
+    rows: Dict[Tuple[int, date, int], dict] = {}
+    for sid, mid, start_at, end_at in assignments:
+        if sid is None or end_at <= start_at:
+            continue
+        for d in _days_touched(start_at, end_at, first_day, last_day):
+            ds = _day_start(d)
+            row = rows.get((sid, d, mid))
+            if row is None:
+                row = rows[(sid, d, mid)] = {
+                    "soldier_id": sid, "day": d, "mission_id": mid,
+                    "hours": 0.0, "overlaps": 0, "starts": 0, "morning": 0, "evening": 0, "night": 0,
+                    "carried_morning": 0, "carried_evening": 0, "carried_night": 0, "carried_hours": 0.0,
+                    "last_end_at": None, "second_last_end_at": None,
+                }
+            row["hours"] += (min(end_at, ds + ONE_DAY) - max(start_at, ds)).total_seconds() / 3600.0
+            row["overlaps"] += 1
+            if start_at.date() == d:
+                row["starts"] += 1
+                row[_slot_bucket(start_at).lower()] += 1
+            else:
+                row["carried_" + _slot_bucket(start_at).lower()] += 1
+                row["carried_hours"] += (ds - start_at).total_seconds() / 3600.0
+            if end_day(end_at) == d:
+                if row["last_end_at"] is None or end_at >= row["last_end_at"]:
+                    row["second_last_end_at"] = row["last_end_at"]
+                    row["last_end_at"] = end_at
+                elif row["second_last_end_at"] is None or end_at > row["second_last_end_at"]:
+                    row["second_last_end_at"] = end_at
+    return list(rows.values())
+
+
+def _compute_pair_rows(
+    assignments: Iterable[Tuple[int, int, datetime, datetime]],
+    first_day: date,
+    last_day: date,
+) -> List[dict]:
+    """Co-assignment rows of [first_day, last_day]: ordered soldier pairs per shared (mission, start, end) window."""
+    by_window: Dict[Tuple[int, datetime, datetime], List[int]] = {}
+    for sid, mid, start_at, end_at in assignments:
+        if sid is not None and end_at > start_at:
+            by_window.setdefault((mid, start_at, end_at), []).append(sid)
+
+    rows: Dict[Tuple[int, int, date], dict] = {}
+    for (_mid, start_at, end_at), soldiers in by_window.items():
+        if len(soldiers) < 2:
+            continue
+        days = list(_days_touched(start_at, end_at, first_day, last_day))
+        for i, s1 in enumerate(soldiers):
+            for s2 in soldiers[i + 1:]:
+                if s1 == s2:
+                    continue
+                for a, b in ((s1, s2), (s2, s1)):
+                    for d in days:
+                        row = rows.get((a, b, d))
+                        if row is None:
+                            row = rows[(a, b, d)] = {"soldier_id": a, "fellow_id": b, "day": d, "overlaps": 0, "starts": 0}
+                        row["overlaps"] += 1
+                        if start_at.date() == d:
+                            row["starts"] += 1
+    return list(rows.values())
+
+
+def _write_rows(db: Session, assignments, first_day: date, last_day: date) -> None:
+    # Core inserts on the tables: one executemany each, whatever mix of NULLs the rows carry
+    rows = _compute_rows(assignments, first_day, last_day)
+    if rows:
+        db.execute(insert(SoldierWorkloadDay.__table__), rows)
+    pair_rows = _compute_pair_rows(assignments, first_day, last_day)
+    if pair_rows:
+        db.execute(insert(SoldierPairDay.__table__), pair_rows)
+
+
+def refresh_workload_days(db: Session, first_day: date, last_day: date) -> None:
+    """
+    Recompute the workload and co-assignment rows of [first_day, last_day] from the assignments table.
+    Call in the same transaction as any assignment write, with the days the
+    changed assignments touch (an overnight row also touches the next day).
+    """
+    db.flush()
+    range_start, range_end = _day_start(first_day), _day_start(last_day) + ONE_DAY
+    assignments = db.execute(
+        select(Assignment.soldier_id, Assignment.mission_id, Assignment.start_at, Assignment.end_at)
+        .where(and_(Assignment.start_at < range_end, Assignment.end_at > range_start))
+    ).all()
+    db.execute(
+        delete(SoldierWorkloadDay).where(
+            and_(SoldierWorkloadDay.day >= first_day, SoldierWorkloadDay.day <= last_day)
+        )
+    )
+    db.execute(
+        delete(SoldierPairDay).where(and_(SoldierPairDay.day >= first_day, SoldierPairDay.day <= last_day))
+    )
+    _write_rows(db, assignments, first_day, last_day)
+
+
+def refresh_workload_for(db: Session, start_at: datetime, end_at: datetime) -> None:
+    """Refresh the days touched by assignments starting in [start_at, end_at) (overnight rows spill one day)."""
+    refresh_workload_days(db, start_at.date(), end_day(end_at) + ONE_DAY)
+
+
+def rollup_range(
+    db: Session,
+    soldier_id: Optional[int] = None,
+    mission_id: Optional[int] = None,
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    [first day, day after the last day) of the rollup rows of a soldier or a
+    mission, i.e. the days their assignments touch, or None without any. Read it
+    before deleting the soldier / mission, then pass it to refresh_workload_for
+    and refresh_warnings_for so no rollup or warning outlives the rows.
+    """
+    q = select(func.min(SoldierWorkloadDay.day), func.max(SoldierWorkloadDay.day))
+    if soldier_id is not None:
+        q = q.where(SoldierWorkloadDay.soldier_id == soldier_id)
+    if mission_id is not None:
+        q = q.where(SoldierWorkloadDay.mission_id == mission_id)
+    first_day, last_day = db.execute(q).one()
+    if first_day is None:
+        return None
+    return _day_start(first_day), _day_start(last_day) + ONE_DAY
+
+
+def rebuild_workload(db: Session) -> None:
+    """Recompute the whole rollup (bulk imports that replace all assignments)."""
+    db.flush()
+    db.execute(delete(SoldierWorkloadDay))
+    db.execute(delete(SoldierPairDay))
+    assignments = db.execute(
+        select(Assignment.soldier_id, Assignment.mission_id, Assignment.start_at, Assignment.end_at)
+    ).all()
+    if not assignments:
+        return
+    first_day = min(a.start_at for a in assignments).date()
+    last_day = max(end_day(a.end_at) for a in assignments)
+    _write_rows(db, assignments, first_day, last_day)
+
+
+class SoldierWorkload:
+    """
+    Window totals for one soldier, folded from the rollup rows. `hours` is
+    clipped to the range; `carried_hours` is the part before it of the
+    assignments carried into its first day.
+    """
+
+    __slots__ = ("hours", "carried_hours", "mission_count", "slot_bucket_count", "last_end_at", "second_last_end_at")
+
+    def __init__(self):
+        self.hours = 0.0
+        self.carried_hours = 0.0
+        self.mission_count: Dict[int, int] = {}
+        self.slot_bucket_count: Dict[str, int] = {}
+        self.last_end_at: Optional[datetime] = None
+        self.second_last_end_at: Optional[datetime] = None
+
+    def _push_end(self, end_at: Optional[datetime]) -> None:
+        if end_at is None:
+            return
+        if self.last_end_at is None or end_at >= self.last_end_at:
+            self.second_last_end_at = self.last_end_at
+            self.last_end_at = end_at
+        elif self.second_last_end_at is None or end_at > self.second_last_end_at:
+            self.second_last_end_at = end_at
+
+
+def load_workload(db: Session, first_day: date, last_day: date) -> Dict[int, SoldierWorkload]:
+    """
+    Totals over the rollup rows of [first_day, last_day], one query: hours
+    inside those days, missions and slot buckets of the assignments touching
+    them (counted once, on their first day in the range), and the latest two
+    ends falling in them.
+    """
+    out: Dict[int, SoldierWorkload] = {}
+    rows = db.execute(
+        select(
+            SoldierWorkloadDay.soldier_id,
+            SoldierWorkloadDay.day,
+            SoldierWorkloadDay.mission_id,
+            SoldierWorkloadDay.hours,
+            SoldierWorkloadDay.overlaps,
+            SoldierWorkloadDay.starts,
+            SoldierWorkloadDay.morning,
+            SoldierWorkloadDay.evening,
+            SoldierWorkloadDay.night,
+            SoldierWorkloadDay.carried_morning,
+            SoldierWorkloadDay.carried_evening,
+            SoldierWorkloadDay.carried_night,
+            SoldierWorkloadDay.carried_hours,
+            SoldierWorkloadDay.last_end_at,
+            SoldierWorkloadDay.second_last_end_at,
+        ).where(and_(SoldierWorkloadDay.day >= first_day, SoldierWorkloadDay.day <= last_day))
+    ).all()
+    for (sid, day, mid, hours, overlaps, starts, morning, evening, night,
+         c_morning, c_evening, c_night, c_hours, last_end, second_end) in rows:
+        w = out.get(sid)
+        if w is None:
+            w = out[sid] = SoldierWorkload()
+        w.hours += hours
+        if day == first_day:
+            # Assignments carried in from before the range count on its first day
+            w.carried_hours += c_hours
+            starts = overlaps
+            morning, evening, night = morning + c_morning, evening + c_evening, night + c_night
+        if starts:
+            w.mission_count[mid] = w.mission_count.get(mid, 0) + starts
+        for bucket, n in (("MORNING", morning), ("EVENING", evening), ("NIGHT", night)):
+            if n:
+                w.slot_bucket_count[bucket] = w.slot_bucket_count.get(bucket, 0) + n
+        w._push_end(last_end)
+        w._push_end(second_end)
+    return out
+
+
+def load_pair_counts(
+    db: Session,
+    first_day: date,
+    last_day: date,
+    soldier_ids: Optional[Iterable[int]] = None,
+) -> Dict[int, Dict[int, int]]:
+    """
+    {soldier_id: {fellow_id: shared windows}} for windows touching [first_day, last_day],
+    one grouped query; with `soldier_ids` only pairs among those soldiers.
+    """
+    shared = func.sum(
+        case((SoldierPairDay.day == first_day, SoldierPairDay.overlaps), else_=SoldierPairDay.starts)
+    )
+    q = (
+        select(SoldierPairDay.soldier_id, SoldierPairDay.fellow_id, shared)
+        .where(and_(SoldierPairDay.day >= first_day, SoldierPairDay.day <= last_day))
+        .group_by(SoldierPairDay.soldier_id, SoldierPairDay.fellow_id)
+    )
+    if soldier_ids is not None:
+        ids = list(soldier_ids)
+        q = q.where(SoldierPairDay.soldier_id.in_(ids), SoldierPairDay.fellow_id.in_(ids))
+    out: Dict[int, Dict[int, int]] = {}
+    for sid, fid, n in db.execute(q).all():
+        if n:
+            out.setdefault(sid, {})[fid] = int(n)
+    return out
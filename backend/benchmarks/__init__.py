@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Synthetic datasets and performance checks for the planner (run from backend/ with `python -m benchmarks.<name>`).
@@ -0,0 +1,19 @@
+# backend/benchmarks/database.py
+from __future__ import annotations
+
+import os
+import tempfile
+
+
+def configure(name: str) -> str:
+    """
+    Point DATABASE_URL at BENCHMARK_DATABASE_URL, or at a throwaway SQLite file
+    named after the benchmark. Call before anything imports app.db; the
+    benchmarks drop and recreate every table, so never aim this at real data.
+    """
+    url = os.getenv("BENCHMARK_DATABASE_URL")
+    if not url:
+        tmpdir = tempfile.mkdtemp(prefix="shabtzak-bench-")
+        url = f"sqlite:///{os.path.join(tmpdir, name + '.sqlite')}"
+    os.environ["DATABASE_URL"] = url
+    return url
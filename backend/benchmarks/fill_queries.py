@@ -0,0 +1,72 @@
+# backend/benchmarks/fill_queries.py
+"""
+Query budget for POST /plan/fill.
+
+Fill loads the whole day state (planner snapshot, vacations, fairness rollups,
+nearby assignments) in a fixed number of queries and writes with one batched
+insert per table (assignments, mission_windows, the workload/pair rollups,
+plan_warnings), so the statement count must not grow with missions or slots.
+This builds a synthetic 50-mission unit and fails if a warm /plan/fill goes
+over FILL_QUERY_BUDGET statements.
+
+    cd backend && python -m benchmarks.fill_queries
+
+Uses a throwaway SQLite file unless BENCHMARK_DATABASE_URL points at a
+scratch database (see benchmarks/database.py).
+"""
+from __future__ import annotations
+
+import sys
+
+from benchmarks.database import configure
+
+configure("fill_queries")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base.metadata)
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.main import build_app  # noqa: E402
+from app.services.query_counter import count_queries  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+FILL_QUERY_BUDGET = 14
+MISSIONS = 50
+SOLDIERS = 300
+
+CASES = [
+    ("fill", {"day": "2025-03-02"}),
+    ("fill replace", {"day": "2025-03-02", "replace": True}),
+    ("fill preview", {"day": "2025-03-03", "preview": True}),
+    ("fill replace+candidates", {"day": "2025-03-02", "replace": True, "candidates": 3, "random_seed": 1}),
+]
+
+
+def main() -> int:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        generate(db, soldiers=SOLDIERS, missions=MISSIONS)
+
+    client = TestClient(build_app())
+    # Warm-up: builds the planner cache and runs the once-per-process sequence check
+    client.post("/plan/fill", json={"day": "2025-03-01"}).raise_for_status()
+
+    failed = False
+    for label, body in CASES:
+        with count_queries() as q:
+            resp = client.post("/plan/fill", json=body)
+        resp.raise_for_status()
+        ok = q.count <= FILL_QUERY_BUDGET
+        failed |= not ok
+        print(f"{label:<28} {q.count:>3} queries  {'ok' if ok else 'OVER BUDGET'}")
+        if not ok:
+            for stmt in q.statements:
+                print("    " + " ".join(stmt.split())[:160])
+
+    print(f"budget {FILL_QUERY_BUDGET} per call, {MISSIONS} missions, {SOLDIERS} soldiers")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
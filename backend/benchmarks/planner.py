@@ -0,0 +1,148 @@
+# backend/benchmarks/planner.py
+"""
+Planner scaling benchmark.
+
+For each size, recreates the schema, generates a seeded synthetic unit
+(benchmarks/synthetic.py: soldiers, missions with slots and requirements,
+vacations, friendships, restrictions, 14 days of history) and times the
+read/plan endpoints through the app: /plan/fill, /plan/warnings (day and week),
+/assignments/roster and the /data exports. Writes a JSON report with
+latency (median/min/max over --repeat runs) and statement counts per endpoint.
+
+    cd backend && python -m benchmarks.planner --sizes 100,250,500,1000,2000 --out bench.json
+
+Uses a throwaway SQLite file unless BENCHMARK_DATABASE_URL points at a
+scratch database (see benchmarks/database.py). Everything runs on SQLite;
+the Postgres-only debug queries of /plan/warnings just log their error there.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from benchmarks.database import configure
+
+configure("planner")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base.metadata)
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.main import build_app  # noqa: E402
+from app.models.assignment import Assignment  # noqa: E402
+from app.services.query_counter import count_queries  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+DEFAULT_SIZES = (100, 250, 500, 1000, 2000)
+FIRST_DAY = date(2025, 3, 1)
+
+
+def missions_for(soldiers: int) -> int:
+    """Mission count used for a unit of `soldiers` (about one mission per ten soldiers)."""
+    return max(10, soldiers // 10)
+
+
+def targets(day: str):
+    """(name, method, path, json body) per timed endpoint."""
+    week_end = (date.fromisoformat(day) + timedelta(days=6)).isoformat()
+    return [
+        ("fill", "POST", "/plan/fill", {"day": day, "replace": True, "random_seed": 1}),
+        # replace=true so the preview plans the whole day, not just what "fill" left open
+        ("fill_preview", "POST", "/plan/fill", {"day": day, "preview": True, "replace": True, "random_seed": 1}),
+        ("warnings", "GET", f"/plan/warnings?day={day}", None),
+        ("warnings_week", "GET", f"/plan/warnings/range?from={day}&to={week_end}", None),
+        ("roster", "GET", f"/assignments/roster?day={day}", None),
+        ("export_soldiers", "GET", "/data/export/soldiers", None),
+        ("export_missions", "GET", "/data/export/missions", None),
+        ("export_planner", "GET", f"/data/export/planner?day={day}", None),
+        ("export_planner_all", "GET", "/data/export/planner/all", None),
+        ("export_manpower", "GET", "/data/export/manpower", None),
+    ]
+
+
+def _call(client: TestClient, method: str, path: str, body) -> None:
+    # The routers print debug lines; keep them out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        resp = client.request(method, path, json=body)
+    resp.raise_for_status()
+
+
+def run_size(client: TestClient, soldiers: int, missions: int, repeat: int, seed: int) -> dict:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        generate(db, soldiers=soldiers, missions=missions, first_day=FIRST_DAY, seed=seed)
+        history_rows = db.scalar(select(func.count()).select_from(Assignment))
+    generate_ms = (time.perf_counter() - started) * 1000.0
+
+    results = {}
+    for name, method, path, body in targets(FIRST_DAY.isoformat()):
+        timings, queries, error = [], None, None
+        try:
+            _call(client, method, path, body)  # warm-up (planner cache, first fill's writes)
+            for _ in range(repeat):
+                with count_queries() as q:
+                    t = time.perf_counter()
+                    _call(client, method, path, body)
+                    timings.append((time.perf_counter() - t) * 1000.0)
+                queries = q.count
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        results[name] = {
+            "median_ms": round(statistics.median(timings), 2) if timings else None,
+            "min_ms": round(min(timings), 2) if timings else None,
+            "max_ms": round(max(timings), 2) if timings else None,
+            "queries": queries,
+            "error": error,
+        }
+        status = error or f"{results[name]['median_ms']:.1f} ms, {queries} queries"
+        print(f"  {name:<20} {status}", flush=True)
+
+    return {
+        "soldiers": soldiers,
+        "missions": missions,
+        "history_assignments": history_rows,
+        "generate_ms": round(generate_ms, 1),
+        "targets": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES), help="soldier counts, comma separated")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per endpoint (after one warm-up)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="benchmark_report.json")
+    args = parser.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    client = TestClient(build_app())
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "database": engine.dialect.name,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "first_day": FIRST_DAY.isoformat(),
+        "sizes": [],
+    }
+    for soldiers in sizes:
+        missions = missions_for(soldiers)
+        print(f"{soldiers} soldiers, {missions} missions", flush=True)
+        report["sizes"].append(run_size(client, soldiers, missions, args.repeat, args.seed))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# backend/benchmarks/synthetic.py
+from __future__ import annotations
+
+import random
+from datetime import date, time, timedelta
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.mission import Mission
+from app.models.mission_requirement import MissionRequirement
+from app.models.mission_slot import MissionSlot
+from app.models.role import Role
+from app.models.soldier import Soldier
+from app.models.soldier_friendship import SoldierFriendship
+from app.models.soldier_role import SoldierRole
+from app.models.vacation import Vacation
+from app.services.bulk_insert import BulkInserter
+from app.services.mission_windows import link_windows
+from app.services.planner_cache import bump_planner_version
+from app.services.restriction_index import rebuild_restriction_index
+from app.services.workload_rollup import rebuild_workload
+
+ROLE_NAMES = ("Officer", "Commander", "Driver")
+
+# Slot layouts cycled over the missions: three 8h shifts, two 12h shifts, or one day shift
+SLOT_LAYOUTS = (
+    ((6, 14), (14, 22), (22, 6)),
+    ((8, 20), (20, 8)),
+    ((0, 8), (8, 16), (16, 0)),
+    ((7, 19),),
+)
+
+
+def generate(
+    db: Session,
+    soldiers: int = 300,
+    missions: int = 50,
+    first_day: date = date(2025, 3, 1),
+    history_days: int = 14,
+    seed: int = 1,
+) -> None:
+    """
+    Fill an empty database with a seeded synthetic unit: roles, `missions`
+    missions with slots and role requirements, `soldiers` soldiers (some with
+    roles, restrictions, friendships and vacations), and `history_days` days of
+    assignments before `first_day` so fairness history is not empty. Same
+    arguments, same data. Commits and invalidates the planner cache.
+    """
+    rng = random.Random(seed)
+
+    roles = [Role(name=name) for name in ROLE_NAMES]
+    db.add_all(roles)
+    db.flush()
+
+    mission_rows: List[Mission] = []
+    slots_by_mission = {}
+    for i in range(missions):
+        layout = SLOT_LAYOUTS[i % len(SLOT_LAYOUTS)]
+        m = Mission(name=f"Mission {i + 1:03d}", total_needed=rng.randint(1, 4), order=i + 1)
+        db.add(m)
+        db.flush()
+        slots_by_mission[m.id] = [(time(a), time(b)) for a, b in layout]
+        for a, b in layout:
+            db.add(MissionSlot(mission_id=m.id, start_time=time(a), end_time=time(b)))
+        if m.total_needed > 1 and rng.random() < 0.6:
+            db.add(MissionRequirement(mission_id=m.id, role_id=rng.choice(roles).id, count=1))
+        mission_rows.append(m)
+
+    soldier_rows: List[Soldier] = []
+    for i in range(soldiers):
+        restricted = rng.sample(mission_rows, k=min(2, len(mission_rows))) if rng.random() < 0.1 else []
+        s = Soldier(
+            name=f"Soldier {i + 1:04d}",
+            restrictions="; ".join(m.name for m in restricted),
+            missions_history="",
+        )
+        db.add(s)
+        soldier_rows.append(s)
+    db.flush()
+
+    for s in soldier_rows:
+        if rng.random() < 0.3:
+            db.add(SoldierRole(soldier_id=s.id, role_id=rng.choice(roles).id))
+        if rng.random() < 0.05:
+            start = first_day + timedelta(days=rng.randint(0, 6))
+            db.add(Vacation(soldier_id=s.id, start_date=start, end_date=start + timedelta(days=rng.randint(0, 3))))
+
+    paired = set()
+    for _ in range(soldiers // 10):
+        a, b = rng.sample(soldier_rows, k=2)
+        if (a.id, b.id) in paired:
+            continue
+        paired.update({(a.id, b.id), (b.id, a.id)})
+        status = rng.choice(("friend", "not_friend"))
+        db.add(SoldierFriendship(soldier_id=a.id, friend_id=b.id, status=status))
+        db.add(SoldierFriendship(soldier_id=b.id, friend_id=a.id, status=status))
+    db.flush()
+
+    writer = BulkInserter(db, Assignment)
+    ids = [s.id for s in soldier_rows]
+    for offset in range(history_days, 0, -1):
+        the_day = first_day - timedelta(days=offset)
+        for m in mission_rows:
+            for start_time, end_time in slots_by_mission[m.id]:
+                start_at, end_at = Assignment.window_for(start_time, end_time, the_day)
+                for sid in rng.sample(ids, k=min(m.total_needed, len(ids))):
+                    writer.add(mission_id=m.id, soldier_id=sid, role_id=None, start_at=start_at, end_at=end_at)
+    writer.flush()
+
+    link_windows(db, None, None)
+    rebuild_restriction_index(db)
+    rebuild_workload(db)
+    db.commit()
+    bump_planner_version()
@@ -0,0 +1,25 @@
+"""index assignments.start_at for range scans
+
+Revision ID: add_assignments_start_index
+Revises: add_plan_jobs
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_assignments_start_index'
+down_revision: Union[str, None] = 'add_plan_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_assignments_start_at', 'assignments', ['start_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assignments_start_at', table_name='assignments')
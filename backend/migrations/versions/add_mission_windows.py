@@ -0,0 +1,63 @@
+"""add mission_windows (shift instances) referenced by assignments.window_id
+
+Revision ID: add_mission_windows
+Revises: add_plan_warnings
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_mission_windows'
+down_revision: Union[str, None] = 'add_plan_warnings'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mission_windows',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('mission_id', sa.Integer(), sa.ForeignKey('missions.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('slot_id', sa.Integer(), sa.ForeignKey('mission_slots.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('start_at', sa.DateTime(timezone=False), nullable=False),
+        sa.Column('end_at', sa.DateTime(timezone=False), nullable=False),
+        sa.UniqueConstraint('mission_id', 'start_at', 'end_at', name='uq_mission_windows_window'),
+    )
+    op.create_index('ix_mission_windows_start_at', 'mission_windows', ['start_at'])
+
+    op.add_column('assignments', sa.Column('window_id', sa.Integer(), sa.ForeignKey('mission_windows.id'), nullable=True))
+    op.create_index('ix_assignments_window', 'assignments', ['window_id'])
+
+    # One window per distinct (mission, start, end) already assigned, tied to the
+    # slot that generates it (Assignment.window_for: end <= start rolls a day)
+    op.execute(sa.text("""
+        INSERT INTO mission_windows (mission_id, slot_id, start_at, end_at)
+        SELECT w.mission_id,
+               (SELECT s.id FROM mission_slots s
+                WHERE s.mission_id = w.mission_id
+                  AND s.start_time = w.start_at::time
+                  AND w.end_at = w.start_at::date + s.end_time
+                      + CASE WHEN s.end_time <= s.start_time THEN INTERVAL '1 day' ELSE INTERVAL '0 days' END
+                ORDER BY s.id
+                LIMIT 1),
+               w.start_at, w.end_at
+        FROM (SELECT DISTINCT mission_id, start_at, end_at FROM assignments) w
+    """))
+    op.execute(sa.text("""
+        UPDATE assignments a
+        SET window_id = w.id
+        FROM mission_windows w
+        WHERE w.mission_id = a.mission_id AND w.start_at = a.start_at AND w.end_at = a.end_at
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assignments_window', table_name='assignments')
+    op.drop_column('assignments', 'window_id')
+    op.drop_index('ix_mission_windows_start_at', table_name='mission_windows')
+    op.drop_table('mission_windows')
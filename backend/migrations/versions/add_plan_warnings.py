@@ -0,0 +1,108 @@
+"""add plan_warnings, the stored output of the warnings engine
+
+Revision ID: add_plan_warnings
+Revises: add_assignments_start_index
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_plan_warnings'
+down_revision: Union[str, None] = 'add_assignments_start_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'plan_warnings',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('assignment_id', sa.Integer(), sa.ForeignKey('assignments.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('soldier_id', sa.Integer(), nullable=False),
+        sa.Column('mission_id', sa.Integer(), nullable=False),
+        sa.Column('start_at', sa.DateTime(timezone=False), nullable=False),
+        sa.Column('end_at', sa.DateTime(timezone=False), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('level', sa.String(), nullable=False),
+        sa.Column('details', sa.String(), nullable=True),
+        sa.Column('fellow_id', sa.Integer(), nullable=True),
+    )
+    op.create_index('ix_plan_warnings_start_at', 'plan_warnings', ['start_at'])
+    op.create_index('ix_plan_warnings_soldier_start', 'plan_warnings', ['soldier_id', 'start_at'])
+    op.create_index('ix_plan_warnings_assignment', 'plan_warnings', ['assignment_id'])
+
+    # Backfill over every assignment with the rules of app/services/warnings_engine.py
+    # (8h minimum rest, ~8h = 8h + 10 minutes, a previous ~8h rest = 8h ± 10 minutes)
+    op.execute(sa.text("""
+        WITH ordered AS (
+            SELECT a.id, a.soldier_id, a.mission_id, a.start_at, a.end_at,
+                   LAG(a.end_at) OVER w AS prev_end_at
+            FROM assignments a
+            WHERE a.soldier_id IS NOT NULL
+            WINDOW w AS (PARTITION BY a.soldier_id ORDER BY a.start_at, a.end_at)
+        ),
+        rests AS (
+            SELECT o.*,
+                   o.start_at - o.prev_end_at AS rest,
+                   LAG(o.start_at - o.prev_end_at) OVER (PARTITION BY o.soldier_id ORDER BY o.start_at, o.end_at) AS prev_rest
+            FROM ordered o
+        )
+        INSERT INTO plan_warnings (assignment_id, soldier_id, mission_id, start_at, end_at, type, level, details, fellow_id)
+        SELECT a.id, a.soldier_id, a.mission_id, a.start_at, a.end_at, 'RESTRICTED', 'GRAY', NULL, NULL
+        FROM assignments a
+        WHERE a.soldier_id IS NOT NULL
+          AND (
+            EXISTS (SELECT 1 FROM soldier_mission_restrictions r
+                    WHERE r.soldier_id = a.soldier_id AND r.mission_id = a.mission_id)
+            OR EXISTS (SELECT 1 FROM soldier_restriction_index ri
+                       WHERE ri.soldier_id = a.soldier_id AND ri.mission_id = a.mission_id)
+          )
+
+        UNION ALL
+
+        SELECT r.id, r.soldier_id, r.mission_id, r.start_at, r.end_at,
+               CASE WHEN r.rest < interval '8 hours' THEN 'OVERLAP' ELSE 'REST' END,
+               CASE
+                 WHEN r.rest < interval '0 hours' THEN 'RED'
+                 WHEN r.rest < interval '8 hours' THEN 'ORANGE'
+                 WHEN r.prev_rest BETWEEN interval '7 hours 50 minutes' AND interval '8 hours 10 minutes' THEN 'RED'
+                 ELSE 'ORANGE'
+               END,
+               CASE
+                 WHEN r.rest < interval '0 hours'
+                   THEN 'Overlaps with previous assignment ending at ' || to_char(r.prev_end_at, 'YYYY-MM-DD HH24:MI')
+                 WHEN r.rest >= interval '8 hours'
+                      AND r.prev_rest BETWEEN interval '7 hours 50 minutes' AND interval '8 hours 10 minutes'
+                   THEN 'Two consecutive ~8h rests: ' || to_char(r.rest, 'HH24:MI') || ' and ' || to_char(r.prev_rest, 'HH24:MI')
+                 ELSE 'Rest between missions is ' || to_char(r.rest, 'HH24:MI')
+               END,
+               NULL
+        FROM rests r
+        WHERE r.rest IS NOT NULL AND r.rest <= interval '8 hours 10 minutes'
+
+        UNION ALL
+
+        SELECT a1.id, a1.soldier_id, a1.mission_id, a1.start_at, a1.end_at, 'NOT_FRIENDS', 'GRAY', NULL, a2.soldier_id
+        FROM assignments a1
+        JOIN assignments a2
+          ON a2.mission_id = a1.mission_id
+          AND a2.start_at = a1.start_at
+          AND a2.end_at = a1.end_at
+          AND a2.soldier_id <> a1.soldier_id
+        JOIN soldier_friendships sf
+          ON sf.soldier_id = a1.soldier_id
+          AND sf.friend_id = a2.soldier_id
+          AND sf.status = 'not_friend'
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_plan_warnings_assignment', table_name='plan_warnings')
+    op.drop_index('ix_plan_warnings_soldier_start', table_name='plan_warnings')
+    op.drop_index('ix_plan_warnings_start_at', table_name='plan_warnings')
+    op.drop_table('plan_warnings')
@@ -0,0 +1,56 @@
+"""add soldier_pair_days co-assignment rollup
+
+Revision ID: add_soldier_pair_days
+Revises: add_workload_carried_hours
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_soldier_pair_days'
+down_revision: Union[str, None] = 'add_workload_carried_hours'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'soldier_pair_days',
+        sa.Column('soldier_id', sa.Integer(), sa.ForeignKey('soldiers.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('fellow_id', sa.Integer(), sa.ForeignKey('soldiers.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('overlaps', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('starts', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_soldier_pair_days_day', 'soldier_pair_days', ['day'])
+
+    # Backfill: every ordered pair sharing a mission window, on each day the window touches
+    op.execute(sa.text("""
+        INSERT INTO soldier_pair_days (soldier_id, fellow_id, day, overlaps, starts)
+        SELECT
+            a1.soldier_id, a2.soldier_id, d.day,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE a1.start_at::date = d.day)
+        FROM assignments a1
+        JOIN assignments a2
+          ON a2.mission_id = a1.mission_id
+          AND a2.start_at = a1.start_at
+          AND a2.end_at = a1.end_at
+          AND a2.soldier_id <> a1.soldier_id
+        CROSS JOIN LATERAL (
+            SELECT g::date AS day
+            FROM generate_series(a1.start_at::date, (a1.end_at - INTERVAL '1 microsecond')::date, INTERVAL '1 day') AS g
+        ) d
+        WHERE a1.soldier_id IS NOT NULL AND a2.soldier_id IS NOT NULL AND a1.end_at > a1.start_at
+        GROUP BY a1.soldier_id, a2.soldier_id, d.day
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_soldier_pair_days_day', table_name='soldier_pair_days')
+    op.drop_table('soldier_pair_days')
@@ -0,0 +1,43 @@
+"""add soldier_restriction_index compiled from soldiers.restrictions
+
+Revision ID: add_soldier_restriction_index
+Revises: add_mission_order
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_soldier_restriction_index'
+down_revision: Union[str, None] = 'add_mission_order'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'soldier_restriction_index',
+        sa.Column('soldier_id', sa.Integer(), sa.ForeignKey('soldiers.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('mission_id', sa.Integer(), sa.ForeignKey('missions.id', ondelete='CASCADE'), primary_key=True),
+    )
+    op.create_index('ix_soldier_restriction_index_mission', 'soldier_restriction_index', ['mission_id'])
+
+    # Compile the existing restriction strings (comma/semicolon separated mission names,
+    # matched case-insensitively after trimming) into keys
+    op.execute(sa.text("""
+        INSERT INTO soldier_restriction_index (soldier_id, mission_id)
+        SELECT DISTINCT s.id, m.id
+        FROM soldiers s
+        CROSS JOIN LATERAL unnest(string_to_array(REPLACE(s.restrictions, ';', ','), ',')) AS r(name)
+        JOIN missions m ON LOWER(TRIM(m.name)) = LOWER(TRIM(r.name))
+        WHERE s.restrictions IS NOT NULL AND s.restrictions != '' AND TRIM(r.name) != ''
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_soldier_restriction_index_mission', table_name='soldier_restriction_index')
+    op.drop_table('soldier_restriction_index')
@@ -0,0 +1,72 @@
+"""add soldier_workload_days rollup of assignments
+
+Revision ID: add_soldier_workload_days
+Revises: add_soldier_restriction_index
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_soldier_workload_days'
+down_revision: Union[str, None] = 'add_soldier_restriction_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'soldier_workload_days',
+        sa.Column('soldier_id', sa.Integer(), sa.ForeignKey('soldiers.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('mission_id', sa.Integer(), sa.ForeignKey('missions.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('hours', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('overlaps', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('starts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('morning', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('evening', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('night', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('carried_morning', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('carried_evening', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('carried_night', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_end_at', sa.DateTime(timezone=False), nullable=True),
+        sa.Column('second_last_end_at', sa.DateTime(timezone=False), nullable=True),
+    )
+    op.create_index('ix_soldier_workload_days_day', 'soldier_workload_days', ['day'])
+
+    # Backfill: split every assignment over the calendar days it touches
+    # (same rules as app/services/workload_rollup.py)
+    op.execute(sa.text("""
+        INSERT INTO soldier_workload_days
+            (soldier_id, day, mission_id, hours, overlaps, starts, morning, evening, night,
+             carried_morning, carried_evening, carried_night, last_end_at, second_last_end_at)
+        SELECT
+            a.soldier_id, d.day, a.mission_id,
+            SUM(EXTRACT(EPOCH FROM (LEAST(a.end_at, d.day + INTERVAL '1 day') - GREATEST(a.start_at, d.day::timestamp))) / 3600.0),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE a.start_at::date = d.day),
+            COUNT(*) FILTER (WHERE a.start_at::date = d.day AND EXTRACT(HOUR FROM a.start_at) >= 6 AND EXTRACT(HOUR FROM a.start_at) < 14),
+            COUNT(*) FILTER (WHERE a.start_at::date = d.day AND EXTRACT(HOUR FROM a.start_at) >= 14 AND EXTRACT(HOUR FROM a.start_at) < 22),
+            COUNT(*) FILTER (WHERE a.start_at::date = d.day AND (EXTRACT(HOUR FROM a.start_at) < 6 OR EXTRACT(HOUR FROM a.start_at) >= 22)),
+            COUNT(*) FILTER (WHERE a.start_at::date < d.day AND EXTRACT(HOUR FROM a.start_at) >= 6 AND EXTRACT(HOUR FROM a.start_at) < 14),
+            COUNT(*) FILTER (WHERE a.start_at::date < d.day AND EXTRACT(HOUR FROM a.start_at) >= 14 AND EXTRACT(HOUR FROM a.start_at) < 22),
+            COUNT(*) FILTER (WHERE a.start_at::date < d.day AND (EXTRACT(HOUR FROM a.start_at) < 6 OR EXTRACT(HOUR FROM a.start_at) >= 22)),
+            MAX(a.end_at) FILTER (WHERE (a.end_at - INTERVAL '1 microsecond')::date = d.day),
+            (ARRAY_AGG(a.end_at ORDER BY a.end_at DESC) FILTER (WHERE (a.end_at - INTERVAL '1 microsecond')::date = d.day))[2]
+        FROM assignments a
+        CROSS JOIN LATERAL (
+            SELECT g::date AS day
+            FROM generate_series(a.start_at::date, (a.end_at - INTERVAL '1 microsecond')::date, INTERVAL '1 day') AS g
+        ) d
+        WHERE a.soldier_id IS NOT NULL AND a.end_at > a.start_at
+        GROUP BY a.soldier_id, d.day, a.mission_id
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_soldier_workload_days_day', table_name='soldier_workload_days')
+    op.drop_table('soldier_workload_days')
@@ -0,0 +1,50 @@
+"""add soldier_workload_days.carried_hours
+
+Hours, before the rollup day, of the assignments that started earlier and run
+into it. The fairness objective of /plan/fill (_history_hours, LocalSearch)
+counts whole assignments touching its window, so an assignment carried into
+the first day of the window adds its hours before that day from here instead
+of a scan of the assignments.
+
+Revision ID: add_workload_carried_hours
+Revises: add_soldier_workload_days
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_workload_carried_hours'
+down_revision: Union[str, None] = 'add_soldier_workload_days'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('soldier_workload_days', sa.Column('carried_hours', sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill from the assignments spanning midnight, per day they run into
+    op.execute(sa.text("""
+        UPDATE soldier_workload_days w
+        SET carried_hours = c.hours
+        FROM (
+            SELECT a.soldier_id, a.mission_id, d.day,
+                   SUM(EXTRACT(EPOCH FROM (d.day::timestamp - a.start_at)) / 3600.0) AS hours
+            FROM assignments a
+            CROSS JOIN LATERAL (
+                SELECT g::date AS day
+                FROM generate_series(a.start_at::date + 1, (a.end_at - INTERVAL '1 microsecond')::date, INTERVAL '1 day') AS g
+            ) d
+            WHERE a.soldier_id IS NOT NULL
+            GROUP BY a.soldier_id, a.mission_id, d.day
+        ) c
+        WHERE w.soldier_id = c.soldier_id AND w.mission_id = c.mission_id AND w.day = c.day
+    """))
+
+
+def downgrade() -> None:
+    op.drop_column('soldier_workload_days', 'carried_hours')
@@ -0,0 +1,41 @@
+"""assignments.window_id: ON DELETE SET NULL
+
+A mission's windows go with it (mission_windows.mission_id cascades), and
+windows no slot generates any more are dropped when unused (see
+relink_windows); an assignment still pointing at a removed window keeps its
+own times and is only unlinked, like soldier_id.
+
+Revision ID: assignments_window_set_null
+Revises: add_mission_windows
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'assignments_window_set_null'
+down_revision: Union[str, None] = 'add_mission_windows'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('assignments_window_id_fkey', 'assignments', type_='foreignkey')
+    op.create_foreign_key(
+        'assignments_window_id_fkey',
+        'assignments', 'mission_windows',
+        ['window_id'], ['id'],
+        ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('assignments_window_id_fkey', 'assignments', type_='foreignkey')
+    op.create_foreign_key(
+        'assignments_window_id_fkey',
+        'assignments', 'mission_windows',
+        ['window_id'], ['id']
+    )
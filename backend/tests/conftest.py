@@ -0,0 +1,52 @@
+# backend/tests/conftest.py
+"""
+Shared fixtures. Run from backend/:
+
+    python -m pytest tests
+
+The app is bound to a throwaway SQLite file (or BENCHMARK_DATABASE_URL, see
+benchmarks/database.py) before anything imports app.db.
+"""
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.database import configure
+
+configure("tests")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base.metadata)
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.main import build_app  # noqa: E402
+from app.services.planner_cache import bump_planner_version  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+# Size of the shared synthetic unit (see `unit`)
+UNIT_SOLDIERS = 60
+UNIT_MISSIONS = 12
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created, empty tables."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # The planner cache outlives the tables; make the next fill rebuild it
+    bump_planner_version()
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def unit(db):
+    """`db` holding the seeded synthetic unit (benchmarks.synthetic, 14 days of history before 2025-03-01)."""
+    generate(db, soldiers=UNIT_SOLDIERS, missions=UNIT_MISSIONS)
+    return db
+
+
+@pytest.fixture
+def client(db):
+    """A test client for the app on `db`'s tables; the lifespan only runs under `with TestClient(...)`."""
+    return TestClient(build_app())
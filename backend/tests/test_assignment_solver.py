@@ -0,0 +1,89 @@
+# backend/tests/test_assignment_solver.py
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.models.mission import Mission
+from app.models.mission_requirement import MissionRequirement
+from app.models.mission_slot import MissionSlot
+from app.models.role import Role
+from app.models.soldier import Soldier
+from app.models.soldier_role import SoldierRole
+from app.routers import planning as P
+
+DAY = "2025-03-01"
+
+
+def _preview(db, solver, **kwargs):
+    return P.run_fill(P.FillRequest(day=DAY, preview=True, assignment_solver=solver, **kwargs), db)
+
+
+@pytest.fixture
+def two_roles(db):
+    """
+    One 08-16 window needing a Commander and a Driver. X holds both roles, Y is
+    only a Commander: seat by seat X takes the Commander seat and strands the Driver.
+    """
+    cmd, drv = Role(name="Commander"), Role(name="Driver")
+    db.add_all([cmd, drv])
+    db.flush()
+    m = Mission(name="Gate", total_needed=2, order=1)
+    db.add(m)
+    db.flush()
+    db.add(MissionSlot(mission_id=m.id, start_time=time(8), end_time=time(16)))
+    db.add_all([
+        MissionRequirement(mission_id=m.id, role_id=cmd.id, count=1),
+        MissionRequirement(mission_id=m.id, role_id=drv.id, count=1),
+    ])
+    x, y = Soldier(name="X"), Soldier(name="Y")
+    db.add_all([x, y])
+    db.flush()
+    db.add_all([
+        SoldierRole(soldier_id=x.id, role_id=cmd.id),
+        SoldierRole(soldier_id=x.id, role_id=drv.id),
+        SoldierRole(soldier_id=y.id, role_id=cmd.id),
+    ])
+    db.commit()
+    return m.id, cmd.id, drv.id, x.id, y.id
+
+
+def test_matching_fills_the_seat_greedy_strands(db, two_roles):
+    m_id, cmd, drv, x, y = two_roles
+
+    greedy = _preview(db, "greedy")
+    assert [(a.soldier_id, a.role_id) for a in greedy.assignments] == [(x, cmd)]
+    assert [(u.role_id, u.reason) for u in greedy.unfilled] == [(drv, "no_pool")]
+
+    matching = _preview(db, "matching")
+    assert sorted((a.soldier_id, a.role_id) for a in matching.assignments) == sorted([(y, cmd), (x, drv)])
+    assert matching.unfilled == []
+
+
+@pytest.mark.parametrize("solver", P.ASSIGNMENT_SOLVERS)
+def test_excluded_seats_stay_empty(db, two_roles, solver):
+    m_id, cmd, drv, x, y = two_roles
+    # Commander seat (position 0) of the 08-16 window
+    key = f"{m_id}_{cmd}_{DAY}T08:00:00:00_{DAY}T16:00:00:00_0"
+
+    res = _preview(db, solver, exclude_slots=[key])
+    assert [(a.soldier_id, a.role_id) for a in res.assignments] == [(x, drv)]
+    assert res.unfilled == []
+
+
+def test_solvers_fill_the_same_seats_on_synthetic_data(unit):
+    for i in range(3):
+        day = (date(2025, 3, 1) + timedelta(days=i)).isoformat()
+        plans = {
+            solver: P.run_fill(P.FillRequest(day=day, preview=True, assignment_solver=solver), unit)
+            for solver in P.ASSIGNMENT_SOLVERS
+        }
+        seats = {solver: len(p.assignments) + len(p.unfilled) for solver, p in plans.items()}
+        assert seats["matching"] == seats["greedy"], day
+        assert len(plans["matching"].unfilled) <= len(plans["greedy"].unfilled), day
+
+        for plan in plans.values():
+            per_window = Counter((a.mission_id, a.start_at, a.soldier_id) for a in plan.assignments)
+            assert max(per_window.values()) == 1, day
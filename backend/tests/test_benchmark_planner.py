@@ -0,0 +1,26 @@
+# backend/tests/test_benchmark_planner.py
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+
+from benchmarks import planner
+
+
+def test_small_run_reports_every_target(db, tmp_path):
+    out = tmp_path / "report.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert planner.main(["--sizes", "20", "--repeat", "1", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    [size] = report["sizes"]
+    assert size["soldiers"] == 20
+    assert size["missions"] == planner.missions_for(20)
+    assert size["history_assignments"] > 0
+    names = [name for name, *_ in planner.targets(report["first_day"])]
+    assert list(size["targets"]) == names
+    for name, result in size["targets"].items():
+        assert result["error"] is None, name
+        assert result["min_ms"] <= result["median_ms"] <= result["max_ms"], name
+        assert result["queries"] > 0, name
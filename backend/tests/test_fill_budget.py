@@ -0,0 +1,47 @@
+# backend/tests/test_fill_budget.py
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import planning as P
+
+DAY = "2025-03-01"
+
+
+def _plan(res):
+    return [(a.mission_id, a.soldier_id, a.role_id, a.start_at) for a in res.assignments]
+
+
+def test_tiny_budget_still_returns_the_greedy_plan(unit):
+    plain = P.run_fill(P.FillRequest(day=DAY, preview=True), unit)
+    res = P.run_fill(P.FillRequest(day=DAY, preview=True, time_budget_ms=1), unit)
+    assert res.budget.stopped == "deadline"
+    assert res.improvement is None
+    assert _plan(res) == _plan(plain)
+
+
+def test_ample_budget_finishes_the_improve_pass(unit):
+    res = P.run_fill(P.FillRequest(day=DAY, preview=True, time_budget_ms=30_000), unit)
+    assert res.budget.stopped == "finished"
+    assert res.improvement.stopped == "local_optimum"
+    assert res.improvement.objective_after.value <= res.improvement.objective_before.value
+    assert res.budget.elapsed_ms < 30_000
+
+
+@pytest.mark.parametrize("candidates", [1, 4])
+def test_interrupt_returns_the_first_plan(unit, candidates):
+    res = P.run_fill(
+        P.FillRequest(day=DAY, preview=True, time_budget_ms=30_000, candidates=candidates, random_seed=1),
+        unit,
+        interrupt=lambda: True,
+    )
+    assert res.budget.stopped == "disconnected"
+    assert res.assignments
+
+
+@pytest.mark.parametrize("budget_ms", [0, P.MAX_TIME_BUDGET_MS + 1])
+def test_out_of_range_budget_is_rejected(unit, budget_ms):
+    with pytest.raises(HTTPException) as exc:
+        P.run_fill(P.FillRequest(day=DAY, time_budget_ms=budget_ms), unit)
+    assert exc.value.status_code == 400
@@ -0,0 +1,25 @@
+# backend/tests/test_fill_queries.py
+from __future__ import annotations
+
+import pytest
+
+from app.services.query_counter import count_queries
+from benchmarks.fill_queries import CASES, FILL_QUERY_BUDGET, MISSIONS, SOLDIERS
+from benchmarks.synthetic import generate
+
+
+@pytest.fixture
+def warm_client(db, client):
+    # The budget is measured on its own unit size, not the shared `unit`
+    generate(db, soldiers=SOLDIERS, missions=MISSIONS)
+    # Warm-up: builds the planner cache and runs the once-per-process sequence check
+    client.post("/plan/fill", json={"day": "2025-03-01"}).raise_for_status()
+    return client
+
+
+def test_fill_stays_within_query_budget(warm_client):
+    for label, body in CASES:
+        with count_queries() as q:
+            resp = warm_client.post("/plan/fill", json=body)
+        resp.raise_for_status()
+        assert q.count <= FILL_QUERY_BUDGET, (label, q.statements)
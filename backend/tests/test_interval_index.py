@@ -0,0 +1,59 @@
+# backend/tests/test_interval_index.py
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+from app.services.interval_index import IntervalIndex
+
+DAY = datetime(2025, 3, 1)
+
+
+def _brute_neighbors(intervals, start, end):
+    overlaps = any(s < end and e > start for s, e in intervals)
+    prev_end = max((e for _, e in intervals if e <= start), default=None)
+    next_start = min((s for s, _ in intervals if s >= end), default=None)
+    return overlaps, prev_end, next_start
+
+
+def _random_interval(rng):
+    start = DAY + timedelta(hours=rng.randrange(0, 96))
+    return start, start + timedelta(hours=rng.randrange(1, 13))
+
+
+def test_neighbors_match_a_full_scan():
+    rng = random.Random(7)
+    for _ in range(50):
+        intervals = [_random_interval(rng) for _ in range(rng.randrange(0, 12))]
+        index = IntervalIndex(intervals)
+        assert list(index) == sorted(intervals)
+        for _ in range(40):
+            start, end = _random_interval(rng)
+            assert index.neighbors(start, end) == _brute_neighbors(intervals, start, end)
+
+
+def test_add_keeps_the_index_in_step():
+    rng = random.Random(11)
+    intervals = []
+    index = IntervalIndex()
+    for _ in range(60):
+        start, end = _random_interval(rng)
+        index.add(start, end)
+        intervals.append((start, end))
+        assert len(index) == len(intervals)
+        for _ in range(10):
+            qs, qe = _random_interval(rng)
+            assert index.neighbors(qs, qe) == _brute_neighbors(intervals, qs, qe)
+
+
+def test_long_interval_hidden_behind_short_ones_still_overlaps():
+    # Starts first and ends last: only the running max of ends catches it
+    index = IntervalIndex([
+        (DAY, DAY + timedelta(hours=20)),
+        (DAY + timedelta(hours=1), DAY + timedelta(hours=2)),
+        (DAY + timedelta(hours=3), DAY + timedelta(hours=4)),
+    ])
+    overlaps, prev_end, next_start = index.neighbors(DAY + timedelta(hours=10), DAY + timedelta(hours=12))
+    assert overlaps
+    assert prev_end == DAY + timedelta(hours=4)
+    assert next_start is None
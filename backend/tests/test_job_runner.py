@@ -0,0 +1,93 @@
+# backend/tests/test_job_runner.py
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from datetime import time as clock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import engine
+from app.main import build_app
+from app.models.assignment import Assignment
+from app.models.mission import Mission
+from app.models.mission_slot import MissionSlot
+from app.models.plan_job import PlanJob
+from app.services import job_runner
+
+DAY = "2025-03-01"
+DAY_START = datetime(2025, 3, 1)
+JOB_TIMEOUT_S = 60.0
+
+
+@pytest.fixture
+def one_worker(monkeypatch):
+    # One worker, so consecutive jobs run in the same process. Workers connect
+    # through DATABASE_URL, which importing a benchmark module repoints
+    job_runner.shutdown_job_executor()
+    monkeypatch.setattr(job_runner, "MAX_JOB_WORKERS", 1)
+    monkeypatch.setenv("DATABASE_URL", engine.url.render_as_string(hide_password=False))
+    yield
+    job_runner.shutdown_job_executor()
+
+
+def _submit(client, kind, params):
+    resp = client.post("/jobs", json={"kind": kind, "params": params})
+    resp.raise_for_status()
+    return resp.json()["id"]
+
+
+def _wait(client, job_id, statuses=("succeeded", "failed", "cancelled")):
+    deadline = time.monotonic() + JOB_TIMEOUT_S
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_jobs_of_a_previous_process_fail_at_startup(db):
+    jobs = [PlanJob(kind="fill", status=status, params={}) for status in ("queued", "running", "succeeded")]
+    db.add_all(jobs)
+    db.commit()
+    ids = [job.id for job in jobs]
+
+    with TestClient(build_app()) as client:
+        statuses = [client.get(f"/jobs/{job_id}").json()["status"] for job_id in ids]
+    assert statuses == ["failed", "failed", "succeeded"]
+
+
+def test_next_job_on_a_worker_sees_data_changed_in_between(unit, client, one_worker):
+    first = _wait(client, _submit(client, "fill", {"day": DAY, "preview": True}))
+    assert first["status"] == "succeeded", first["error"]
+
+    m = Mission(name="Added Between Jobs", total_needed=1, order=999)
+    unit.add(m)
+    unit.flush()
+    unit.add(MissionSlot(mission_id=m.id, start_time=clock(8), end_time=clock(16)))
+    unit.commit()
+
+    second = _wait(client, _submit(client, "fill", {"day": DAY, "preview": True}))
+    assert second["status"] == "succeeded", second["error"]
+    assert m.id in {item["mission"]["id"] for item in second["result"]["results"]}
+    assert m.id not in {item["mission"]["id"] for item in first["result"]["results"]}
+
+
+def test_cancel_a_running_and_a_queued_job(unit, client, one_worker):
+    running = _submit(client, "fill_range", {"from_day": DAY, "to_day": "2025-03-31"})
+    queued = _submit(client, "fill", {"day": DAY})
+    _wait(client, running, statuses=("running",))
+
+    # Cancelled at once, or (already handed to the pool) skipped when a worker takes it
+    resp = client.delete(f"/jobs/{queued}")
+    resp.raise_for_status()
+    assert resp.json()["cancel_requested"]
+    client.delete(f"/jobs/{running}").raise_for_status()
+
+    assert _wait(client, running)["status"] == "cancelled"
+    assert _wait(client, queued)["status"] == "cancelled"
+    # A cancelled job rolls back: nothing planned from the range was written
+    unit.expire_all()
+    assert not unit.query(Assignment).filter(Assignment.start_at >= DAY_START).count()
@@ -0,0 +1,109 @@
+# backend/tests/test_local_search.py
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from app.routers import planning as P
+from app.services.local_search import LocalSearch, Seat
+
+DAY_START = datetime(2025, 3, 1)
+DAY_END = DAY_START + timedelta(days=1)
+
+
+def _at(hour: int) -> datetime:
+    return DAY_START + timedelta(hours=hour)
+
+
+def _search(seats, soldier_ids=(1, 2, 3), fixed=(), role_members=None, restricted=None, vacations=None, **kwargs):
+    return LocalSearch(
+        seats,
+        fixed,
+        soldier_ids,
+        role_members or {},
+        restricted or set(),
+        vacations or {},
+        DAY_START,
+        DAY_END,
+        DAY_START - timedelta(days=P.FAIRNESS_WINDOW_DAYS),
+        P.OBJECTIVE_WEIGHTS,
+        **kwargs,
+    )
+
+
+def test_back_to_back_shifts_are_split():
+    # Soldier 1 holds two touching shifts (0h rest): an OVERLAP warning to remove
+    seats = [Seat(1, None, _at(8), _at(16), 0, 1), Seat(1, None, _at(16), _at(24), 1, 1)]
+    search = _search(seats)
+    before = search.breakdown()
+    assert before["overlap_warnings"] == 1
+
+    outcome = search.run(1000)
+    after = search.breakdown()
+    assert outcome["stopped"] == "local_optimum"
+    assert outcome["moves"] >= 1
+    assert after["overlap_warnings"] == 0
+    assert after["value"] < before["value"]
+    assert len({seat.soldier_id for seat in seats}) == 2
+
+
+def test_empty_seat_is_filled_within_the_hard_rules():
+    # Soldier 2 lacks the role, soldier 3 is restricted from the mission, soldier 4 is on vacation
+    seats = [Seat(1, 9, _at(8), _at(16), 0, None)]
+    search = _search(
+        seats,
+        soldier_ids=(2, 3, 4, 5),
+        role_members={9: {3, 4, 5}},
+        restricted={(3, 1)},
+        vacations={4: [(_at(0), _at(12))]},
+    )
+    search.run(1000)
+    assert seats[0].soldier_id == 5
+    assert search.breakdown()["unfilled"] == 0
+
+
+def test_fixed_rows_never_move_and_rest_rule_holds():
+    # Soldier 1 ends a fixed shift at 06:00; an 08:00 seat would leave 2h rest
+    seats = [Seat(1, None, _at(8), _at(16), 0, None)]
+    search = _search(seats, soldier_ids=(1,), fixed=[(1, 1, _at(-2), _at(6))])
+    search.run(1000)
+    assert seats[0].soldier_id is None
+
+
+def test_no_not_friend_pairing_for_a_smaller_spread():
+    # Soldier 1 alone holds the role seat; putting soldier 2 in the other seat
+    # cuts the spread by 4h but pairs two not-friends
+    def seats():
+        return [Seat(1, 9, _at(8), _at(16), 0, 1), Seat(1, None, _at(8), _at(16), 1, 3)]
+
+    base_hours = {1: 10.0, 2: 0.0, 3: 4.0}
+    plain = seats()
+    _search(plain, role_members={9: {1}}, base_hours=base_hours).run(1000)
+    assert plain[1].soldier_id == 2
+
+    kept = seats()
+    search = _search(kept, role_members={9: {1}}, base_hours=base_hours, not_friends_map={1: {2}, 2: {1}})
+    search.run(1000)
+    assert kept[1].soldier_id == 3
+    assert search.breakdown()["not_friend_warnings"] == 0
+
+
+def test_stops_on_deadline_and_on_interrupt():
+    seats = [Seat(1, None, _at(8), _at(16), 0, 1), Seat(1, None, _at(16), _at(24), 1, 1)]
+    assert _search(seats).run(0)["stopped"] == "deadline"
+
+    seats = [Seat(1, None, _at(8), _at(16), 0, 1), Seat(1, None, _at(16), _at(24), 1, 1)]
+    search = _search(seats)
+    outcome = search.run(1000, should_stop=lambda: True)
+    assert outcome == {"iterations": 0, "moves": 0, "stopped": "interrupted"}
+    assert [seat.soldier_id for seat in seats] == [1, 1]
+
+
+def test_improve_pass_never_worsens_the_plan(unit):
+    for i in range(3):
+        day = (date(2025, 3, 1) + timedelta(days=i)).isoformat()
+        res = P.run_fill(P.FillRequest(day=day, preview=True, shuffle=True, random_seed=i, improve_ms=2000), unit)
+        report = res.improvement
+        assert report.objective_after.value <= report.objective_before.value, day
+        assert report.objective_after.unfilled == len(res.unfilled), day
+        if report.moves:
+            assert report.objective_after.value < report.objective_before.value, day
@@ -0,0 +1,66 @@
+# backend/tests/test_plan_apply.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.assignment import Assignment
+
+DAY = "2025-03-01"
+
+
+@pytest.fixture(autouse=True)
+def _unit(unit):
+    return unit
+
+
+def _preview(client):
+    resp = client.post("/plan/fill", json={"day": DAY, "preview": True})
+    resp.raise_for_status()
+    assignments = resp.json()["assignments"]
+    assert assignments
+    return {"day": DAY, "assignments": assignments}
+
+
+def test_fresh_preview_is_applied(client):
+    body = _preview(client)
+    resp = client.post("/plan/apply", json=body)
+    resp.raise_for_status()
+    assert resp.json()["created_count"] == len(body["assignments"])
+
+
+def test_seats_filled_since_the_preview_are_rejected(client):
+    body = _preview(client)
+    client.post("/plan/fill", json={"day": DAY}).raise_for_status()
+    assert client.post("/plan/apply", json=body).status_code == 409
+
+
+def test_short_rest_since_the_preview_is_rejected(client, db):
+    body = _preview(client)
+    # Another mission's shift starting 2h after a planned one ends, on the same day
+    latest_end = datetime.fromisoformat(f"{DAY}T16:00:00")
+    a = next(x for x in body["assignments"] if datetime.fromisoformat(x["end_at"]).replace(tzinfo=None) <= latest_end)
+    end_at = datetime.fromisoformat(a["end_at"]).replace(tzinfo=None)
+    other = next(x for x in body["assignments"] if x["mission_id"] != a["mission_id"])
+    db.add(Assignment(
+        mission_id=other["mission_id"], soldier_id=a["soldier_id"],
+        start_at=end_at + timedelta(hours=2), end_at=end_at + timedelta(hours=6),
+    ))
+    db.commit()
+    assert client.post("/plan/apply", json=body).status_code == 409
+
+
+def test_unknown_ids_and_non_slot_windows_are_rejected(client):
+    body = _preview(client)
+    first = body["assignments"][0]
+
+    bad_soldier = dict(body, assignments=[dict(first, soldier_id=10_000)])
+    assert client.post("/plan/apply", json=bad_soldier).status_code == 404
+
+    bad_mission = dict(body, assignments=[dict(first, mission_id=10_000)])
+    assert client.post("/plan/apply", json=bad_mission).status_code == 404
+
+    start_at = datetime.fromisoformat(first["start_at"]) + timedelta(minutes=30)
+    bad_window = dict(body, assignments=[dict(first, start_at=start_at.isoformat())])
+    assert client.post("/plan/apply", json=bad_window).status_code == 400
@@ -0,0 +1,28 @@
+# backend/tests/test_plan_candidates.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.routers import planning as P
+
+DAY_START = datetime(2025, 3, 1)
+DAY_END = DAY_START + timedelta(days=1)
+
+
+def _row(mission_id, soldier_id, hour):
+    start = DAY_START + timedelta(hours=hour)
+    return P.AssignmentRow(None, mission_id, soldier_id, None, start, start + timedelta(hours=8))
+
+
+def test_not_friend_pairings_rank_a_candidate_lower():
+    # Same seats and hours; only the first plan puts the not-friends 1 and 2 together
+    not_friends = {1: {2}, 2: {1}}
+    paired = [_row(1, 1, 8), _row(1, 2, 8), _row(2, 3, 8), _row(2, 4, 8)]
+    apart = [_row(1, 1, 8), _row(1, 3, 8), _row(2, 2, 8), _row(2, 4, 8)]
+
+    worse = P._plan_objective(paired, [1, 2, 3, 4], DAY_START, DAY_END, 0, not_friends)
+    better = P._plan_objective(apart, [1, 2, 3, 4], DAY_START, DAY_END, 0, not_friends)
+    assert worse.not_friend_warnings == 2
+    assert better.not_friend_warnings == 0
+    assert better.hours_spread == worse.hours_spread
+    assert better.value < worse.value
@@ -0,0 +1,63 @@
+# backend/tests/test_planner_import.py
+from __future__ import annotations
+
+import pytest
+
+from app.services.warning_store import rebuild_warnings
+
+DAY = "2025-02-28"
+RANGE = {"from": "2025-02-26", "to": "2025-03-02"}
+
+
+@pytest.fixture
+def stored(unit):
+    # The synthetic unit's history has no stored warnings yet
+    rebuild_warnings(unit)
+    unit.commit()
+    return unit
+
+
+def _stored(client):
+    resp = client.get("/plan/warnings/range", params=RANGE)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _import_day(client, assignments, **kwargs):
+    resp = client.post("/data/import/planner", json={"day": DAY, "assignments": assignments, **kwargs})
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _exported(client):
+    resp = client.get("/data/export/planner", params={"day": DAY})
+    resp.raise_for_status()
+    return resp.json()["assignments"]
+
+
+def _assert_matches_a_full_rebuild(client, db):
+    refreshed = _stored(client)
+    rebuild_warnings(db)
+    db.commit()
+    assert refreshed == _stored(client)
+
+
+def test_reimported_day_refreshes_its_warnings(stored, client):
+    assignments = _exported(client)
+    # One soldier in every shift of the day: overlaps and short rests around it
+    soldier = assignments[0]["soldier"]
+    res = _import_day(client, [dict(a, soldier=soldier) for a in assignments])
+    assert res["created_soldiers"] == res["created_missions"] == 0
+    assert any(w["type"] == "OVERLAP" for w in _stored(client)[DAY])
+    _assert_matches_a_full_rebuild(client, stored)
+
+
+def test_import_with_new_names_rebuilds(stored, client):
+    assignments = _exported(client)
+    res = _import_day(
+        client,
+        [dict(a, soldier="New Soldier") for a in assignments[:2]] + [dict(assignments[2], mission="New Mission")],
+        replace=False,
+    )
+    assert res["created_soldiers"] == res["created_missions"] == 1
+    _assert_matches_a_full_rebuild(client, stored)
@@ -0,0 +1,89 @@
+# backend/tests/test_rest_index.py
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.rest_index import RestIndex
+
+REF = datetime(2025, 3, 1)
+
+
+def _brute_totals(last_ends, vacations, t):
+    """Rest hours summed over soldiers whose last end is <= t, minus vacation inside [last_end, t]."""
+    total, n = 0.0, 0
+    for sid, last in last_ends.items():
+        if last is None or last > t:
+            continue
+        rest = (t - last).total_seconds()
+        for bs, be in vacations.get(sid, []):
+            rest -= max(0.0, (min(be, t) - max(bs, last)).total_seconds())
+        total += rest
+        n += 1
+    return total / 3600.0, n
+
+
+def _at(rng, lo=-72, hi=72):
+    return REF + timedelta(minutes=rng.randrange(lo * 60, hi * 60))
+
+
+def _random_data(rng, soldiers=30):
+    last_ends = {sid: (_at(rng) if rng.random() > 0.1 else None) for sid in range(soldiers)}
+    vacations = {}
+    for sid in range(soldiers):
+        blocks, cursor = [], _at(rng, -96, -48)
+        for _ in range(rng.randrange(0, 3)):
+            start = cursor + timedelta(hours=rng.randrange(0, 48))
+            end = start + timedelta(hours=rng.randrange(1, 48))
+            blocks.append((start, end))
+            cursor = end
+        if blocks:
+            vacations[sid] = blocks
+    return last_ends, vacations
+
+
+def _index(last_ends, vacations):
+    index = RestIndex(REF, vacations)
+    for sid, last in last_ends.items():
+        index.set_last_end(sid, last)
+    return index
+
+
+def test_totals_match_a_full_scan():
+    rng = random.Random(3)
+    for _ in range(20):
+        last_ends, vacations = _random_data(rng)
+        index = _index(last_ends, vacations)
+        for _ in range(30):
+            t = _at(rng, -96, 96)
+            total, n = index.totals(t)
+            expected_total, expected_n = _brute_totals(last_ends, vacations, t)
+            assert n == expected_n
+            assert total == pytest.approx(expected_total, abs=1e-6)
+
+
+def test_set_last_end_replaces_the_old_contribution():
+    rng = random.Random(5)
+    last_ends, vacations = _random_data(rng)
+    index = _index(last_ends, vacations)
+    for _ in range(200):
+        sid = rng.randrange(len(last_ends))
+        last_ends[sid] = _at(rng) if rng.random() > 0.1 else None
+        index.set_last_end(sid, last_ends[sid])
+        t = _at(rng, -96, 96)
+        total, n = index.totals(t)
+        expected_total, expected_n = _brute_totals(last_ends, vacations, t)
+        assert n == expected_n
+        assert total == pytest.approx(expected_total, abs=1e-6)
+
+
+def test_average_excluding_drops_the_candidate():
+    vacations = {2: [(REF - timedelta(hours=10), REF - timedelta(hours=6))]}
+    index = _index({1: REF - timedelta(hours=12), 2: REF - timedelta(hours=20), 3: REF + timedelta(hours=1)}, vacations)
+    # Soldier 1 rests 12h; soldier 2 rests 20h minus 4h of vacation; soldier 3 ends after t
+    assert index.totals(REF) == (pytest.approx(28.0), 2)
+    assert index.average_excluding(REF, 12.0) == pytest.approx(16.0)
+    assert index.average_excluding(REF, None) == pytest.approx(14.0)
+    assert _index({1: REF - timedelta(hours=5)}, {}).average_excluding(REF, 5.0) is None
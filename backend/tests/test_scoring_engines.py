@@ -0,0 +1,52 @@
+# backend/tests/test_scoring_engines.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import planning as P
+
+
+def _plan(res):
+    return [(a.mission_id, a.soldier_id, a.role_id, a.start_at, a.end_at, a.candidates) for a in res.assignments]
+
+
+def _preview(db, engine, **kwargs):
+    return P.run_fill(P.FillRequest(preview=True, scoring_engine=engine, **kwargs), db)
+
+
+@pytest.fixture
+def planned(unit):
+    # A few planned days on top of the synthetic history, so rest and rotation terms differ per soldier
+    for i in range(2):
+        P.run_fill(P.FillRequest(day=(date(2025, 3, 1) + timedelta(days=i)).isoformat()), unit)
+    return unit
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"shuffle": True, "random_seed": 4},
+        {"replace": True, "random_seed": 9, "weights": {"rest_equality_penalty_per_hour_diff": 2.0, "mission_repeat_count_penalty": 3.0}},
+        {"assignment_solver": "matching"},
+    ],
+)
+def test_numpy_engine_plans_what_the_python_engine_plans(planned, kwargs):
+    for i in range(1, 4):
+        day = (date(2025, 3, 1) + timedelta(days=i)).isoformat()
+        python = _preview(planned, "python", day=day, **kwargs)
+        vector = _preview(planned, "numpy", day=day, **kwargs)
+
+        assert _plan(vector) == _plan(python), day
+        assert [a.score for a in vector.assignments] == pytest.approx([a.score for a in python.assignments], abs=1e-6)
+        assert [(u.mission_id, u.position, u.reason) for u in vector.unfilled] == \
+            [(u.mission_id, u.position, u.reason) for u in python.unfilled]
+
+
+def test_unknown_engine_is_rejected(unit):
+    with pytest.raises(HTTPException) as exc:
+        _preview(unit, "fortran", day="2025-03-03")
+    assert exc.value.status_code == 400
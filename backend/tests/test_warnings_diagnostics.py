@@ -0,0 +1,43 @@
+# backend/tests/test_warnings_diagnostics.py
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from app.routers import warnings as W
+
+DAY = "2025-03-01"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rate_limit():
+    W._diagnostics_logged.clear()
+
+
+def _diagnostics(caplog):
+    return [r for r in caplog.records if r.name == W.logger.name and r.getMessage().startswith("warnings diagnostics")]
+
+
+def test_requested_diagnostics_log_at_info_rate_limited(client, caplog):
+    caplog.set_level(logging.INFO, logger=W.logger.name)
+    for _ in range(2):
+        client.get("/plan/warnings", params={"day": DAY, "diagnostics": 1}).raise_for_status()
+    records = _diagnostics(caplog)
+    assert len(records) == 1
+    assert records[0].levelno == logging.INFO
+
+
+def test_debug_logging_alone_is_rate_limited(client, caplog):
+    caplog.set_level(logging.DEBUG, logger=W.logger.name)
+    for _ in range(2):
+        client.get("/plan/warnings", params={"day": DAY}).raise_for_status()
+    records = _diagnostics(caplog)
+    assert len(records) == 1
+    assert records[0].levelno == logging.DEBUG
+
+
+def test_no_diagnostics_by_default(client, caplog):
+    caplog.set_level(logging.INFO, logger=W.logger.name)
+    client.get("/plan/warnings", params={"day": DAY}).raise_for_status()
+    assert _diagnostics(caplog) == []
@@ -0,0 +1,144 @@
+# backend/tests/test_warnings_engine.py
+from __future__ import annotations
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+import pytest
+
+from app.services.warnings_engine import LOOKBACK, NEAR_EIGHT_MINUTES, classify_rest, find_warnings
+
+BASE = datetime(2025, 3, 1)
+H = timedelta(hours=1)
+M = timedelta(minutes=1)
+
+
+class Row(NamedTuple):
+    id: Optional[int]
+    mission_id: int
+    soldier_id: Optional[int]
+    start_at: datetime
+    end_at: datetime
+
+
+def _hhmm(seconds: float) -> str:
+    minutes = int(seconds) // 60
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _sql_reference(rows, range_start, range_end, restricted, not_friends):
+    """
+    The /plan/warnings query the engine replaced, transcribed CTE by CTE:
+    LAG(end_at) and LAG(rest) per soldier ordered by (start_at, end_at) over rows
+    starting in [range_start - LOOKBACK, range_end), warnings for rows starting
+    in the range, NOT_FRIENDS for each direction of a not_friend pair in a window.
+    """
+    near = NEAR_EIGHT_MINUTES * 60
+    ordered = sorted(
+        (r for r in rows if range_start - LOOKBACK <= r.start_at < range_end),
+        key=lambda r: (r.soldier_id, r.start_at, r.end_at),
+    )
+    out = []
+    prev = {}  # soldier_id -> (prev_end_at, rest_seconds of the previous row)
+    for r in ordered:
+        prev_end, prev_rest = prev.get(r.soldier_id, (None, None))
+        rest = (r.start_at - prev_end).total_seconds() if prev_end is not None else None
+        prev[r.soldier_id] = (r.end_at, rest)
+        if not range_start <= r.start_at < range_end:
+            continue
+        if (r.soldier_id, r.mission_id) in restricted:
+            out.append(("RESTRICTED", "GRAY", r.id, None))
+        if rest is None:
+            continue
+        if rest < 0:
+            out.append(("OVERLAP", "RED", r.id, f"Overlaps with previous assignment ending at {prev_end:%Y-%m-%d %H:%M}"))
+        elif rest < 8 * 3600:
+            out.append(("OVERLAP", "ORANGE", r.id, f"Rest between missions is {_hhmm(rest)}"))
+        elif rest <= 8 * 3600 + near:
+            if prev_rest is not None and 8 * 3600 - near <= prev_rest <= 8 * 3600 + near:
+                out.append(("REST", "RED", r.id, f"Two consecutive ~8h rests: {_hhmm(rest)} and {_hhmm(prev_rest)}"))
+            else:
+                out.append(("REST", "ORANGE", r.id, f"Rest between missions is {_hhmm(rest)}"))
+
+    in_range = [r for r in rows if range_start <= r.start_at < range_end]
+    for a1 in in_range:
+        for a2 in in_range:
+            if a1.id >= a2.id or a1.soldier_id == a2.soldier_id:
+                continue
+            if (a1.mission_id, a1.start_at, a1.end_at) != (a2.mission_id, a2.start_at, a2.end_at):
+                continue
+            if a2.soldier_id in not_friends.get(a1.soldier_id, ()):
+                out.append(("NOT_FRIENDS", "GRAY", a1.id, a2.soldier_id))
+            if a1.soldier_id in not_friends.get(a2.soldier_id, ()):
+                out.append(("NOT_FRIENDS", "GRAY", a2.id, a1.soldier_id))
+    return Counter(out)
+
+
+def _engine(rows, range_start, range_end, restricted, not_friends):
+    return Counter(
+        (w.type, w.level, w.assignment_id, w.fellow_id if w.type == "NOT_FRIENDS" else w.details)
+        for w in find_warnings(rows, range_start, range_end, restricted, not_friends)
+    )
+
+
+def _random_rows(rng, soldiers=6, count=60):
+    # Starts on an 8h grid nudged by a few minutes, so ~8h rests and shared windows are common
+    rows = []
+    for a_id in range(1, count + 1):
+        start = BASE + rng.randrange(0, 15) * 8 * H + rng.choice([0, 0, 5, 10, 11, -5, -10, -11]) * M
+        end = start + rng.choice([4 * H, 8 * H, 8 * H, 12 * H, 16 * H, 24 * H])
+        rows.append(Row(a_id, rng.randrange(1, 3), rng.randrange(1, soldiers + 1), start, end))
+    return rows
+
+
+def test_engine_matches_the_old_sql_semantics():
+    rng = random.Random(2)
+    for _ in range(300):
+        rows = _random_rows(rng)
+        restricted = {(rng.randrange(1, 7), rng.randrange(1, 3)) for _ in range(3)}
+        not_friends = {}
+        for _ in range(4):
+            a, b = rng.sample(range(1, 7), 2)
+            not_friends.setdefault(a, set()).add(b)
+        range_start = BASE + rng.randrange(1, 4) * 24 * H
+        range_end = range_start + rng.choice([24, 72]) * H
+
+        expected = _sql_reference(rows, range_start, range_end, restricted, not_friends)
+        assert _engine(rows, range_start, range_end, restricted, not_friends) == expected
+
+
+@pytest.mark.parametrize(
+    "rest, prev_rest, expected",
+    [
+        (-1 * M, None, ("OVERLAP", "RED")),
+        (0 * M, None, ("OVERLAP", "ORANGE")),
+        (8 * H - M, None, ("OVERLAP", "ORANGE")),
+        (8 * H, None, ("REST", "ORANGE")),
+        (8 * H + NEAR_EIGHT_MINUTES * M, None, ("REST", "ORANGE")),
+        (8 * H + (NEAR_EIGHT_MINUTES + 1) * M, None, None),
+        (8 * H, 8 * H - NEAR_EIGHT_MINUTES * M, ("REST", "RED")),
+        (8 * H + 5 * M, 8 * H + NEAR_EIGHT_MINUTES * M, ("REST", "RED")),
+        (8 * H, 8 * H - (NEAR_EIGHT_MINUTES + 1) * M, ("REST", "ORANGE")),
+        (8 * H, 16 * H, ("REST", "ORANGE")),
+        (8 * H - M, 8 * H, ("OVERLAP", "ORANGE")),
+    ],
+)
+def test_rest_thresholds(rest, prev_rest, expected):
+    assert classify_rest(rest, prev_rest) == expected
+
+
+def test_previous_rest_follows_start_order():
+    # The 00-20 row ends last but starts first: the rest before 22:00 is counted
+    # from the 06-14 row (previous by start time), as the SQL LAG did
+    rows = [
+        Row(1, 1, 1, BASE, BASE + 20 * H),
+        Row(2, 1, 1, BASE + 6 * H, BASE + 14 * H),
+        Row(3, 1, 1, BASE + 22 * H, BASE + 30 * H),
+    ]
+    got = _engine(rows, BASE, BASE + 24 * H, set(), {})
+    assert got == Counter({
+        ("OVERLAP", "RED", 2, "Overlaps with previous assignment ending at 2025-03-01 20:00"): 1,
+        ("REST", "ORANGE", 3, "Rest between missions is 08:00"): 1,
+    })
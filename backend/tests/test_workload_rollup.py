@@ -0,0 +1,72 @@
+# backend/tests/test_workload_rollup.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.routers import planning as P
+
+FIRST_DAY = date(2025, 3, 1)  # first day after the synthetic unit's history
+PLANNED_DAYS = 4
+
+
+def _stats_dict(stats):
+    return {sid: {k: getattr(st, k) for k in P.SoldierStats.__slots__} for sid, st in stats.items()}
+
+
+def _pairs_dict(pairs):
+    # The full scan keeps empty and unassigned (None) entries the rollup never stores
+    out = {}
+    for sid, fellows in pairs.items():
+        kept = {f: c for f, c in fellows.items() if f is not None and f != sid}
+        if sid is not None and kept:
+            out[sid] = kept
+    return out
+
+
+def _assert_rollup_matches_scan(db, days):
+    for day in days:
+        day_start, day_end = P._day_bounds(day)
+        window_start = day_start - timedelta(days=P.FAIRNESS_WINDOW_DAYS)
+        rows = P._fetch_assignment_rows(db, window_start, day_end)
+        near = P._fetch_assignment_rows(db, day_start - P.NEAR_HISTORY, day_end)
+        history = P._load_history(db, day)
+
+        scanned = P._build_soldier_stats(rows, day_start, day_end)
+        rolled = P._build_soldier_stats_from_rollup(history, rows, day_start, day_end)
+        assert _stats_dict(rolled) == _stats_dict(scanned), day
+
+        scanned_pairs = P._build_pair_counts(rows)
+        rolled_pairs = P._build_pair_counts_from_rollup(history, near, day_start, day_end)
+        assert _pairs_dict(rolled_pairs) == _pairs_dict(scanned_pairs), day
+
+
+@pytest.fixture
+def planned(unit):
+    for i in range(PLANNED_DAYS):
+        day = FIRST_DAY + timedelta(days=i)
+        P.run_fill(P.FillRequest(day=day.isoformat(), shuffle=True, random_seed=i), unit)
+    unit.expire_all()
+    return unit
+
+
+def test_rollup_history_matches_a_full_scan(planned):
+    days = [FIRST_DAY + timedelta(days=i) for i in range(-3, PLANNED_DAYS + 2)]
+    _assert_rollup_matches_scan(planned, days)
+
+
+def test_assignment_edits_keep_the_rollup_current(planned, client):
+    day = FIRST_DAY + timedelta(days=1)
+    day_start, day_end = P._day_bounds(day)
+    ids = sorted(r.id for r in P._fetch_assignment_rows(planned, day_start, day_end) if r.start_at >= day_start)
+    for a_id in ids[:3]:
+        client.delete(f"/assignments/{a_id}").raise_for_status()
+    client.post(
+        "/assignments/reassign",
+        json={"assignment_id": ids[4], "soldier_id": 7, "ignore_rules": True},
+    ).raise_for_status()
+
+    planned.expire_all()
+    days = [FIRST_DAY + timedelta(days=i) for i in range(1, PLANNED_DAYS + 2)]
+    _assert_rollup_matches_scan(planned, days)
@@ -220,6 +220,14 @@ export async function getPlannerWarnings(day: string): Promise<PlannerWarning[]>
   return data;
 }
 
+// Warnings for every day in [from, to] in one request, keyed by YYYY-MM-DD
+export async function getPlannerWarningsRange(from: string, to: string): Promise<Record<string, PlannerWarning[]>> {
+  const { data } = await api.get<Record<string, PlannerWarning[]>>("/plan/warnings/range", {
+    params: { from, to },
+  });
+  return data;
+}
+
 export async function clearPlan(day: string, missionIds?: number[], lockedAssignmentIds?: number[]): Promise<void> {
   const body: any = { day };
   if (Array.isArray(missionIds) && missionIds.length > 0) {
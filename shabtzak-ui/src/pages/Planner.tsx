@@ -94,9 +94,11 @@ async function fillPlanForDay(
   forDay: string,
   replace = false,
   opts?: { shuffle?: boolean; random_seed?: number; exclude_slots?: string[]; locked_assignments?: number[] }
-) {
+): Promise<PlannerWarning[] | undefined> {
   const weights = getPlannerWeights();
-  await api.post("/plan/fill", { day: forDay, replace, weights, ...(opts || {}) });
+  const { data } = await api.post("/plan/fill", { day: forDay, replace, weights, ...(opts || {}) });
+  // The fill returns the day's warnings with the new plan in place (same as GET /plan/warnings)
+  return data?.warnings ?? undefined;
 }
 
 // Literal extractor: "YYYY-MM-DD HH:MM" from a timestamp string (ISO or "YYYY-MM-DD HH:MM[:SS]")
@@ -414,7 +416,8 @@ export default function Planner() {
     }
   }
 
-  async function loadWarnings(forDay: string) {
+  // `preloaded`: warnings already returned by /plan/fill for forDay (skips the GET)
+  async function loadWarnings(forDay: string, preloaded?: PlannerWarning[]) {
     // Prevent duplicate concurrent calls for the same day
     if (warnLoading && warningsLoadingDayRef.current === forDay) {
       console.log(`[DEBUG] Skipping duplicate loadWarnings call for ${forDay}`);
@@ -424,7 +427,7 @@ export default function Planner() {
       setWarnLoading(true);
       warningsLoadingDayRef.current = forDay;
       setWarnError(null);
-      const items = await getPlannerWarnings(forDay); // <-- pass day
+      const items = preloaded ?? await getPlannerWarnings(forDay); // <-- pass day
       
       // Debug: log ALL warnings to see what we're getting
       console.log(`[WARNINGS DEBUG] All warnings from API for ${forDay}:`, items);
@@ -521,11 +524,11 @@ async function runPlanner() {
     // Include only currently excluded slots (those with checkboxes checked)
     const excludeSlots = Array.from(excludedSlots);
     const lockedAssignmentIds = Array.from(lockedAssignments);
-    await fillPlanForDay(day, /* replace */ false, { exclude_slots: excludeSlots, locked_assignments: lockedAssignmentIds });
+    const planWarnings = await fillPlanForDay(day, /* replace */ false, { exclude_slots: excludeSlots, locked_assignments: lockedAssignmentIds });
 
     // 2) Refresh the UI
     await loadAllAssignments();
-    await loadWarnings(day);
+    await loadWarnings(day, planWarnings);
     await loadDayRosterForWarnings(day); // keep rowsForWarnings fresh
   } catch (e: any) {
     alert(humanError(e, "Planner failed"));
@@ -540,7 +543,7 @@ async function shufflePlanner() {
     // Replace the current plan and ask backend to shuffle pools and RR cursors
     const excludeSlots = Array.from(excludedSlots);
     const lockedAssignmentIds = Array.from(lockedAssignments);
-    await fillPlanForDay(day, /* replace */ true, {
+    const planWarnings = await fillPlanForDay(day, /* replace */ true, {
       shuffle: true,
       random_seed: Date.now(),
       exclude_slots: excludeSlots,
@@ -549,7 +552,7 @@ async function shufflePlanner() {
 
     // Refresh UI & warning datasets
     await loadAllAssignments();
-    await loadWarnings(day);
+    await loadWarnings(day, planWarnings);
     await loadDayRosterForWarnings(day);
   } catch (e: any) {
     alert(humanError(e, "Shuffle failed"));